@@ -25,4 +25,9 @@ mkdir -p ../api/static
 echo "Copying build output..."
 cp -r dist/* ../api/static/
 
+# Excel verisini ikili snapshot'a derle (cold start'ta Excel okunmasın)
+echo "Building dataset snapshot..."
+cd ../backend
+python build_dataset.py
+
 echo "Build process completed successfully!" 
\ No newline at end of file
@@ -11,6 +11,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
 
 # Ana FastAPI uygulamasını import et
 from main import app as main_app
+from utils.registry import DatasetPinMiddleware
 
 app = FastAPI()
 
@@ -23,6 +24,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Sadece ana uygulamanın router'ları eklendiği için middleware'i burada da gerekir:
+# her istek başladığı andaki veri seti sürümüyle tamamlanır (yeniden yükleme sırasında da)
+app.add_middleware(DatasetPinMiddleware)
+
 # Static dosyaları servis et
 static_path = os.path.join(os.path.dirname(__file__), "static")
 if os.path.exists(static_path):
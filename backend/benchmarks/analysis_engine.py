@@ -0,0 +1,107 @@
+"""Analiz motoru: Pydantic katmanlı çağrı ile düz fonksiyon + to_dict karşılaştırması
+
+Kapsamlı analiz eskiden her alt analiz için router handler'ını çağırıyordu: istek
+modeli kurulur, handler yanıt modelini (harf modelleriyle birlikte) kurar, sonra
+.dict() ile sözlüğe çevrilirdi. Burada aynı alt analizler iki yolla çalıştırılır:
+
+    pydantic: istek modeli -> analiz -> yanıt modeli -> .dict()
+    motor   : analiz -> to_dict
+
+Sonuçların aynı olduğu doğrulanır ve istek başına süreler yazdırılır. Hastalık
+analizi çeviri servisine istek attığı için ölçüme alınmaz.
+
+Kullanım (backend dizininden):
+    python -m benchmarks.analysis_engine [--repeat 5]
+"""
+import argparse
+import contextlib
+import io
+import time
+from utils import analysis
+from utils.analysis import convert_name, to_dict
+
+NAMES = ["Ahmet", "Ayşe", "Mehmet", "Fatma", "İbrahim", "Işıl", "Zümra", "Ali", "Elif", "Ömer", "Abbas", "Zeynep"]
+
+def sections() -> list:
+    """(ad, istek modeli, yanıt modeli, motor fonksiyonu); motor fonksiyonu isimleri kendisi çevirir"""
+    from routers import disease_prone, financial_blessing, magic_analysis, manager_esma, manager_verse, \
+        personal_manager_esma
+    pair = lambda function: lambda mother, child: function(convert_name(mother), convert_name(child))
+    return [
+        ("Yönetici Esma", manager_esma.ManagerEsmaRequest, manager_esma.ManagerEsmaResponse,
+         pair(analysis.manager_esma)),
+        ("Kişisel Yönetici", personal_manager_esma.PersonalManagerEsmaRequest,
+         personal_manager_esma.PersonalManagerEsmaResponse,
+         lambda mother, child: analysis.personal_manager_esma(child)),
+        ("Yönetici Ayet", manager_verse.ManagerVerseRequest, manager_verse.ManagerVerseResponse,
+         pair(analysis.manager_verse)),
+        ("Büyü", magic_analysis.MagicAnalysisRequest, magic_analysis.MagicAnalysisResponse,
+         pair(analysis.magic_analysis)),
+        ("Hastalığa yatkınlık", disease_prone.DiseaseProneMemberRequest, disease_prone.DiseaseProneMemberResponse,
+         pair(analysis.disease_prone)),
+        ("Maddi Blokaj", financial_blessing.FinancialBlessingRequest, financial_blessing.FinancialBlessingResponse,
+         pair(analysis.financial_blessing)),
+    ]
+
+def guarded(call) -> object:
+    """Analiz hata verirse (ör. ayet bulunamadı) iki yolda da hata mesajı karşılaştırılır"""
+    try:
+        return call()
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+
+def pydantic_call(request_model, response_model, function, mother: str, child: str) -> dict:
+    if 'name' in request_model.model_fields:
+        request = request_model(name=child)
+        result = function(None, request.name)
+    else:
+        request = request_model(mother_name=mother, child_name=child)
+        result = function(request.mother_name, request.child_name)
+    return response_model(**to_dict(result)).model_dump()
+
+def best_of(func, repeat: int) -> tuple:
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        # Analizlerin konsol çıktıları ölçüme karışmasın
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    pairs = [(mother, NAMES[(i * 5 + 3) % len(NAMES)]) for i, mother in enumerate(NAMES)]
+    # Tablolar ve isim önbelleği ölçümden önce ısınır
+    with contextlib.redirect_stdout(io.StringIO()):
+        cases = sections()
+        for _, _, _, function in cases:
+            for mother, child in pairs:
+                guarded(lambda: function(mother, child))
+
+    print(f"\n{len(pairs)} anne/çocuk çifti, istek başına süre")
+    failed = False
+    total_pydantic = total_engine = 0.0
+    for label, request_model, response_model, function in cases:
+        pydantic_time, expected = best_of(
+            lambda: [guarded(lambda: pydantic_call(request_model, response_model, function, m, c))
+                     for m, c in pairs], args.repeat)
+        engine_time, found = best_of(lambda: [guarded(lambda: to_dict(function(m, c))) for m, c in pairs], args.repeat)
+        same = found == expected
+        failed |= not same
+        total_pydantic += pydantic_time
+        total_engine += engine_time
+        print(f"{label:<20} pydantic: {pydantic_time / len(pairs) * 1e6:8.1f} µs   "
+              f"motor: {engine_time / len(pairs) * 1e6:8.1f} µs   {'aynı' if same else 'FARKLI'}")
+    print(f"{'Toplam':<20} pydantic: {total_pydantic / len(pairs) * 1e6:8.1f} µs   "
+          f"motor: {total_engine / len(pairs) * 1e6:8.1f} µs   ({total_pydantic / total_engine:.1f}x)")
+
+    if failed:
+        raise SystemExit("HATA: motor sonuçları Pydantic modelleriyle aynı değil")
+
+if __name__ == "__main__":
+    main()
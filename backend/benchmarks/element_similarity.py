@@ -0,0 +1,69 @@
+"""Element profili benzerliği: satır satır Python döngüsü ile numpy top-k aramasının karşılaştırması
+
+Esma ve ayet profilleri üzerinde rastgele sorgu profilleri (4 element sayısı +
+nurani ebced) için en yakın k satır iki yolla bulunur; sonuçların aynı olduğu
+doğrulanır ve sorgu başına süreler yazdırılır.
+
+Kullanım (backend dizininden):
+    python -m benchmarks.element_similarity [--queries 200] [--k 10]
+"""
+import argparse
+import math
+import random
+import sys
+import time
+from utils.element_similarity import DISTANCE_DECIMALS, EBCED_WEIGHT, esma_similarity_index, verse_similarity_index
+from utils.corpus import build_verse_profile_table
+from utils.dataset import load_tables
+from utils.esma_profiles import EsmaProfileTable
+from utils.store import EsmaStore, VerseStore
+from utils.verse_profiles import VerseProfileTable
+
+def scan_nearest(ratios: list, log_ebceds: list, rows: list, counts: list, nurani_ebced: int, k: int) -> list:
+    """Her satırın uzaklığını tek tek hesaplayıp sıralar"""
+    total = sum(counts)
+    query = [count / total if total else 0.0 for count in counts]
+    log_query = math.log1p(max(nurani_ebced, 0))
+    scored = []
+    for ratio, log_ebced, row in zip(ratios, log_ebceds, rows):
+        squared = sum((a - b) ** 2 for a, b in zip(ratio, query)) + EBCED_WEIGHT * (log_ebced - log_query) ** 2
+        scored.append((round(math.sqrt(squared), DISTANCE_DECIMALS), row))
+    scored.sort()
+    return [row for _, row in scored[:k]]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=10)
+    args = parser.parse_args()
+
+    tables = load_tables()
+    esmas = EsmaStore.from_frame(tables['esma'])
+    verse_profiles = VerseProfileTable(build_verse_profile_table(tables['quran']), VerseStore.from_frame(tables['quran']))
+    indexes = {
+        'Esma': esma_similarity_index(esmas, EsmaProfileTable(esmas)),
+        'Ayet': verse_similarity_index(verse_profiles),
+    }
+
+    rng = random.Random(0)
+    queries = [([rng.randrange(8) for _ in range(4)], rng.randrange(5000)) for _ in range(args.queries)]
+    failed = False
+    print()
+    for label, index in indexes.items():
+        ratios, log_ebceds, rows = index.ratios.tolist(), index.log_ebced.tolist(), index.rows.tolist()
+        start = time.perf_counter()
+        expected = [scan_nearest(ratios, log_ebceds, rows, counts, ebced, args.k) for counts, ebced in queries]
+        scan_time = time.perf_counter() - start
+        start = time.perf_counter()
+        found = [[row for row, _ in index.nearest(counts, ebced, args.k)] for counts, ebced in queries]
+        index_time = time.perf_counter() - start
+        same = found == expected
+        failed |= not same
+        print(f"{label:<5} {len(index):5d} satır   döngü: {scan_time / args.queries * 1e3:8.2f} ms   "
+              f"numpy: {index_time / args.queries * 1e6:7.1f} µs   {'aynı' if same else 'FARKLI'}")
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
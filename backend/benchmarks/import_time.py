@@ -0,0 +1,73 @@
+"""`import main` süresi için bütçe kontrolü
+
+main modülünü her seferinde yeni bir süreçte import eder, en iyi ve medyan
+süreleri raporlar. Ağır opsiyonel bağımlılıklardan biri açılışta import edilirse
+veya medyan süre bütçeyi aşarsa sıfırdan farklı kodla çıkar; CI'da veya dağıtım
+öncesinde soğuk açılış gerilemelerini yakalamak için kullanılır.
+
+Kullanım (backend dizininden):
+    python -m benchmarks.import_time [--repeat 5] [--budget-ms 2500]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Sadece ilgili endpoint'ler çağrıldığında yüklenmesi gereken modüller
+DEFERRED_MODULES = ('reportlab', 'googletrans', 'user_agents', 'jinja2')
+
+PROBE = """
+import io, json, sys, time, contextlib
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    import main
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    'import_ms': elapsed * 1000,
+    'loaded': sorted({name.split('.')[0] for name in sys.modules} & set(%r)),
+}))
+"""
+
+def measure_once() -> dict:
+    env = dict(os.environ)
+    # Açılışta tablo yüklemesi ve izleyici ölçüme karışmasın
+    env.pop('DATA_PRELOAD', None)
+    env.pop('DATA_RELOAD_INTERVAL', None)
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE % (DEFERRED_MODULES,)],
+        env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=float(os.getenv('IMPORT_BUDGET_MS', '2500')),
+                        help="Medyan import süresi için üst sınır (IMPORT_BUDGET_MS)")
+    args = parser.parse_args()
+
+    runs = [measure_once() for _ in range(args.repeat)]
+    timings = [run['import_ms'] for run in runs]
+    loaded = sorted({name for run in runs for name in run['loaded']})
+    median = statistics.median(timings)
+
+    print(f"\nimport main ({args.repeat} süreç)")
+    print(f"En iyi  : {min(timings):8.1f} ms")
+    print(f"Medyan  : {median:8.1f} ms (bütçe {args.budget_ms:.0f} ms)")
+    print(f"Ertelenen modüller: {', '.join(DEFERRED_MODULES)}")
+
+    failed = False
+    if loaded:
+        print(f"HATA: açılışta yüklenmemesi gereken modüller import edildi: {', '.join(loaded)}")
+        failed = True
+    if median > args.budget_ms:
+        print(f"HATA: import süresi bütçeyi {median - args.budget_ms:.1f} ms aşıyor")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("Bütçe içinde.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""Eşzamanlı yük altında gecikme: handler'lar event loop'ta ile iş havuzlarında
+
+Aynı süreçte çalışan bir uygulamaya (kimlik doğrulamasız router'lar) sabit
+hızlarda, Poisson aralıklarıyla istek gönderilir. İsteklerin çoğu hafif analiz
+(isim sorgusu, yönetici esma, esma/ayet sorguları), bir kısmı ağır PDF
+oluşturmadır. Her hız iki modda, ayrı süreçlerde ölçülür:
+
+    inline: ANALYSIS_WORKERS=0 HEAVY_WORKERS=0 (işler event loop'ta)
+    havuz : varsayılan/ortamdaki havuz ayarları (utils.workers)
+
+Gecikme isteğin planlanan gönderim anından ölçülür; event loop bloke olduğu için
+geç gönderilen istekler de gecikmeye sayılır. Sınıf başına p50/p99, saniyedeki
+başarılı istek ve 503 (havuz dolu) sayısı yazdırılır.
+
+Kullanım (backend dizininden):
+    python -m benchmarks.load_test [--rates 200,400,800] [--duration 5] [--heavy-share 0.1]
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+
+NAMES = ["Ahmet", "Ayşe", "Mehmet", "Fatma", "İbrahim", "Işıl", "Zümra", "Ali", "Elif", "Ömer", "Abbas", "Zeynep"]
+# PDF dosya adı Content-Disposition başlığına (latin-1) yazıldığı için PDF istekleri ASCII isimlerle yapılır
+PDF_NAMES = ["Ahmet", "Mehmet", "Fatma", "Ali", "Elif", "Abbas", "Zeynep"]
+
+async def post(app, path: str, body: dict) -> int:
+    """ASGI uygulamasına JSON POST isteği gönderir, durum kodunu döndürür"""
+    messages = [{"type": "http.request", "body": json.dumps(body).encode(), "more_body": False}]
+    status = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    scope = {"type": "http", "http_version": "1.1", "method": "POST", "path": path, "raw_path": path.encode(),
+             "query_string": b"", "headers": [(b"content-type", b"application/json")],
+             "scheme": "http", "server": ("benchmark", 80), "client": ("benchmark", 1), "root_path": ""}
+    await app(scope, receive, send)
+    return status[0]
+
+def build_app():
+    from fastapi import FastAPI
+    from routers import comprehensive_analysis, esma_query, manager_esma, name_query, personal_manager_esma, \
+        verse_profile
+    app = FastAPI()
+    for module in (comprehensive_analysis, esma_query, manager_esma, name_query, personal_manager_esma,
+                   verse_profile):
+        app.include_router(module.router)
+    return app
+
+def pdf_request(mother_name: str, child_name: str) -> dict:
+    """Kapsamlı analizin CPU bölümlerinden PDF isteği; hastalık bölümü (çeviri servisi) hatalı sayılır"""
+    from routers.comprehensive_analysis import AnalysisResult, CPU_SECTIONS, convert_names, run_sections
+    data = {"mother_name": mother_name, "child_name": child_name, "disease_name": "Baş Ağrısı"}
+    outcomes = run_sections(CPU_SECTIONS, *convert_names(mother_name, child_name), data)
+    results = {key: result.model_dump() for key, (result, _) in outcomes.items()}
+    return {
+        **data,
+        "manager_esma_analysis": results["manager_esma"],
+        "personal_manager_analysis": results["personal_manager"],
+        "manager_verse_analysis": results["manager_verse"],
+        "disease_analysis": AnalysisResult(success=False, error="Çeviri servisi kullanılmadı").model_dump(),
+        "magic_analysis": results["magic"],
+        "disease_prone_analysis": results["disease_prone"],
+        "financial_blessing_analysis": results["financial_blessing"],
+    }
+
+def light_request(rng: random.Random) -> tuple:
+    mother, child = rng.choice(NAMES), rng.choice(NAMES)
+    return rng.choice([
+        ("/calculate", {"name": child}),
+        ("/manager-esma/calculate", {"mother_name": mother, "child_name": child}),
+        ("/analyze", {"name": child}),
+        ("/esma-query/nearest", {"ebced": rng.randrange(1, 3000), "k": 5}),
+        ("/verse-profile/verse", {"surah_number": rng.randrange(1, 115), "verse_number": 1}),
+    ])
+
+def percentile(samples: list, q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)] * 1000
+
+async def run_load(app, pdf_bodies: list, rate: float, duration: float, heavy_share: float, seed: int) -> dict:
+    loop = asyncio.get_running_loop()
+    rng = random.Random(seed)
+
+    async def timed(kind: str, path: str, body: dict, scheduled: float) -> tuple:
+        status = await post(app, path, body)
+        return kind, status, loop.time() - scheduled
+
+    tasks = []
+    start = loop.time()
+    offset = 0.0
+    while True:
+        offset += rng.expovariate(rate)
+        if offset >= duration:
+            break
+        if rng.random() < heavy_share:
+            kind, (path, body) = 'heavy', ("/comprehensive-analysis/generate-pdf", rng.choice(pdf_bodies))
+        else:
+            kind, (path, body) = 'light', light_request(rng)
+        delay = start + offset - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(timed(kind, path, body, start + offset)))
+    outcomes = await asyncio.gather(*tasks)
+    elapsed = loop.time() - start
+
+    report = {}
+    for kind in ('light', 'heavy'):
+        latencies = [latency for k, status, latency in outcomes if k == kind and status == 200]
+        statuses = [status for k, status, _ in outcomes if k == kind]
+        report[kind] = {
+            'ok': len(latencies),
+            'busy': statuses.count(503),
+            'failed': sum(1 for status in statuses if status not in (200, 503)),
+            'p50': percentile(latencies, 0.5),
+            'p99': percentile(latencies, 0.99),
+        }
+    report['throughput'] = sum(report[kind]['ok'] for kind in ('light', 'heavy')) / elapsed
+    return report
+
+def worker(rates: list, duration: float, heavy_share: float):
+    """Bir moddaki tüm hızları ölçer; sonucu JSON olarak son satıra yazar"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        from utils.workers import POOLS, heavy_pool
+        app = build_app()
+        pdf_bodies = [pdf_request(mother, PDF_NAMES[(i * 3 + 1) % len(PDF_NAMES)])
+                      for i, mother in enumerate(PDF_NAMES)]
+
+        async def measure() -> list:
+            # Tablolar, önbellekler ve heavy havuzunun process'leri ölçümden önce ısınır
+            await asyncio.gather(*(post(app, "/comprehensive-analysis/generate-pdf", body)
+                                   for body in pdf_bodies[:max(heavy_pool.workers, 1)]))
+            await run_load(app, pdf_bodies, 100, 1.0, heavy_share, seed=0)
+            return [await run_load(app, pdf_bodies, rate, duration, heavy_share, seed=i + 1)
+                    for i, rate in enumerate(rates)]
+
+        reports = asyncio.run(measure())
+        pools = [pool.stats() for pool in POOLS]
+        for pool in POOLS:
+            pool.shutdown()
+    print(json.dumps({'reports': reports, 'pools': pools}))
+
+def run_mode(env_overrides: dict, args) -> dict:
+    env = dict(os.environ, **env_overrides)
+    output = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.load_test', '--worker', '--rates', args.rates,
+         '--duration', str(args.duration), '--heavy-share', str(args.heavy_share)],
+        env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rates', default='200,400,800', help="Saniyedeki istek sayıları (virgülle)")
+    parser.add_argument('--duration', type=float, default=5.0, help="Hız başına süre (s)")
+    parser.add_argument('--heavy-share', type=float, default=0.1, help="PDF isteklerinin oranı")
+    parser.add_argument('--worker', action='store_true')
+    args = parser.parse_args()
+    rates = [float(rate) for rate in args.rates.split(',')]
+
+    if args.worker:
+        worker(rates, args.duration, args.heavy_share)
+        return
+
+    modes = {
+        'inline': run_mode({'ANALYSIS_WORKERS': '0', 'HEAVY_WORKERS': '0'}, args),
+        'havuz': run_mode({}, args),
+    }
+    print(f"\n{args.duration:.0f} s / hız, PDF oranı {args.heavy_share:.0%}; gecikmeler ms")
+    print(f"{'hız':>6} {'mod':<7} {'hafif p50':>10} {'hafif p99':>10} {'PDF p50':>9} {'PDF p99':>9} "
+          f"{'istek/s':>8} {'503':>5}")
+    for i, rate in enumerate(rates):
+        for mode, result in modes.items():
+            report = result['reports'][i]
+            light, heavy = report['light'], report['heavy']
+            print(f"{rate:6.0f} {mode:<7} {light['p50']:10.2f} {light['p99']:10.2f} {heavy['p50']:9.2f} "
+                  f"{heavy['p99']:9.2f} {report['throughput']:8.1f} {light['busy'] + heavy['busy']:5d}")
+    failed = sum(report[kind]['failed'] for result in modes.values() for report in result['reports']
+                 for kind in ('light', 'heavy'))
+    for pool in modes['havuz']['pools']:
+        print(f"havuz {pool['name']:<5} ({pool['kind']}, {pool['workers']} worker, sınır {pool['max_pending']}): "
+              f"en yüksek bekleyen {pool['peak_pending']}, reddedilen {pool['rejected']}, "
+              f"bekleme p99 {pool['wait_ms']['p99']} ms, çalışma p99 {pool['run_ms']['p99']} ms")
+    if failed:
+        raise SystemExit(f"HATA: {failed} istek 200/503 dışında bir durum koduyla döndü")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""İsim çevirisi ve ebced hesabı: eski harf harf döngü ile derlenmiş tabloların karşılaştırması
+
+Kullanım (backend dizininden):
+    python -m benchmarks.name_converter [--repeat 5]
+"""
+import argparse
+import contextlib
+import io
+import time
+from utils.arabic_converter import (
+    LETTER_PROPERTIES, TURKISH_TO_ARABIC, convert_to_arabic_and_calculate_ebced, normalize_arabic_char
+)
+from utils.dataset import load_tables
+from utils.store import NameStore, turkish_casefold
+
+def legacy_transliterate(text: str) -> str:
+    """Eski harf harf çeviri (her çağrıda sözlük araması, karakter karakter birleştirme)"""
+    char_map = dict(TURKISH_TO_ARABIC)
+    arabic = ''
+    for char in text.lower():
+        arabic_char = char_map.get(char, char)
+        if arabic_char in LETTER_PROPERTIES:
+            arabic += arabic_char
+        else:
+            normalized_char = normalize_arabic_char(arabic_char)
+            if normalized_char in LETTER_PROPERTIES:
+                arabic += normalized_char
+    return arabic
+
+def legacy_analyze(arabic: str) -> tuple:
+    """Eski ebced döngüsü (bilinmeyen her karakter için normalizasyon)"""
+    total_ebced = 0
+    letters = []
+    for char in arabic:
+        if char in LETTER_PROPERTIES:
+            props = LETTER_PROPERTIES[char]
+            letter = char
+        else:
+            letter = normalize_arabic_char(char)
+            if letter not in LETTER_PROPERTIES:
+                continue
+            props = LETTER_PROPERTIES[letter]
+        total_ebced += props.ebced
+        letters.append({
+            'letter': letter,
+            'ebced': props.ebced,
+            'element': props.element,
+            'nurani_zulmani': 'N' if props.is_nurani else 'Z',
+            'gender': 'E' if props.is_eril else 'D'
+        })
+    return total_ebced, letters
+
+def legacy_convert(name: str) -> tuple:
+    # Konsol çıktıları da eski dönüştürücüdeki gibi yazılır, iki taraf aynı işi yapar;
+    # metin dönüştürücüyle aynı şekilde Türkçe küçük harfe çevrilir (I -> ı)
+    text = turkish_casefold(name.strip())
+    print(f"İsim veritabanında bulunamadı: {text}, harf harf çevriliyor...")
+    arabic = legacy_transliterate(text)
+    print(f"Harf harf çeviri sonucu: {text} -> {arabic}")
+    total_ebced, letters = legacy_analyze(arabic)
+    return arabic, total_ebced, {'letters': letters, 'total_ebced': total_ebced}
+
+def best_of(func, repeat: int) -> tuple:
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        # Dönüştürücünün konsol çıktıları ölçüme karışmasın
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    names = load_tables()['names']['name'].tolist()
+    # Boş depo: her isim veritabanında bulunamaz ve harf harf çevrilir
+    empty_store = NameStore([])
+    print(f"\n{len(names)} isim (harf harf çeviri + ebced)")
+
+    legacy_time, legacy_result = best_of(lambda: [legacy_convert(name) for name in names], args.repeat)
+    compiled_time, compiled_result = best_of(
+        lambda: [convert_to_arabic_and_calculate_ebced(name, empty_store, is_name=True) for name in names], args.repeat
+    )
+    if legacy_result != compiled_result:
+        raise SystemExit("HATA: derlenmiş dönüştürücü eski döngüyle aynı sonucu vermiyor")
+
+    print(f"Eski döngü      : {len(names) / legacy_time:12,.0f} isim/sn")
+    print(f"Derlenmiş tablo : {len(names) / compiled_time:12,.0f} isim/sn")
+    print(f"Hızlanma        : {legacy_time / compiled_time:12.1f}x (sonuçlar birebir aynı)")
+
+if __name__ == "__main__":
+    main()
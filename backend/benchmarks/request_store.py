@@ -0,0 +1,61 @@
+"""İstek sırasındaki tek satırlık aramalar: pandas maskeleri ile referans deposunun karşılaştırması
+
+Kullanım (backend dizininden):
+    python -m benchmarks.request_store [--lookups 2000]
+"""
+import argparse
+import random
+import time
+from utils.dataset import load_tables
+from utils.store import NameStore, VerseStore
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+def report(label: str, pandas_time: float, store_time: float, lookups: int):
+    print(f"{label:<16} pandas: {pandas_time / lookups * 1e6:9.1f} µs/arama   "
+          f"depo: {store_time / lookups * 1e6:7.2f} µs/arama   ({pandas_time / store_time:.0f}x)")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--lookups', type=int, default=2000)
+    args = parser.parse_args()
+
+    tables = load_tables()
+    names_df, quran_df = tables['names'], tables['quran']
+    names = NameStore.from_frame(names_df)
+    verses = VerseStore.from_frame(quran_df)
+
+    rng = random.Random(0)
+    # Başında/sonunda boşluk olan isimler ("Berre ") iki yolda da bulunamaz; örneklemeye alınmaz
+    searchable = [record for record in names.records if record.name == record.name.strip()]
+    name_keys = [rng.choice(searchable).name.lower() for _ in range(args.lookups)]
+    verse_keys = [(record.surah_number, record.verse_number)
+                  for record in (rng.choice(verses.records) for _ in range(args.lookups))]
+
+    def pandas_names():
+        for key in name_keys:
+            match = names_df[names_df['name'].str.lower() == key]
+            match.iloc[0]['arabic']
+
+    def store_names():
+        for key in name_keys:
+            names.find(key).arabic
+
+    def pandas_verses():
+        for surah, verse in verse_keys:
+            match = quran_df[(quran_df['surah_number'] == surah) & (quran_df['verse_number'] == verse)]
+            match.iloc[0]['verse_ebced']
+
+    def store_verses():
+        for surah, verse in verse_keys:
+            verses.get(surah, verse).verse_ebced
+
+    print(f"\n{len(names)} isim, {len(verses)} ayet, {args.lookups} arama")
+    report("İsim araması", timed(pandas_names), timed(store_names), args.lookups)
+    report("Ayet araması", timed(pandas_verses), timed(store_verses), args.lookups)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Worker başına bellek kullanımı: normal okuma ile bellek eşlemeli (mmap) snapshot
+
+Her iki mod için aynı anda birkaç worker süreci başlatır, tabloları yükletir ve
+/proc/self/smaps_rollup üzerinden sürece özel ve paylaşılan belleği raporlar
+(sadece Linux).
+
+Kullanım (backend dizininden):
+    python -m benchmarks.shared_memory [--workers 4]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+def memory_kb() -> dict:
+    values = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            key, _, rest = line.partition(':')
+            parts = rest.split()
+            if parts and parts[0].isdigit():
+                values[key] = int(parts[0])
+    return {
+        'private': values['Private_Clean'] + values['Private_Dirty'],
+        'shared': values['Shared_Clean'] + values['Shared_Dirty'],
+        'pss': values['Pss'],
+    }
+
+def worker(hold: float):
+    from utils.registry import registry
+    for table_name in ('names', 'esma', 'quran'):
+        registry.table(table_name, 'benchmark')
+    # Diğer worker'lar da eşlemeyi açana kadar beklenir, böylece paylaşım ölçülebilir
+    time.sleep(hold)
+    usage = memory_kb()
+    print(f"RESULT {usage['private']} {usage['shared']} {usage['pss']}", flush=True)
+
+def run_mode(mode: str, workers: int) -> list:
+    env = dict(os.environ, DATASET_MODE=mode)
+    processes = [
+        subprocess.Popen([sys.executable, '-m', 'benchmarks.shared_memory', '--worker'],
+                         env=env, stdout=subprocess.PIPE, text=True)
+        for _ in range(workers)
+    ]
+    results = []
+    for process in processes:
+        output = process.communicate()[0]
+        line = [l for l in output.splitlines() if l.startswith('RESULT')][-1]
+        results.append([int(value) for value in line.split()[1:]])
+    return results
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(hold=3.0)
+        return
+
+    print(f"\n{args.workers} worker, tüm tablolar yüklü")
+    print(f"{'Mod':<8} {'Özel KB/worker':>15} {'Paylaşılan KB':>14} {'PSS KB/worker':>14}")
+    for mode in ('memory', 'mmap'):
+        results = run_mode(mode, args.workers)
+        private = sum(r[0] for r in results) / len(results)
+        shared = sum(r[1] for r in results) / len(results)
+        pss = sum(r[2] for r in results) / len(results)
+        print(f"{mode:<8} {private:>15.0f} {shared:>14.0f} {pss:>14.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""Paylaşılan referans tablolarının eşzamanlı isteklerde değişmediğinin kontrolü
+
+Handler'lar önce tek thread'de, sonra birçok thread'de aynı anda çalıştırılır.
+Öncesinde ve sonrasında yüklü tabloların (DataFrame'ler) ve türetilmiş yapıların
+(depolar, indeksler, profiller) parmak izleri alınır; herhangi biri değişirse
+veya eşzamanlı yanıtlar tek thread'deki yanıtlardan farklıysa kontrol başarısız
+olur. Paylaşılan bir kayda yazma denemesi FrozenRecord tarafından hata olarak
+yakalanır ve yanıt farkı olarak görünür.
+
+Ağ gerektiren çeviri kullanan handler'lar (kişisel hastalık, geniş analiz)
+kontrole dahil edilmez.
+
+Kullanım (backend dizininden):
+    python -m benchmarks.shared_tables_check [--threads 8] [--rounds 20]
+"""
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+import numpy as np
+import pandas as pd
+
+NAMES = ["Ahmet", "Ayşe", "Mehmet", "Fatma", "İbrahim", "Işıl", "Zümra", "Xyzq", "Ali", "Elif", "ırmak", "Ömer"]
+
+def build_cases() -> list:
+    from routers import (name_query, manager_esma, personal_manager_esma, manager_verse,
+                         financial_blessing, disease_element, disease_organ, spiritual_issues,
+                         couple_compatibility, magic_analysis, disease_prone, name_coaching, esma_query,
+                         value_lookup, verse_profile)
+    from utils import analysis
+    cases = []
+    for i, mother in enumerate(NAMES):
+        child = NAMES[(i * 5 + 3) % len(NAMES)]
+        pair = f"{mother}|{child}"
+        cases += [
+            (f"name_query/{mother}", name_query.calculate_ebced, name_query.NameRequest(name=mother)),
+            (f"personal_manager_esma/{mother}", personal_manager_esma.analyze_personal_manager_esma,
+             personal_manager_esma.PersonalManagerEsmaRequest(name=mother)),
+            (f"manager_esma/{pair}", manager_esma.calculate_manager_esma,
+             manager_esma.ManagerEsmaRequest(mother_name=mother, child_name=child)),
+            (f"manager_verse/{pair}", manager_verse.calculate_manager_verse,
+             manager_verse.ManagerVerseRequest(mother_name=mother, child_name=child)),
+            (f"financial_blessing/{pair}", financial_blessing.analyze_financial_blessing,
+             financial_blessing.FinancialBlessingRequest(mother_name=mother, child_name=child)),
+            (f"disease_element/{pair}", disease_element.calculate_disease_element,
+             disease_element.DiseaseElementRequest(name=mother, mother_name=child, disease_type="x", target_element="SU")),
+            (f"disease_organ/{pair}", disease_organ.calculate_disease_organ,
+             disease_organ.DiseaseOrganRequest(mother_name=mother, child_name=child)),
+            (f"spiritual_issues/{pair}", spiritual_issues.calculate_spiritual_issues,
+             spiritual_issues.SpiritualIssuesRequest(mother_name=mother, child_name=child)),
+            (f"couple_compatibility/{pair}", couple_compatibility.analyze_couple_compatibility,
+             couple_compatibility.CoupleCompatibilityRequest(female_name=mother, male_name=child)),
+            (f"magic_analysis/{pair}", magic_analysis.analyze_magic_risk,
+             magic_analysis.MagicAnalysisRequest(mother_name=mother, child_name=child)),
+            (f"disease_prone/{pair}", disease_prone.analyze_disease_prone,
+             disease_prone.DiseaseProneMemberRequest(mother_name=mother, child_name=child)),
+            (f"name_coaching/{pair}", name_coaching.analyze_personal_name,
+             name_coaching.PersonalNameCoachingRequest(current_name=mother, suggested_names=[child, "Ali"],
+                                                       gender="male", criteria="nurani")),
+        ]
+    for value in range(0, 3000, 97):
+        for element in ("ATEŞ", "HAVA", "TOPRAK", "SU"):
+            cases.append((f"find_matching_esmas/{value}/{element}", disease_element.find_matching_esmas, value, element))
+        cases.append((f"esma_query/{value}", esma_query.nearest_esmas,
+                      esma_query.NearestEsmaRequest(ebced=value, k=5, element="HAVA", match="contains")))
+        elements = {e: analysis.ElementTally(2, value // 4) for e in ("ATEŞ", "HAVA", "TOPRAK", "SU")}
+        cases.append((f"personal_disease_esmas/{value}", analysis.find_matching_esmas, "SU", value, elements))
+        nurani = analysis.NuraniSummary(8, value, elements, "SU")
+        cases.append((f"similar_esmas/{value}", analysis.find_similar_esmas, nurani, 5))
+        cases.append((f"similar_verses/{value}", analysis.find_similar_verses, nurani, 5))
+        cases.append((f"value_lookup/{value}", value_lookup.lookup_value_range,
+                      value_lookup.ValueRangeRequest(min_ebced=value, max_ebced=value + 50, offset=1, limit=20)))
+        cases.append((f"words/{value}", value_lookup.lookup_words,
+                      value_lookup.WordLookupRequest(ebced=value % 500, limit=10)))
+        cases.append((f"verse_profile/{value}", verse_profile.search_verse_profiles,
+                      verse_profile.VerseProfileSearchRequest(element="SU", near_ebced=value * 3, limit=10)))
+        cases.append((f"verse/{value}", analysis.find_verse_by_numbers, value % 130, value % 300))
+    return cases
+
+def run_case(case) -> object:
+    """Handler'ı çalıştırır; sonucu veya hatayı karşılaştırılabilir biçimde döndürür"""
+    _, handler, *args = case
+    try:
+        result = handler(*args)
+        if asyncio.iscoroutine(result):
+            result = asyncio.run(result)
+        return result.model_dump() if hasattr(result, 'model_dump') else result
+    except Exception as e:
+        return f"{type(e).__name__}: {getattr(e, 'detail', e)}"
+
+def _walk(value, digest, seen: set):
+    """Yapının tüm içeriğini özet fonksiyonuna yazar (paylaşılan alt nesneler bir kez)"""
+    if isinstance(value, (str, int, float, bool, bytes)) or value is None:
+        digest.update(repr(value).encode('utf-8'))
+        return
+    if id(value) in seen:
+        return
+    seen.add(id(value))
+    digest.update(type(value).__name__.encode())
+    if isinstance(value, np.ndarray):
+        digest.update(value.tobytes())
+    elif isinstance(value, pd.DataFrame):
+        digest.update(repr((list(value.columns), [str(t) for t in value.dtypes])).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    elif isinstance(value, (dict, MappingProxyType)):
+        for key in sorted(value, key=repr):
+            _walk(key, digest, seen)
+            _walk(value[key], digest, seen)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in (sorted(value, key=repr) if isinstance(value, (set, frozenset)) else value):
+            _walk(item, digest, seen)
+    elif hasattr(value, '__slots__') or hasattr(value, '__dict__'):
+        slots = [slot for cls in type(value).__mro__ for slot in getattr(cls, '__slots__', ())]
+        for slot in slots:
+            _walk(getattr(value, slot, None), digest, seen)
+        for key, item in sorted(getattr(value, '__dict__', {}).items()):
+            if not callable(item):
+                _walk(item, digest, seen)
+    elif hasattr(value, '__array__'):
+        # Bellek eşlemeli metin kolonları
+        _walk(list(np.asarray(value)), digest, seen)
+    else:
+        digest.update(repr(value).encode('utf-8'))
+
+def fingerprints() -> dict:
+    """Güncel veri setindeki tabloların ve türetilmiş yapıların parmak izleri"""
+    from utils.registry import registry
+    data = registry.current()
+    result = {}
+    for name, table in sorted(data._tables.items()):
+        digest = hashlib.sha256()
+        _walk(table, digest, set())
+        result[f"table {name}"] = digest.hexdigest()
+    for key, value in sorted(data._derived.items()):
+        digest = hashlib.sha256()
+        _walk(value, digest, set())
+        result[f"derived {key}"] = digest.hexdigest()
+    return result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    # Handler'ların konsol çıktıları kontrolü boğmasın
+    devnull = open(os.devnull, 'w')
+    with contextlib.redirect_stdout(devnull):
+        cases = build_cases()
+        baseline = [run_case(case) for case in cases]
+        before = fingerprints()
+
+        work = [i for _ in range(args.rounds) for i in range(len(cases))]
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            results = list(pool.map(lambda i: (i, run_case(cases[i])), work))
+        after = fingerprints()
+
+    print(f"\n{len(cases)} istek x {args.rounds} tur, {args.threads} thread")
+    failed = False
+    for name in sorted(set(before) | set(after)):
+        changed = before.get(name) != after.get(name)
+        failed |= changed
+        print(f"{name:<32} {'DEĞİŞTİ' if changed else 'değişmedi'}")
+
+    mismatches = sorted({cases[i][0] for i, result in results if result != baseline[i]})
+    if mismatches:
+        failed = True
+        print(f"\nEşzamanlı yanıtı tek thread'deki yanıttan farklı {len(mismatches)} istek:")
+        for label in mismatches[:20]:
+            print(f"  {label}")
+    else:
+        print(f"\nTüm eşzamanlı yanıtlar tek thread'deki yanıtlarla aynı ({len(results)} çağrı)")
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Ayet ebced hesaplaması: harf harf döngü ile vektörel geçişin karşılaştırması
+
+Kullanım (backend dizininden):
+    python -m benchmarks.verse_ebced [--repeat 5]
+"""
+import argparse
+import time
+import numpy as np
+from utils.corpus import calculate_verse_ebced, calculate_verse_ebced_batch
+from utils.dataset import load_tables
+
+def best_of(func, repeat: int) -> tuple:
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    texts = load_tables()['quran']['arabic_text'].tolist()
+    chars = sum(len(str(text)) for text in texts)
+    print(f"\n{len(texts)} ayet, {chars} karakter")
+
+    loop_time, loop_result = best_of(lambda: [calculate_verse_ebced(text) for text in texts], max(1, args.repeat // 2))
+    batch_time, batch_result = best_of(lambda: calculate_verse_ebced_batch(texts), args.repeat)
+
+    if not np.array_equal(np.asarray(loop_result, dtype=np.int64), batch_result):
+        raise SystemExit("HATA: vektörel sonuçlar döngü sonuçlarıyla eşleşmiyor")
+
+    print(f"Harf harf döngü : {loop_time * 1000:9.1f} ms")
+    print(f"Vektörel geçiş  : {batch_time * 1000:9.1f} ms")
+    print(f"Hızlanma        : {loop_time / batch_time:9.1f}x (sonuçlar birebir aynı)")
+
+if __name__ == "__main__":
+    main()
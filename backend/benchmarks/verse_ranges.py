@@ -0,0 +1,84 @@
+"""Ayet aralığı toplamları: pandas ile toplama/tarama ile önek toplamı indeksinin karşılaştırması
+
+Tüm mushaf üzerinde:
+  - rastgele aralıkların toplamı (pandas dilim toplamı / O(1) önek farkı),
+  - hedef toplama eşit aralık araması (her başlangıçtan ileri tarayan döngü /
+    önek toplamı araması); sonuçların aynı olduğu doğrulanır.
+
+Kullanım (backend dizininden):
+    python -m benchmarks.verse_ranges [--ranges 5000] [--targets 50]
+"""
+import argparse
+import random
+import sys
+import time
+from utils.dataset import load_tables
+from utils.store import VerseStore
+from utils.verse_ranges import VerseRangeIndex
+
+def scan_ranges(ebceds: list, surahs: list, target: int, cross_surah: bool) -> list:
+    """Her başlangıçtan toplam hedefi aşana kadar ileri tarar (ebcedler pozitif)"""
+    matches = []
+    for start in range(len(ebceds)):
+        total = 0
+        for end in range(start, len(ebceds)):
+            if not cross_surah and surahs[end] != surahs[start]:
+                break
+            total += ebceds[end]
+            if total >= target:
+                if total == target:
+                    matches.append((start, end + 1))
+                break
+    return matches
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ranges', type=int, default=5000)
+    parser.add_argument('--targets', type=int, default=50)
+    args = parser.parse_args()
+
+    quran_df = load_tables()['quran']
+    start = time.perf_counter()
+    index = VerseRangeIndex(VerseStore.from_frame(quran_df))
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"\n{len(index)} ayet, indeks {build_ms:.1f} ms (kesin artan önek toplamları: {index.increasing})")
+
+    rng = random.Random(0)
+    column = quran_df['verse_ebced']
+    spans = []
+    for _ in range(args.ranges):
+        a, b = sorted(rng.randrange(len(index)) for _ in range(2))
+        spans.append((a, b + 1))
+
+    start = time.perf_counter()
+    expected = [int(column.iloc[a:b].sum()) for a, b in spans]
+    pandas_time = time.perf_counter() - start
+    start = time.perf_counter()
+    totals = [index.span_total(a, b) for a, b in spans]
+    index_time = time.perf_counter() - start
+    failed = totals != expected
+    print(f"Aralık toplamı   pandas: {pandas_time / args.ranges * 1e6:8.1f} µs   "
+          f"önek: {index_time / args.ranges * 1e6:6.2f} µs   {'aynı' if not failed else 'FARKLI'}")
+
+    ebceds = [index.span_total(i, i + 1) for i in range(len(index))]
+    surahs = index.surah_of.tolist()
+    targets = [rng.randrange(1, 20000) for _ in range(args.targets)]
+    for cross_surah in (False, True):
+        start = time.perf_counter()
+        expected = [scan_ranges(ebceds, surahs, target, cross_surah) for target in targets]
+        scan_time = time.perf_counter() - start
+        start = time.perf_counter()
+        found = [index.find(target, cross_surah) for target in targets]
+        index_time = time.perf_counter() - start
+        same = found == expected
+        failed |= not same
+        label = "Arama (sureler arası)" if cross_surah else "Arama (sure içi)"
+        print(f"{label:<22} tarama: {scan_time / args.targets * 1e3:8.2f} ms   "
+              f"önek: {index_time / args.targets * 1e3:6.3f} ms   "
+              f"{sum(map(len, found))} aralık   {'aynı' if same else 'FARKLI'}")
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Sure/ayet sadeleştirme: router'lardaki eski döngüler ile ortak çözücünün karşılaştırması
+
+Her kural için 0..--max aralığındaki tüm sayılar eski döngülerle ve çözücüyle
+(tekil ve toplu) sadeleştirilir; sonuçlar birebir aynı olmalıdır. Ardından
+tekil ve toplu sorguların süreleri ölçülür.
+
+Kullanım (backend dizininden):
+    python -m benchmarks.verse_resolver [--max 200000]
+"""
+import argparse
+import sys
+import time
+from utils.dataset import load_tables
+from utils.store import VerseStore
+from utils.verse_resolver import VerseResolver
+
+def legacy_root(num: int) -> int:
+    # financial_blessing.simplify_number
+    while num > 9:
+        num = sum(int(digit) for digit in str(num))
+    return num
+
+def legacy_financial_verse(ayah: int) -> int:
+    while ayah > 286:
+        temp = legacy_root(ayah)
+        if temp > 286:
+            ayah = legacy_root(temp)
+        else:
+            ayah = temp
+    return ayah
+
+def legacy_financial_surah(surah: int) -> int:
+    while surah > 114:
+        surah = legacy_root(surah)
+    return surah
+
+def legacy_manager_verse(verse_number: int) -> int:
+    while verse_number > 286:
+        verse_number = sum(int(digit) for digit in str(verse_number))
+    return verse_number
+
+def legacy_personal(number: int, limit: int) -> int:
+    if number > limit:
+        number = sum(int(digit) for digit in str(number))
+    return number
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--max', type=int, default=200000)
+    args = parser.parse_args()
+
+    resolver = VerseResolver(VerseStore.from_frame(load_tables()['quran']))
+    numbers = list(range(args.max + 1))
+    cases = [
+        ("financial ayet (root)", legacy_financial_verse, resolver.verse_limit, 'root'),
+        ("financial sure (root)", legacy_financial_surah, resolver.surah_limit, 'root'),
+        ("manager_verse ayet (repeat)", legacy_manager_verse, resolver.verse_limit, 'repeat'),
+        ("personal sure (once)", lambda n: legacy_personal(n, 114), resolver.surah_limit, 'once'),
+        ("personal ayet (once)", lambda n: legacy_personal(n, 286), resolver.verse_limit, 'once'),
+    ]
+
+    print(f"\nSınırlar: sure {resolver.surah_limit}, ayet {resolver.verse_limit}; "
+          f"tablo boyutu {resolver.size}, kontrol edilen aralık 0..{args.max}")
+    failed = False
+    for label, legacy, limit, rule in cases:
+        start = time.perf_counter()
+        expected = [legacy(n) for n in numbers]
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        single = [resolver.reduce(n, limit, rule) for n in numbers]
+        single_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = resolver.reduce_many(numbers, limit, rule)
+        batch_time = time.perf_counter() - start
+
+        same = single == expected and batch.tolist() == expected
+        failed |= not same
+        per = 1e9 / len(numbers)
+        print(f"{label:<28} eski: {legacy_time * per:7.0f} ns   tekil: {single_time * per:5.0f} ns   "
+              f"toplu: {batch_time * per:5.1f} ns   {'aynı' if same else 'FARKLI'}")
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
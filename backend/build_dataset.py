@@ -0,0 +1,58 @@
+import argparse
+import os
+import sys
+import time
+from utils.dataset import (
+    DATA_XLSX_PATH,
+    SNAPSHOT_PATH,
+    SnapshotError,
+    is_snapshot_stale,
+    load_tables_from_excel,
+    read_snapshot,
+    read_snapshot_header,
+    source_paths,
+    write_snapshot,
+)
+
+def check_snapshot(snapshot_path: str, xlsx_path: str) -> int:
+    """Snapshot'ın varlığını, bütünlüğünü ve güncelliğini kontrol eder"""
+    if not os.path.exists(snapshot_path):
+        print(f"Snapshot bulunamadı: {snapshot_path}")
+        return 1
+    try:
+        header, _ = read_snapshot_header(snapshot_path)
+        if is_snapshot_stale(header, source_paths(xlsx_path)):
+            print("Snapshot bayat, yeniden oluşturulmalı.")
+            return 1
+        start = time.perf_counter()
+        header, tables = read_snapshot(snapshot_path)
+        elapsed = (time.perf_counter() - start) * 1000
+    except SnapshotError as e:
+        print(f"Snapshot geçersiz: {str(e)}")
+        return 1
+    print(f"Snapshot geçerli (sürüm {header['version']}, {header['created_at']}), okuma süresi {elapsed:.1f} ms")
+    for name, df in tables.items():
+        print(f"  {name}: {len(df)} satır, sütunlar: {df.columns.tolist()}")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="data.xlsx dosyasından ikili veri seti snapshot'ı oluşturur")
+    parser.add_argument('--xlsx', default=DATA_XLSX_PATH, help="Kaynak Excel dosyası")
+    parser.add_argument('--out', default=SNAPSHOT_PATH, help="Oluşturulacak snapshot dosyası")
+    parser.add_argument('--check', action='store_true', help="Snapshot'ı oluşturmadan sadece doğrula")
+    args = parser.parse_args()
+
+    if args.check:
+        return check_snapshot(args.out, args.xlsx)
+
+    start = time.perf_counter()
+    tables = load_tables_from_excel(args.xlsx)
+    header = write_snapshot(tables, args.out, source_paths(args.xlsx))
+    elapsed = time.perf_counter() - start
+    size_kb = os.path.getsize(args.out) / 1024
+    print(f"\nSnapshot oluşturuldu: {args.out} ({size_kb:.0f} KB, {elapsed:.1f} sn)")
+    print(f"Payload SHA-256: {header['payload_sha256']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
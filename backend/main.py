@@ -1,32 +1,44 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Security, Request
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.security import HTTPBasic, HTTPBasicCredentials
-import pandas as pd
-from database import SessionLocal, engine
-from models.auth import Base, User
-from routers import (
-    auth,
-    name_query,
-    personal_disease,
-    manager_esma,
-    manager_verse,
-    spiritual_issues,
-    name_coaching,
-    disease_element,
-    personal_manager_esma,
-    couple_compatibility,
-    disease_organ,
-    magic_analysis,
-    disease_prone,
-    comprehensive_analysis,
-    financial_blessing,
-)
-import secrets
-import os
-from dotenv import load_dotenv
-from fastapi.responses import HTMLResponse
-from jinja2 import Template
+# Açılış profili ilk import edilmeli; aşamalar bu andan itibaren ölçülür
+from utils.startup import profiler, track_imports
+
+with profiler.phase("import framework"):
+    from fastapi import FastAPI, Depends, HTTPException, status, Security, Request
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.staticfiles import StaticFiles
+    from fastapi.security import HTTPBasic, HTTPBasicCredentials
+    import secrets
+    import os
+    from dotenv import load_dotenv
+    from fastapi.responses import HTMLResponse
+
+with profiler.phase("import database"):
+    from database import SessionLocal, engine
+    from models.auth import Base, User
+
+with profiler.phase("import application modules"), track_imports("routers", "utils"):
+    from utils.registry import registry, DatasetPinMiddleware
+    from routers import (
+        auth,
+        name_query,
+        personal_disease,
+        manager_esma,
+        manager_verse,
+        spiritual_issues,
+        name_coaching,
+        disease_element,
+        personal_manager_esma,
+        couple_compatibility,
+        disease_organ,
+        magic_analysis,
+        disease_prone,
+        comprehensive_analysis,
+        financial_blessing,
+        esma_query,
+        value_lookup,
+        verse_range,
+        verse_profile,
+        debug,
+    )
 
 # Load environment variables
 load_dotenv()
@@ -49,7 +61,8 @@ def verify_docs_credentials(credentials: HTTPBasicCredentials = Depends(security
     return credentials
 
 # Veritabanını oluştur
-Base.metadata.create_all(bind=engine)
+with profiler.phase("database create_all"):
+    Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="Ebced API",
@@ -91,6 +104,9 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
+# Her istek başladığı andaki veri seti sürümüyle tamamlanır (yeniden yükleme sırasında da)
+app.add_middleware(DatasetPinMiddleware)
+
 # Routerları ekle
 app.include_router(auth.router)
 
@@ -103,175 +119,64 @@ async def require_auth(current_user: User = Depends(auth.get_current_user)):
         )
     return current_user
 
-try:
-    # Excel dosyasından verileri oku
-    print("Excel dosyaları okunuyor...")
-    
-    # Excel dosyasını aç ve sayfa isimlerini kontrol et
-    excel_file = pd.ExcelFile('data/data.xlsx')
-    print(f"Excel sayfaları: {excel_file.sheet_names}")
-    
-    # İsimler sayfasını oku
-    print("\nİsimler sayfası okunuyor...")
-    names_df = pd.read_excel(excel_file, sheet_name='İsimler')
-    print("Ham veri örneği:")
-    print(names_df.head())
-    print(f"\nSütunlar: {names_df.columns.tolist()}")
-    print(f"Satır sayısı: {len(names_df)}")
-    
-    # İsimleri temizle
-    names_df = names_df.dropna(how='all')  # Tamamen boş satırları sil
-    names_df = names_df.iloc[1:]  # Header satırını atla
-    # Sütun isimlerini düzelt
-    names_df.columns = ['name', 'arabic', 'ebced', 'gender']
-    print("\nTemizlenmiş veri örneği:")
-    print(names_df.head())
-    print(f"Temizleme sonrası isim sayısı: {len(names_df)}")
-    
-    # Esma sayfasını oku
-    print("\nEsma sayfası okunuyor...")
-    try:
-        # Önce tüm sayfayı oku ve içeriğini göster
-        esma_df = pd.read_excel(excel_file, sheet_name='Esma Ebced', header=None, skiprows=2)
-        print("\nHam veri boyutu:", esma_df.shape)
-        print("\nİlk 10 satır:")
-        print(esma_df.head(10))
-        
-        # Boş satırları temizle
-        esma_df = esma_df.dropna(how='all')  # Tamamen boş satırları sil
-        print(f"\nBoş olmayan satır sayısı: {len(esma_df)}")
-        
-        # Sütun isimlerini ayarla
-        esma_df.columns = ['no', 'ebced', 'esma', 'arabic', 'meaning']
-        print("\nSütunlar:", esma_df.columns.tolist())
-        
-        # Ebced değerlerini sayıya çevir
-        esma_df['ebced'] = pd.to_numeric(esma_df['ebced'], errors='coerce')
-        print("\nEbced değerleri sayıya çevrildi")
-        print("Örnek ebced değerleri:", esma_df['ebced'].head())
-        
-        # Eksik verileri temizle
-        esma_df = esma_df.dropna(subset=['ebced', 'esma'])
-        print("\nTemizlenmiş veri örneği:")
-        print(esma_df[['esma', 'arabic', 'ebced', 'meaning']].head())
-        print(f"Temizleme sonrası esma sayısı: {len(esma_df)}")
-        
-    except Exception as e:
-        print(f"\nEsma verilerini okurken hata: {str(e)}")
-        print("Hata detayları:")
-        import traceback
-        traceback.print_exc()
-        esma_df = pd.DataFrame(columns=['no', 'esma', 'arabic', 'ebced', 'meaning'])
-    
-    # Kuran sayfasını oku
-    print("\nKuran sayfası okunuyor...")
-    quran_df = pd.read_excel(excel_file, sheet_name='Arapça Kuran')
-    
-    # Gerekli sütunları seç ve yeniden adlandır
-    quran_df = quran_df.rename(columns={
-        'SURE NO': 'surah_number',
-        'AYET NO': 'verse_number',
-        'SURE ADI': 'surah_name',
-        'DiyanetHatti.1': 'arabic_text',
-        'TurkceMeal': 'turkish_meaning'
-    })
-    
-    print("\n=== KURAN VERİLERİ KONTROL ===")
-    print("Mevcut sütunlar:", quran_df.columns.tolist())
-    print("\nİlk 5 ayetin Türkçe mealleri:")
-    for _, row in quran_df.head().iterrows():
-        print(f"Sure {row['surah_number']}, Ayet {row['verse_number']}, Sure Adı: {row['surah_name']}")
-        print(f"Türkçe Meal: {row['turkish_meaning']}")
-        print(f"Arapça Metin: {row['arabic_text']}")
-        print("-" * 50)
-    print("\nToplam ayet sayısı:", len(quran_df))
-    print("=== KONTROL SONU ===\n")
-    
-    # Kuran verilerini temizle
-    quran_df = quran_df.dropna(how='all')  # Tamamen boş satırları sil
-    print("\nTemizlenmiş veri örneği:")
-    print(quran_df.head())
-    print(f"Temizleme sonrası ayet sayısı: {len(quran_df)}")
-    
-    # Sayısal sütunları dönüştür
-    quran_df['surah_number'] = pd.to_numeric(quran_df['surah_number'], errors='coerce')
-    quran_df['verse_number'] = pd.to_numeric(quran_df['verse_number'], errors='coerce')
-    
-    # Ayet ebced değerleri hesaplanıyor...
-    print("\nAyet ebced değerleri hesaplanıyor...")
-    from utils.arabic_converter import LETTER_PROPERTIES
-
-    def calculate_verse_ebced(arabic_text: str) -> int:
-        total = 0
-        for char in str(arabic_text):
-            for props in LETTER_PROPERTIES.values():
-                if props.arabic == char:
-                    total += props.ebced
-                    break
-        return total
-
-    quran_df['verse_ebced'] = quran_df['arabic_text'].apply(calculate_verse_ebced)
-    print("Ebced değerleri hesaplandı.")
-    
-    # Sadece gerekli sütunları al
-    quran_df = quran_df[['surah_number', 'verse_number', 'surah_name', 'arabic_text', 'turkish_meaning', 'verse_ebced']]
-    
-    print("\nKuran DataFrame örnek veri:")
-    print(quran_df[['surah_number', 'verse_number', 'arabic_text']].head())
-    print("\nArabic text sütunu null değer kontrolü:")
-    print(quran_df['arabic_text'].isnull().sum(), "adet null değer var")
-    print("\nİlk 5 ayetin Arapça metinleri:")
-    for _, row in quran_df.head().iterrows():
-        print(f"Sure {row['surah_number']}, Ayet {row['verse_number']}:")
-        print(f"Arapça metin: {row['arabic_text']}")
-        print(f"Metin tipi: {type(row['arabic_text'])}")
-        print(f"Metin uzunluğu: {len(str(row['arabic_text']))}")
-        print("-" * 50)
-    
-    print("\nSütun isimleri düzeltildi:")
-    print(quran_df.columns.tolist())
-    print("\nVeri örneği:")
-    print(quran_df.head())
-    
-    print("\nVeri temizleme tamamlandı.")
+# Heavy iş havuzunun process'leri (spawn) `python main.py` ile açılan sunucuda bu modülü
+# __mp_main__ olarak yeniden çalıştırır; PDF oluşturan bu process'lerde tablo ön yüklemesi
+# ve izleyici gereksizdir
+POOL_WORKER = __name__ == "__mp_main__"
 
-    # Dataframe'leri başlat ve router'ları ekle
-    print("Router'lar başlatılıyor...")
+try:
+    # Referans tablolar (isimler, esmalar, Kuran) her router'ın bildirdiği şekilde
+    # ilk erişimde yüklenir; uzun süre çalışan sunucularda DATA_PRELOAD=1 ile
+    # açılışta yüklenebilir.
+    if os.getenv("DATA_PRELOAD") == "1" and not POOL_WORKER:
+        with profiler.phase("data preload"):
+            registry.preload()
+
+    # DATA_RELOAD_INTERVAL (saniye) verilirse data.xlsx / snapshot değişiklikleri
+    # arka planda yüklenip servisi durdurmadan devreye alınır
+    reload_interval = float(os.getenv("DATA_RELOAD_INTERVAL", "0"))
+    if reload_interval > 0 and not POOL_WORKER:
+        registry.start_watcher(reload_interval)
+
+    # Router'ları ekle
+    print("Router'lar ekleniyor...")
     routers_config = [
-        (name_query, "İsim Sorgulama", False),
-        (personal_disease, "Kişiye Özel Hastalık Sorgu", True),
-        (manager_esma, "Anne-Çocuk Yönetici Esma", False),
-        (manager_verse, "Yönetici Ayet", True),
-        (spiritual_issues, "Manevi Sıkıntılara Yatkınlık", False),
-        (name_coaching, "İsim Koçluğu", False),
-        (disease_element, "Hastalık Element", False),
-        (personal_manager_esma, "Kişisel Yönetici Esma", False),
-        (couple_compatibility, "Çift Uyumu", False),
-        (disease_organ, "Hastalığa Yatkın Organ", False),
-        (magic_analysis, "Büyü Analizi", False),
-        (disease_prone, "Hastalığa Yatkınlık", False),
-        (comprehensive_analysis, "Geniş Analiz", False),
-        (financial_blessing, "Maddi Blokaj/Bolluk Bereket Rızık", True),
+        (name_query, "İsim Sorgulama"),
+        (personal_disease, "Kişiye Özel Hastalık Sorgu"),
+        (manager_esma, "Anne-Çocuk Yönetici Esma"),
+        (manager_verse, "Yönetici Ayet"),
+        (spiritual_issues, "Manevi Sıkıntılara Yatkınlık"),
+        (name_coaching, "İsim Koçluğu"),
+        (disease_element, "Hastalık Element"),
+        (personal_manager_esma, "Kişisel Yönetici Esma"),
+        (couple_compatibility, "Çift Uyumu"),
+        (disease_organ, "Hastalığa Yatkın Organ"),
+        (magic_analysis, "Büyü Analizi"),
+        (disease_prone, "Hastalığa Yatkınlık"),
+        (comprehensive_analysis, "Geniş Analiz"),
+        (financial_blessing, "Maddi Blokaj/Bolluk Bereket Rızık"),
+        (esma_query, "Esma Sorgulama"),
+        (value_lookup, "Ebced Değeri Sorgulama"),
+        (verse_range, "Ayet Aralığı"),
+        (verse_profile, "Ayet Harf Profili"),
     ]
 
-    for router_module, name, needs_quran in routers_config:
-        try:
-            # Initialize dataframes
-            if needs_quran:
-                router_module.init_dataframes(names_df, esma_df, quran_df)
-            else:
-                router_module.init_dataframes(names_df, esma_df)
-            print(f"✓ {name} router'ı başarıyla başlatıldı.")
-            
-            # Add router with authentication
-            app.include_router(
-                router_module.router,
-                dependencies=[Depends(require_auth)]
-            )
-        except Exception as e:
-            print(f"✗ {name} router'ı başlatılırken hata: {str(e)}")
+    with profiler.phase("routers include"):
+        for router_module, name in routers_config:
+            try:
+                # Add router with authentication
+                app.include_router(
+                    router_module.router,
+                    dependencies=[Depends(require_auth)]
+                )
+                print(f"✓ {name} router'ı başarıyla eklendi.")
+            except Exception as e:
+                print(f"✗ {name} router'ı eklenirken hata: {str(e)}")
 
-    print("Router'lar başlatıldı ve eklendi.")
+        # Yönetici tanılama endpoint'leri (kendi admin kontrolünü yapar)
+        app.include_router(debug.router)
+
+    print("Router'lar eklendi.")
 
 except Exception as e:
     print(f"Kritik hata: {str(e)}")
@@ -281,9 +186,16 @@ except Exception as e:
 def root():
     return {"message": "Ebced Hesaplama API'sine Hoş Geldiniz"}
 
-# Rapor şablonunu yükle
-with open('sonucpdf.html', 'r', encoding='utf-8') as f:
-    report_template = Template(f.read())
+# Rapor şablonu ilk rapor isteğinde yüklenir (jinja2 açılışta import edilmez)
+report_template = None
+
+def get_report_template():
+    global report_template
+    if report_template is None:
+        from jinja2 import Template
+        with open('sonucpdf.html', 'r', encoding='utf-8') as f:
+            report_template = Template(f.read())
+    return report_template
 
 @app.post("/api/generate-report", response_class=HTMLResponse)
 async def generate_report(request: Request):
@@ -292,12 +204,32 @@ async def generate_report(request: Request):
         data = await request.json()
         
         # Şablonu render et
-        html = report_template.render(**data)
+        html = get_report_template().render(**data)
         
         return HTMLResponse(content=html, status_code=200)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+profiler.finish()
+
+# STARTUP_PROFILE=1 ile uvicorn/gunicorn altında da açılış profili yazdırılır
+if os.getenv("STARTUP_PROFILE") == "1":
+    print(profiler.format_table())
+
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description="Ebced API sunucusu")
+    parser.add_argument('--startup-report', action='store_true',
+                        help="Açılış aşamalarının sürelerini yazdırıp çık")
+    parser.add_argument('--json', action='store_true', help="Açılış raporunu JSON olarak yazdır")
+    args = parser.parse_args()
+
+    if args.startup_report:
+        if args.json:
+            import json
+            print(json.dumps(profiler.report(), ensure_ascii=False, indent=2))
+        else:
+            print(profiler.format_table())
+    else:
+        import uvicorn
+        uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
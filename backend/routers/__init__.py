@@ -14,4 +14,5 @@ from . import (
     disease_prone,
     comprehensive_analysis,
     financial_blessing,
+    debug,
 )
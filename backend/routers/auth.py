@@ -6,7 +6,6 @@ from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 import uuid
-from user_agents import parse
 from fastapi.responses import JSONResponse
 from sqlalchemy import or_
 
@@ -91,7 +90,8 @@ async def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends
                 content={"detail": "Incorrect username or password"}
             )
 
-        # User-Agent bilgisini parse edelim
+        # User-Agent bilgisini parse edelim (user_agents sadece girişte gerekli)
+        from user_agents import parse
         user_agent_string = request.headers.get("user-agent")
         user_agent = parse(user_agent_string)
         
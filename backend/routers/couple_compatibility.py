@@ -1,9 +1,10 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Dict, Optional
-import pandas as pd
 from utils.arabic_converter import convert_to_arabic_and_calculate_ebced, LETTER_PROPERTIES
 from pyarabic import araby
+from utils.registry import registry
+from utils.workers import light_pool, offload
 
 router = APIRouter(
     prefix="/couple-compatibility",
@@ -40,9 +41,8 @@ class CoupleCompatibilityResponse(BaseModel):
     compatibility: str
     compatibility_level: str
 
-# Global değişkenler
-names_df = None
-esma_df = None
+# Router'ın kullandığı tablolar ilk erişimde yüklenir
+tables = registry.bind("couple_compatibility", "names")
 
 COMPATIBILITY_MAP = {
     5: ("Gayet uyumlu bir çift", "Yüksek"),
@@ -57,14 +57,9 @@ COMPATIBILITY_MAP = {
     0: ("Birbirlerini yıpratabilirler o nedenle çok fazla önerilmez!  (Sonuç olumsuz gibi görünebilir ancak bu sonuçlar yalnızca ihtimalleri verir. O nedenle sonuçlara bakarak endişeye kapılmamalısınız. Sadece dikkatli olunması gerektiğini gösterir. Bununla beraber eğer çiftler ilişkilerinde öz verili ve dengeli olurlarsa Allah’ın izniyle her şeyin üstesinden gelebilirler. Kimseye olumsuz yorum yaparak ilişkilerine müdahele de bulunmayın. Aksi takdirde kişilerin kaderine (karmasına) müdahale etmiş olursunuz.)", "Çok Düşük")
 }
 
-def init_dataframes(names: pd.DataFrame, esmas: pd.DataFrame):
-    global names_df, esma_df
-    names_df = names
-    esma_df = esmas
-
 def analyze_person(name: str) -> tuple[str, int, List[LetterAnalysis], Dict[str, int], float, float]:
     """Kişinin ismini analiz eder"""
-    arabic, ebced, result = convert_to_arabic_and_calculate_ebced(name, names_df, is_name=True)
+    arabic, ebced, result = convert_to_arabic_and_calculate_ebced(name, tables.names, is_name=True)
     
     letters = []
     element_counts = {'ATEŞ': 0, 'HAVA': 0, 'TOPRAK': 0, 'SU': 0}
@@ -101,7 +96,8 @@ def analyze_person(name: str) -> tuple[str, int, List[LetterAnalysis], Dict[str,
     return arabic, ebced, letters, element_counts, nurani_ratio, gender_ratio
 
 @router.post("/calculate", response_model=CoupleCompatibilityResponse)
-async def calculate_compatibility(request: CoupleCompatibilityRequest):
+@offload(light_pool)
+def calculate_compatibility(request: CoupleCompatibilityRequest):
     try:
         # Erkek analizi
         male_arabic, male_ebced, male_letters, male_elements, male_nurani, male_gender = analyze_person(request.male_name)
@@ -153,10 +149,11 @@ async def calculate_compatibility(request: CoupleCompatibilityRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/analyze", response_model=CoupleCompatibilityResponse)
-async def analyze_couple_compatibility(request: CoupleCompatibilityRequest):
+@offload(light_pool)
+def analyze_couple_compatibility(request: CoupleCompatibilityRequest):
     try:
         # İlk ismi analiz et
-        name1_arabic, name1_ebced, name1_result = convert_to_arabic_and_calculate_ebced(request.male_name, names_df, is_name=True)
+        name1_arabic, name1_ebced, name1_result = convert_to_arabic_and_calculate_ebced(request.male_name, tables.names, is_name=True)
         name1_letters = [
             LetterAnalysis(
                 letter=letter['letter'],
@@ -170,7 +167,7 @@ async def analyze_couple_compatibility(request: CoupleCompatibilityRequest):
         name1_nurani = analyze_nurani_letters(name1_letters)
         
         # İkinci ismi analiz et
-        name2_arabic, name2_ebced, name2_result = convert_to_arabic_and_calculate_ebced(request.female_name, names_df, is_name=True)
+        name2_arabic, name2_ebced, name2_result = convert_to_arabic_and_calculate_ebced(request.female_name, tables.names, is_name=True)
         name2_letters = [
             LetterAnalysis(
                 letter=letter['letter'],
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends
+from models.auth import User
+from routers.auth import get_admin_user
+from utils.arabic_converter import CONVERSION_CACHE
+from utils.registry import registry
+from utils.startup import profiler
+from utils.workers import POOLS
+
+router = APIRouter(
+    prefix="/debug",
+    tags=["Tanılama"]
+)
+
+@router.get("/data-tables")
+async def get_data_tables(current_user: User = Depends(get_admin_user)):
+    """Bu süreçte hangi referans tabloların yüklendiğini ve hangi router'ların eriştiğini döndürür"""
+    return registry.report()
+
+@router.post("/reload-data")
+async def reload_data(current_user: User = Depends(get_admin_user)):
+    """Referans verilerini arka planda yeniden yükler; devam eden istekler eski sürümle tamamlanır"""
+    started = registry.reload_in_background('admin')
+    return {
+        "started": started,
+        "message": "Yeniden yükleme başlatıldı" if started else "Yeniden yükleme zaten sürüyor",
+        "current_version": registry.report()['version'],
+    }
+
+@router.get("/startup")
+async def get_startup_report(current_user: User = Depends(get_admin_user)):
+    """Açılış aşamalarının süre, CPU ve bellek ölçümlerini döndürür"""
+    return profiler.report()
+
+@router.get("/caches")
+async def get_caches(current_user: User = Depends(get_admin_user)):
+    """Önbelleklerin boyut, isabet, ıskalama ve atma sayılarını döndürür"""
+    return {"caches": [CONVERSION_CACHE.stats()]}
+
+@router.get("/workers")
+async def get_workers(current_user: User = Depends(get_admin_user)):
+    """İş havuzlarının kuyruk derinliği, reddedilen iş sayısı ve bekleme/çalışma sürelerini döndürür"""
+    return {"pools": [pool.stats() for pool in POOLS]}
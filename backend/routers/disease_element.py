@@ -1,9 +1,13 @@
 from fastapi import APIRouter, HTTPException
 from models.schemas import NameAnalysis, LetterAnalysis, EsmaInfo
-from utils.arabic_converter import convert_to_arabic_and_calculate_ebced, LETTER_PROPERTIES
-import pandas as pd
-from typing import List, Dict, Optional
+from utils.arabic_converter import convert_to_arabic_and_calculate_ebced
+import numpy as np
+from typing import List, Dict, Literal, Optional, Tuple
 from pydantic import BaseModel
+from utils.esma_profiles import ELEMENTS
+from utils.registry import registry
+from utils.store import EsmaIndex, EsmaRecord
+from utils.workers import light_pool, offload
 
 router = APIRouter(
     prefix="/disease-element",
@@ -16,6 +20,10 @@ class DiseaseElementRequest(BaseModel):
     mother_name: str
     disease_type: str
     target_element: str  # ATEŞ, HAVA, TOPRAK, SU
+    # classic: ebced yakınlığı + baskın element, similarity: element profili benzerliği;
+    # iki modda da önce hedef elementi baskın olan, yetmezse elementi içeren esmalar önerilir
+    recommendation_mode: Literal["classic", "similarity"] = "classic"
+    top_k: int = 10  # similarity modunda önerilecek esma sayısı
 
 class LetterAnalysis(BaseModel):
     letter: str
@@ -48,116 +56,90 @@ class DiseaseElementResponse(BaseModel):
     target_element: str
     matching_esmas: List[EsmaAnalysis]
 
-# Global değişkenler
-names_df = None
-esma_df = None
+# Router'ın kullandığı tablolar ilk erişimde yüklenir
+tables = registry.bind("disease_element", "names", "esma")
 
-def init_dataframes(names: pd.DataFrame, esmas: pd.DataFrame):
-    global names_df, esma_df
-    names_df = names
-    esma_df = esmas
+MAX_TOP_K = 50
 
 def analyze_name(name: str) -> tuple:
     """İsmin Arapça yazılışını ve harf analizini yapar"""
-    arabic, ebced, letters_data = convert_to_arabic_and_calculate_ebced(name, names_df)
+    arabic, ebced, letters_data = convert_to_arabic_and_calculate_ebced(name, tables.names)
     
     letters = []
     for letter in letters_data['letters']:
+        # Harf kaydında 'letter' Arapça harfin kendisidir, nurani/zulmani 'N'/'Z' olarak gelir
         letters.append(LetterAnalysis(
             letter=letter['letter'],
-            arabic=letter['arabic'],
+            arabic=letter['letter'],
             ebced=letter['ebced'],
             element=letter['element'],
-            is_nurani=letter['is_nurani'],
+            is_nurani=letter['nurani_zulmani'] == 'N',
             gender=letter['gender']
         ))
     
     return arabic, ebced, letters
 
-def analyze_esma_elements(arabic_text: str) -> Dict[str, int]:
-    """Bir esmanın element dağılımını analiz et (sadece nurani harfler)"""
-    element_counts = {'ATEŞ': 0, 'HAVA': 0, 'TOPRAK': 0, 'SU': 0}
-    
-    for char in arabic_text:
-        for props in LETTER_PROPERTIES.values():
-            if props.arabic == char and props.is_nurani:  # Sadece nurani harfleri say
-                element_counts[props.element] += 1
-                break
-    
-    return element_counts
-
-def find_dominant_element(element_counts: Dict[str, int]) -> str:
-    """Element sayılarına göre baskın elementi bul"""
-    max_count = max(element_counts.values())
-    if max_count == 0:
-        return "Baskın element yok"
-    
-    dominant_elements = [e for e, c in element_counts.items() if c == max_count]
-    return dominant_elements[0] if dominant_elements else "Baskın element yok"
+def find_candidates(index: EsmaIndex, name_ebced: int, tolerance: int) -> List[Tuple[EsmaRecord, float]]:
+    """Ebced farkı tolerans içinde kalan esmaları farka göre sıralı döndürür"""
+    candidates = [(esma, abs(esma.ebced - name_ebced)) for esma in index.within(name_ebced, tolerance)]
+    # Eşit farklı esmaların sırası önceki sort_values('difference') ile aynı kalsın diye
+    # numpy'nin varsayılan (quicksort) sıralaması kullanılır
+    order = np.argsort(np.array([difference for _, difference in candidates], dtype=np.float64), kind='quicksort')
+    return [candidates[i] for i in order]
 
 def find_matching_esmas(name_ebced: int, target_element: str, tolerance: int = 100) -> List[EsmaAnalysis]:
     """Ebced değerine yakın ve hedef elementi baskın olan esmaları bul"""
-    if esma_df is None:
-        raise HTTPException(status_code=500, detail="Esma veritabanı yüklenemedi")
-    
     print(f"\nAranan ebced değeri: {name_ebced}")
     print(f"Hedef element: {target_element}")
-    print("\nEsma DataFrame içeriği:")
-    print(f"Sütunlar: {esma_df.columns.tolist()}")
-    print(f"Satır sayısı: {len(esma_df)}")
+    print(f"Esma sayısı: {len(tables.esmas)}")
     
-    # Ebced değerlerini sayıya çevir
-    esma_df['ebced'] = pd.to_numeric(esma_df['ebced'], errors='coerce')
+    # Eksik alanı olmayan esmaların ebced indeksi
+    index = tables.esmas.complete_index
     
-    # NaN değerleri temizle
-    clean_df = esma_df.dropna(subset=['ebced', 'esma', 'arabic', 'meaning'])
-    
-    if clean_df.empty:
+    if not len(index):
         raise HTTPException(status_code=404, detail="Uygun esma bulunamadı")
     
     matching_esmas = []
     
-    # Ebced farkını hesapla
-    clean_df['difference'] = abs(clean_df['ebced'] - name_ebced)
-    
     # Tolerans içindeki esmaları al ve ebced farkına göre sırala
-    candidates = clean_df[clean_df['difference'] <= tolerance].sort_values('difference')
+    candidates = find_candidates(index, name_ebced, tolerance)
     
-    if candidates.empty:
+    if not candidates:
         # Toleransı artırarak tekrar dene
         tolerance = tolerance * 2
-        candidates = clean_df[clean_df['difference'] <= tolerance].sort_values('difference')
-        if candidates.empty:
+        candidates = find_candidates(index, name_ebced, tolerance)
+        if not candidates:
             raise HTTPException(
                 status_code=404, 
                 detail=f"Ebced değerine ({name_ebced}) yakın esma bulunamadı"
             )
     
     print("\nAday esmalar:")
-    print(candidates[['esma', 'arabic', 'ebced', 'difference']].head())
+    for row, difference in candidates[:5]:
+        print(f"{row.esma} {row.arabic} {row.ebced} {difference}")
     
-    # Her esma için element dağılımını hesapla
-    for _, row in candidates.iterrows():
-        # Element dağılımını hesapla
-        element_counts = analyze_esma_elements(row['arabic'])
-        
-        # Baskın elementi bul
-        dominant_element = find_dominant_element(element_counts)
+    # Element dağılımları veri seti yüklenirken hesaplanmış profillerden gelir
+    profiles = tables.esma_profiles
+    dominated = profiles.dominated_mask(target_element)
+    
+    for row, difference in candidates:
+        profile = profiles.profile(row)
+        dominant_element = profile.first_dominant or "Baskın element yok"
         
-        print(f"\nEsma: {row['esma']}")
-        print(f"Element dağılımı: {element_counts}")
+        print(f"\nEsma: {row.esma}")
+        print(f"Element dağılımı: {dict(profile.element_counts)}")
         print(f"Baskın element: {dominant_element}")
         
         # Hedef element baskınsa veya eşit dağılım varsa listeye ekle
-        if dominant_element == target_element or (element_counts[target_element] > 0 and max(element_counts.values()) == element_counts[target_element]):
+        if dominated[row.row]:
             matching_esmas.append(EsmaAnalysis(
-                name=row['esma'],
-                arabic=row['arabic'],
-                ebced=int(row['ebced']),
-                meaning=row['meaning'],
-                element_counts=element_counts,
+                name=row.esma,
+                arabic=row.arabic,
+                ebced=int(row.ebced),
+                meaning=row.meaning,
+                element_counts=dict(profile.element_counts),
                 dominant_element=dominant_element,
-                ebced_difference=int(row['difference'])
+                ebced_difference=int(difference)
             ))
     
     # Ebced farkına göre sırala
@@ -165,18 +147,18 @@ def find_matching_esmas(name_ebced: int, target_element: str, tolerance: int = 1
     
     if not matching_esmas:
         # İkinci bir deneme - sadece hedef elementi içeren esmaları al
-        for _, row in candidates.iterrows():
-            element_counts = analyze_esma_elements(row['arabic'])
-            if element_counts[target_element] > 0:
-                dominant_element = find_dominant_element(element_counts)
+        containing = profiles.containing_mask(target_element)
+        for row, difference in candidates:
+            if containing[row.row]:
+                profile = profiles.profile(row)
                 matching_esmas.append(EsmaAnalysis(
-                    name=row['esma'],
-                    arabic=row['arabic'],
-                    ebced=int(row['ebced']),
-                    meaning=row['meaning'],
-                    element_counts=element_counts,
-                    dominant_element=dominant_element,
-                    ebced_difference=int(row['difference'])
+                    name=row.esma,
+                    arabic=row.arabic,
+                    ebced=int(row.ebced),
+                    meaning=row.meaning,
+                    element_counts=dict(profile.element_counts),
+                    dominant_element=profile.first_dominant or "Baskın element yok",
+                    ebced_difference=int(difference)
                 ))
     
     if not matching_esmas:
@@ -191,8 +173,55 @@ def find_matching_esmas(name_ebced: int, target_element: str, tolerance: int = 1
     
     return matching_esmas[:10]  # En iyi 10 eşleşmeyi döndür
 
+def find_similar_esmas(letters: List[LetterAnalysis], total_ebced: int, target_element: str,
+                       k: int) -> List[EsmaAnalysis]:
+    """Nurani harflerin element profiline (ve nurani ebcedine) en çok benzeyen k esma
+
+    Önce hedef elementi baskın olan esmalar benzerliğe göre sıralanır; k'ya
+    yetmezse hedef elementi içeren diğer esmalar benzerlik sırasıyla eklenir.
+    """
+    counts = {element: 0 for element in ELEMENTS}
+    nurani_ebced = 0
+    for letter in letters:
+        if letter.is_nurani and letter.element in counts:
+            counts[letter.element] += 1
+            nurani_ebced += letter.ebced
+    
+    profiles = tables.esma_profiles
+    records = tables.esmas.records
+    index = tables.esma_similarity
+    query = [counts[e] for e in ELEMENTS]
+    dominated = profiles.dominated_mask(target_element)
+    nearest = index.nearest(query, nurani_ebced, k, mask=dominated)
+    if len(nearest) < k:
+        containing = profiles.containing_mask(target_element) & ~dominated
+        nearest += index.nearest(query, nurani_ebced, k - len(nearest), mask=containing)
+    if not nearest:
+        raise HTTPException(
+            status_code=404,
+            detail=f"{target_element} elementi içeren esma bulunamadı"
+        )
+    
+    similar_esmas = []
+    for row, distance in nearest:
+        esma = records[row]
+        profile = profiles.profile(esma)
+        similar_esmas.append(EsmaAnalysis(
+            name=esma.esma,
+            arabic=esma.arabic,
+            ebced=int(esma.ebced),
+            meaning=esma.meaning,
+            element_counts=dict(profile.element_counts),
+            dominant_element=profile.first_dominant or "Baskın element yok",
+            ebced_difference=int(abs(esma.ebced - total_ebced))
+        ))
+    return similar_esmas
+
 @router.post("/calculate", response_model=DiseaseElementResponse)
-async def calculate_disease_element(request: DiseaseElementRequest):
+@offload(light_pool)
+def calculate_disease_element(request: DiseaseElementRequest):
+    if not 1 <= request.top_k <= MAX_TOP_K:
+        raise HTTPException(status_code=400, detail=f"top_k 1 ile {MAX_TOP_K} arasında olmalıdır")
     try:
         # Kişinin ismini analiz et
         name_arabic, name_ebced, name_letters = analyze_name(request.name)
@@ -216,7 +245,11 @@ async def calculate_disease_element(request: DiseaseElementRequest):
         total_ebced = name_ebced + mother_ebced
         
         # Hedef elemente göre uygun esmaları bul
-        matching_esmas = find_matching_esmas(total_ebced, request.target_element)
+        if request.recommendation_mode == "similarity":
+            matching_esmas = find_similar_esmas(name_letters + mother_letters, total_ebced,
+                                                request.target_element, request.top_k)
+        else:
+            matching_esmas = find_matching_esmas(total_ebced, request.target_element)
         
         return DiseaseElementResponse(
             person_name_analysis=person_name_analysis,
@@ -227,6 +260,8 @@ async def calculate_disease_element(request: DiseaseElementRequest):
             matching_esmas=matching_esmas
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         print(f"Hata: {str(e)}")
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from utils.arabic_converter import convert_to_arabic_and_calculate_ebced
-import pandas as pd
+from utils.registry import registry
+from utils.workers import light_pool, offload
 
 router = APIRouter(prefix="/disease-organ", tags=["Hastalığa Yatkın Organ Hesaplama"])
 
@@ -38,20 +39,15 @@ ORGAN_MAP = {
     7: "Ayaklar"
 }
 
-# Global değişkenler
-names_df = None
-esma_df = None
-
-def init_dataframes(names: pd.DataFrame, esmas: pd.DataFrame):
-    global names_df, esma_df
-    names_df = names
-    esma_df = esmas
+# Router'ın kullandığı tablolar ilk erişimde yüklenir
+tables = registry.bind("disease_organ", "names")
 
 @router.post("/calculate")
-async def calculate_disease_organ(request: DiseaseOrganRequest) -> DiseaseOrganResponse:
+@offload(light_pool)
+def calculate_disease_organ(request: DiseaseOrganRequest) -> DiseaseOrganResponse:
     try:
         # Analyze mother's name
-        mother_arabic, mother_ebced, mother_elements = convert_to_arabic_and_calculate_ebced(request.mother_name, names_df)
+        mother_arabic, mother_ebced, mother_elements = convert_to_arabic_and_calculate_ebced(request.mother_name, tables.names)
         mother_letters = []
         for letter in mother_elements['letters']:
             mother_letters.append(
@@ -63,7 +59,7 @@ async def calculate_disease_organ(request: DiseaseOrganRequest) -> DiseaseOrganR
             )
         
         # Analyze child's name
-        child_arabic, child_ebced, child_elements = convert_to_arabic_and_calculate_ebced(request.child_name, names_df)
+        child_arabic, child_ebced, child_elements = convert_to_arabic_and_calculate_ebced(request.child_name, tables.names)
         child_letters = []
         for letter in child_elements['letters']:
             child_letters.append(
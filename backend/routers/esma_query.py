@@ -0,0 +1,95 @@
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from typing import List, Dict, Literal, Optional
+from utils.esma_profiles import EsmaProfile
+from utils.registry import registry
+from utils.workers import light_pool, offload
+
+router = APIRouter(
+    prefix="/esma-query",
+    tags=["Esma Sorgulama"]
+)
+
+# Router'ın kullandığı tablolar ilk erişimde yüklenir
+tables = registry.bind("esma_query", "esma")
+
+Element = Literal["ATEŞ", "HAVA", "TOPRAK", "SU"]
+MatchMode = Literal["dominant", "contains"]
+
+# Request ve Response modelleri
+class NearestEsmaRequest(BaseModel):
+    ebced: int
+    k: int = 5
+    element: Optional[Element] = None
+    match: MatchMode = "dominant"  # dominant: element baskın, contains: elementten en az bir nurani harf
+
+class EsmaRangeRequest(BaseModel):
+    min_ebced: int
+    max_ebced: int
+    element: Optional[Element] = None
+    match: MatchMode = "dominant"
+
+class EsmaCandidate(BaseModel):
+    name: str
+    arabic: str
+    ebced: int
+    meaning: str
+    element_counts: Dict[str, int]
+    dominant_elements: List[str]
+    dominant_element: str
+    nurani_ebced: int
+    ebced_difference: Optional[int] = None
+
+class EsmaQueryResponse(BaseModel):
+    element: Optional[str]
+    match: str
+    count: int
+    esmas: List[EsmaCandidate]
+
+def to_candidate(profile: EsmaProfile, difference: Optional[float] = None) -> EsmaCandidate:
+    esma = profile.esma
+    return EsmaCandidate(
+        name=esma.esma,
+        arabic=esma.arabic,
+        ebced=int(esma.ebced),
+        meaning=esma.meaning,
+        element_counts=dict(profile.element_counts),
+        dominant_elements=list(profile.dominant_elements),
+        dominant_element=profile.dominant_element,
+        nurani_ebced=profile.nurani_ebced,
+        ebced_difference=None if difference is None else int(difference)
+    )
+
+@router.post("/nearest", response_model=EsmaQueryResponse)
+@offload(light_pool)
+def nearest_esmas(request: NearestEsmaRequest):
+    """Ebced değerine en yakın k esmayı (isteğe bağlı element filtresiyle) döndürür"""
+    if not 1 <= request.k <= 99:
+        raise HTTPException(status_code=400, detail="k 1 ile 99 arasında olmalıdır")
+    try:
+        results = tables.esma_query.nearest(request.ebced, request.k, request.element, request.match)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return EsmaQueryResponse(
+        element=request.element,
+        match=request.match,
+        count=len(results),
+        esmas=[to_candidate(profile, difference) for profile, difference in results]
+    )
+
+@router.post("/range", response_model=EsmaQueryResponse)
+@offload(light_pool)
+def esmas_in_range(request: EsmaRangeRequest):
+    """Ebced değeri [min_ebced, max_ebced] aralığındaki esmaları döndürür"""
+    if request.min_ebced > request.max_ebced:
+        raise HTTPException(status_code=400, detail="min_ebced max_ebced'den büyük olamaz")
+    try:
+        results = tables.esma_query.between(request.min_ebced, request.max_ebced, request.element, request.match)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return EsmaQueryResponse(
+        element=request.element,
+        match=request.match,
+        count=len(results),
+        esmas=[to_candidate(profile) for profile in results]
+    )
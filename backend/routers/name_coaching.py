@@ -1,8 +1,9 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Dict, Optional, Literal
-import pandas as pd
 from utils.arabic_converter import convert_to_arabic_and_calculate_ebced, LETTER_PROPERTIES
+from utils.registry import registry
+from utils.workers import light_pool, offload
 
 router = APIRouter(
     prefix="/name-coaching",
@@ -52,9 +53,8 @@ class NameCoachingResponse(BaseModel):
     recommendation_reason: str
     warning_message: str
 
-# Global değişkenler
-names_df = None
-esma_df = None
+# Router'ın kullandığı tablolar ilk erişimde yüklenir
+tables = registry.bind("name_coaching", "names")
 
 ELEMENT_FRIENDS = {
     'ATEŞ': ['ATEŞ', 'HAVA'],
@@ -63,14 +63,9 @@ ELEMENT_FRIENDS = {
     'SU': ['SU', 'TOPRAK']
 }
 
-def init_dataframes(names: pd.DataFrame, esmas: pd.DataFrame):
-    global names_df, esma_df
-    names_df = names
-    esma_df = esmas
-
 def analyze_name(name: str) -> NameAnalysis:
     """İsmi analiz eder ve sonuçları döndürür"""
-    arabic, ebced, result = convert_to_arabic_and_calculate_ebced(name, names_df, is_name=True)
+    arabic, ebced, result = convert_to_arabic_and_calculate_ebced(name, tables.names, is_name=True)
     
     letters = []
     element_counts = {'ATEŞ': 0, 'HAVA': 0, 'TOPRAK': 0, 'SU': 0}
@@ -192,7 +187,8 @@ def find_compatible_names_for_person(current_analysis: NameAnalysis,
     return compatible_names, reason
 
 @router.post("/child-name", response_model=NameCoachingResponse)
-async def analyze_child_name(request: ChildNameCoachingRequest):
+@offload(light_pool)
+def analyze_child_name(request: ChildNameCoachingRequest):
     """Çocuk için isim koçluğu analizi yapar"""
     try:
         # Anne ismini analiz et
@@ -221,7 +217,8 @@ async def analyze_child_name(request: ChildNameCoachingRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/personal-name", response_model=NameCoachingResponse)
-async def analyze_personal_name(request: PersonalNameCoachingRequest):
+@offload(light_pool)
+def analyze_personal_name(request: PersonalNameCoachingRequest):
     """Kişisel isim değişikliği için analiz yapar"""
     try:
         # Mevcut ismi analiz et
@@ -252,10 +249,11 @@ async def analyze_personal_name(request: PersonalNameCoachingRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/analyze", response_model=NameCoachingResponse)
-async def analyze_name_coaching(request: NameCoachingRequest):
+@offload(light_pool)
+def analyze_name_coaching(request: NameCoachingRequest):
     try:
         # Anne ismini analiz et
-        mother_arabic, mother_ebced, mother_result = convert_to_arabic_and_calculate_ebced(request.mother_name, names_df, is_name=True)
+        mother_arabic, mother_ebced, mother_result = convert_to_arabic_and_calculate_ebced(request.mother_name, tables.names, is_name=True)
         mother_letters = [
             LetterAnalysis(
                 letter=letter['letter'],
@@ -269,7 +267,7 @@ async def analyze_name_coaching(request: NameCoachingRequest):
         mother_nurani = analyze_nurani_letters(mother_letters)
         
         # Baba ismini analiz et
-        father_arabic, father_ebced, father_result = convert_to_arabic_and_calculate_ebced(request.father_name, names_df, is_name=True)
+        father_arabic, father_ebced, father_result = convert_to_arabic_and_calculate_ebced(request.father_name, tables.names, is_name=True)
         father_letters = [
             LetterAnalysis(
                 letter=letter['letter'],
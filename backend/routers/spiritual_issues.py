@@ -1,7 +1,8 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from utils.arabic_converter import convert_to_arabic_and_calculate_ebced
-import pandas as pd
+from utils.registry import registry
+from utils.workers import light_pool, offload
 
 router = APIRouter(prefix="/spiritual-issues", tags=["Manevi Sıkıntılara Yatkınlık Hesaplama"])
 
@@ -37,20 +38,15 @@ ISSUE_MAP = {
     0: ("Yel veya Romatizma", "Eklem ağrıları ve romatizmal rahatsızlıklara yatkınlık vardır.")
 }
 
-# Global değişkenler
-names_df = None
-esma_df = None
-
-def init_dataframes(names: pd.DataFrame, esmas: pd.DataFrame):
-    global names_df, esma_df
-    names_df = names
-    esma_df = esmas
+# Router'ın kullandığı tablolar ilk erişimde yüklenir
+tables = registry.bind("spiritual_issues", "names")
 
 @router.post("/calculate")
-async def calculate_spiritual_issues(request: SpiritualIssuesRequest) -> SpiritualIssuesResponse:
+@offload(light_pool)
+def calculate_spiritual_issues(request: SpiritualIssuesRequest) -> SpiritualIssuesResponse:
     try:
         # Analyze mother's name
-        mother_arabic, mother_ebced, mother_elements = convert_to_arabic_and_calculate_ebced(request.mother_name, names_df)
+        mother_arabic, mother_ebced, mother_elements = convert_to_arabic_and_calculate_ebced(request.mother_name, tables.names)
         mother_letters = []
         for letter in mother_elements['letters']:
             mother_letters.append(
@@ -62,7 +58,7 @@ async def calculate_spiritual_issues(request: SpiritualIssuesRequest) -> Spiritu
             )
         
         # Analyze child's name
-        child_arabic, child_ebced, child_elements = convert_to_arabic_and_calculate_ebced(request.child_name, names_df)
+        child_arabic, child_ebced, child_elements = convert_to_arabic_and_calculate_ebced(request.child_name, tables.names)
         child_letters = []
         for letter in child_elements['letters']:
             child_letters.append(
@@ -0,0 +1,167 @@
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from typing import List, Dict, Literal, Optional
+from utils.arabic_converter import convert_to_arabic_and_calculate_ebced
+from utils.registry import registry
+from utils.store import is_missing
+from utils.value_index import ValuePage
+from utils.word_index import QuranWord
+from utils.workers import light_pool, offload
+
+router = APIRouter(
+    prefix="/value-lookup",
+    tags=["Ebced Değeri Sorgulama"]
+)
+
+# Router'ın kullandığı tablolar ilk erişimde yüklenir
+tables = registry.bind("value_lookup", "names", "esma", "quran", "quran_words")
+
+Kind = Literal["name", "esma", "surah", "verse"]
+
+MAX_PAGE_SIZE = 500
+
+# Request ve Response modelleri
+class ValueLookupRequest(BaseModel):
+    ebced: int
+    kinds: Optional[List[Kind]] = None  # Boşsa tüm türler
+    offset: int = 0
+    limit: int = 50
+
+class ValueRangeRequest(BaseModel):
+    min_ebced: int
+    max_ebced: int
+    kinds: Optional[List[Kind]] = None
+    offset: int = 0
+    limit: int = 50
+
+class WordLookupRequest(BaseModel):
+    ebced: Optional[int] = None
+    name: Optional[str] = None  # Ebced verilmezse ismin ebced değeri kullanılır
+    offset: int = 0
+    limit: int = 50
+
+class ValueEntity(BaseModel):
+    kind: str
+    ebced: int
+    name: str  # İsim, esma veya sure adı
+    arabic: Optional[str] = None
+    meaning: Optional[str] = None
+    gender: Optional[str] = None
+    surah_number: Optional[int] = None
+    verse_number: Optional[int] = None
+    verse_count: Optional[int] = None
+
+class ValueLookupResponse(BaseModel):
+    min_ebced: int
+    max_ebced: int
+    total: int
+    counts: Dict[str, int]
+    offset: int
+    limit: int
+    items: List[ValueEntity]
+
+class WordEntity(BaseModel):
+    surah_number: int
+    verse_number: int
+    word_position: int
+    text: str
+    ebced: int
+    letter_count: int
+    nurani_count: int
+    nurani_ebced: int
+    element_counts: Dict[str, int]
+
+class WordLookupResponse(BaseModel):
+    ebced: int
+    name: Optional[str]
+    total: int
+    offset: int
+    limit: int
+    words: List[WordEntity]
+
+def _text(value) -> Optional[str]:
+    return None if is_missing(value) else str(value)
+
+def to_entity(kind: str, ebced: int, record) -> ValueEntity:
+    if kind == "name":
+        return ValueEntity(kind=kind, ebced=ebced, name=str(record.name), arabic=_text(record.arabic),
+                           gender=_text(record.gender))
+    if kind == "esma":
+        return ValueEntity(kind=kind, ebced=ebced, name=str(record.esma), arabic=_text(record.arabic),
+                           meaning=_text(record.meaning))
+    if kind == "surah":
+        return ValueEntity(kind=kind, ebced=ebced, name=str(record.surah_name),
+                           surah_number=int(record.surah_number), verse_count=record.verse_count)
+    return ValueEntity(kind=kind, ebced=ebced, name=str(record.surah_name), arabic=_text(record.arabic_text),
+                       meaning=_text(record.turkish_meaning), surah_number=int(record.surah_number),
+                       verse_number=int(record.verse_number))
+
+def validate_page(offset: int, limit: int):
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="offset negatif olamaz")
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit 1 ile {MAX_PAGE_SIZE} arasında olmalıdır")
+
+def to_response(page: ValuePage, min_ebced: int, max_ebced: int, limit: int) -> ValueLookupResponse:
+    return ValueLookupResponse(
+        min_ebced=min_ebced,
+        max_ebced=max_ebced,
+        total=page.total,
+        counts=page.counts,
+        offset=page.offset,
+        limit=limit,
+        items=[to_entity(kind, ebced, record) for kind, ebced, record in page.items]
+    )
+
+@router.post("/lookup", response_model=ValueLookupResponse)
+@offload(light_pool)
+def lookup_value(request: ValueLookupRequest):
+    """Ebced değerini taşıyan isim, esma, sure ve ayetleri döndürür"""
+    validate_page(request.offset, request.limit)
+    page = tables.value_index.lookup(request.ebced, request.kinds, request.offset, request.limit)
+    return to_response(page, request.ebced, request.ebced, request.limit)
+
+@router.post("/range", response_model=ValueLookupResponse)
+@offload(light_pool)
+def lookup_value_range(request: ValueRangeRequest):
+    """Ebced değeri [min_ebced, max_ebced] aralığındaki kayıtları (değer sırasıyla) döndürür"""
+    if request.min_ebced > request.max_ebced:
+        raise HTTPException(status_code=400, detail="min_ebced max_ebced'den büyük olamaz")
+    validate_page(request.offset, request.limit)
+    page = tables.value_index.between(request.min_ebced, request.max_ebced, request.kinds,
+                                      request.offset, request.limit)
+    return to_response(page, request.min_ebced, request.max_ebced, request.limit)
+
+def to_word_entity(word: QuranWord) -> WordEntity:
+    return WordEntity(
+        surah_number=word.surah_number,
+        verse_number=word.verse_number,
+        word_position=word.word_position,
+        text=word.text,
+        ebced=word.ebced,
+        letter_count=word.letter_count,
+        nurani_count=word.nurani_count,
+        nurani_ebced=word.nurani_ebced,
+        element_counts=dict(word.element_counts)
+    )
+
+@router.post("/words", response_model=WordLookupResponse)
+@offload(light_pool)
+def lookup_words(request: WordLookupRequest):
+    """Ebced değeri (veya ismin ebced değeri) ile aynı olan Kuran kelimelerini döndürür"""
+    validate_page(request.offset, request.limit)
+    if request.ebced is not None:
+        ebced = request.ebced
+    elif request.name:
+        ebced = convert_to_arabic_and_calculate_ebced(request.name, tables.names, True)[1]
+    else:
+        raise HTTPException(status_code=400, detail="ebced veya name verilmelidir")
+    total, words = tables.words.lookup(ebced, request.offset, request.limit)
+    return WordLookupResponse(
+        ebced=ebced,
+        name=request.name,
+        total=total,
+        offset=request.offset,
+        limit=request.limit,
+        words=[to_word_entity(word) for word in words]
+    )
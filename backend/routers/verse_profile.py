@@ -0,0 +1,110 @@
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from typing import List, Dict, Literal, Optional
+from utils.registry import registry
+from utils.store import is_missing
+from utils.verse_profiles import VerseProfile
+from utils.workers import light_pool, offload
+
+router = APIRouter(
+    prefix="/verse-profile",
+    tags=["Ayet Harf Profili"]
+)
+
+# Router'ın kullandığı tablolar ilk erişimde yüklenir
+tables = registry.bind("verse_profile", "quran", "verse_profiles")
+
+Element = Literal["ATEŞ", "HAVA", "TOPRAK", "SU"]
+
+MAX_PAGE_SIZE = 500
+
+# Request ve Response modelleri
+class VerseProfileRequest(BaseModel):
+    surah_number: int
+    verse_number: int
+
+class VerseProfileSearchRequest(BaseModel):
+    element: Optional[Element] = None
+    match: Literal["dominant", "contains"] = "dominant"  # Baskın nurani element mi, nurani harf içeriyor mu
+    near_ebced: Optional[int] = None  # Verilirse sonuçlar bu değere yakınlığa göre sıralanır
+    min_ebced: Optional[int] = None
+    max_ebced: Optional[int] = None
+    offset: int = 0
+    limit: int = 50
+
+class VerseProfileEntity(BaseModel):
+    surah_number: int
+    verse_number: int
+    surah_name: str
+    arabic_text: Optional[str] = None
+    ebced: int
+    letter_count: int
+    nurani_count: int
+    zulmani_count: int
+    nurani_ebced: int
+    zulmani_ebced: int
+    eril_count: int
+    disil_count: int
+    element_counts: Dict[str, int]
+    element_ebced: Dict[str, int]
+    element_nurani: Dict[str, int]
+    dominant_elements: List[str]
+
+class VerseProfileSearchResponse(BaseModel):
+    total: int
+    offset: int
+    limit: int
+    verses: List[VerseProfileEntity]
+
+def _text(value) -> Optional[str]:
+    return None if is_missing(value) else str(value)
+
+def to_entity(profile: VerseProfile) -> VerseProfileEntity:
+    verse = profile.verse
+    return VerseProfileEntity(
+        surah_number=int(verse.surah_number),
+        verse_number=int(verse.verse_number),
+        surah_name=_text(verse.surah_name) or "",
+        arabic_text=_text(verse.arabic_text),
+        ebced=profile.ebced,
+        letter_count=profile.letter_count,
+        nurani_count=profile.nurani_count,
+        zulmani_count=profile.zulmani_count,
+        nurani_ebced=profile.nurani_ebced,
+        zulmani_ebced=profile.zulmani_ebced,
+        eril_count=profile.eril_count,
+        disil_count=profile.disil_count,
+        element_counts=dict(profile.element_counts),
+        element_ebced=dict(profile.element_ebced),
+        element_nurani=dict(profile.element_nurani),
+        dominant_elements=list(profile.dominant_elements)
+    )
+
+@router.post("/verse", response_model=VerseProfileEntity)
+@offload(light_pool)
+def verse_profile(request: VerseProfileRequest):
+    """Tek bir ayetin nurani/zulmani, eril/dişil ve element profilini döndürür"""
+    verse = tables.verses.get(request.surah_number, request.verse_number)
+    if verse is None:
+        raise HTTPException(status_code=404, detail=f"Ayet bulunamadı: {request.surah_number}:{request.verse_number}")
+    return to_entity(tables.verse_profiles.profile(verse.row))
+
+@router.post("/search", response_model=VerseProfileSearchResponse)
+@offload(light_pool)
+def search_verse_profiles(request: VerseProfileSearchRequest):
+    """Element ve ebced filtrelerine uyan ayetleri döndürür (ör. baskın nurani elementi SU, ebcedi X'e yakın)"""
+    if request.offset < 0:
+        raise HTTPException(status_code=400, detail="offset negatif olamaz")
+    if not 1 <= request.limit <= MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit 1 ile {MAX_PAGE_SIZE} arasında olmalıdır")
+    if request.min_ebced is not None and request.max_ebced is not None and request.min_ebced > request.max_ebced:
+        raise HTTPException(status_code=400, detail="min_ebced max_ebced'den büyük olamaz")
+    total, profiles = tables.verse_profiles.search(request.element, request.match, request.near_ebced,
+                                                   request.min_ebced, request.max_ebced,
+                                                   request.offset, request.limit)
+    return VerseProfileSearchResponse(
+        total=total,
+        offset=request.offset,
+        limit=request.limit,
+        verses=[to_entity(profile) for profile in profiles]
+    )
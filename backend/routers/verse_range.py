@@ -0,0 +1,105 @@
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from typing import List, Optional
+from utils.arabic_converter import convert_to_arabic_and_calculate_ebced
+from utils.registry import registry
+from utils.store import is_missing
+from utils.workers import light_pool, offload
+
+router = APIRouter(
+    prefix="/verse-range",
+    tags=["Ayet Aralığı"]
+)
+
+# Router'ın kullandığı tablolar ilk erişimde yüklenir
+tables = registry.bind("verse_range", "names", "quran")
+
+MAX_RESULTS = 500
+
+# Request ve Response modelleri
+class VerseRangeTotalRequest(BaseModel):
+    surah_number: int
+    start_verse: int
+    end_verse: int
+    end_surah: Optional[int] = None  # Boşsa aralık aynı surede biter
+
+class VerseRangeSearchRequest(BaseModel):
+    target_ebced: Optional[int] = None
+    names: List[str] = []  # Hedef verilmezse isimlerin ebced toplamı (ör. anne + çocuk)
+    cross_surah: bool = False
+    limit: int = 50
+
+class VerseRange(BaseModel):
+    start_surah: int
+    start_verse: int
+    end_surah: int
+    end_verse: int
+    surah_name: str  # Başlangıç suresinin adı
+    end_surah_name: str  # Bitiş suresinin adı (aralık tek surede ise aynı)
+    verse_count: int
+    total_ebced: int
+
+class VerseRangeSearchResponse(BaseModel):
+    target_ebced: int
+    names: List[str]
+    cross_surah: bool
+    count: int
+    ranges: List[VerseRange]
+
+def surah_name(verse) -> str:
+    return str(verse.surah_name) if not is_missing(verse.surah_name) else ""
+
+def to_range(start: int, end: int) -> VerseRange:
+    """[start, end) konumlarındaki ayet aralığı"""
+    index = tables.verse_ranges
+    first, last = index.verses[start], index.verses[end - 1]
+    return VerseRange(
+        start_surah=int(first.surah_number),
+        start_verse=int(first.verse_number),
+        end_surah=int(last.surah_number),
+        end_verse=int(last.verse_number),
+        surah_name=surah_name(first),
+        end_surah_name=surah_name(last),
+        verse_count=end - start,
+        total_ebced=index.span_total(start, end)
+    )
+
+@router.post("/total", response_model=VerseRange)
+@offload(light_pool)
+def verse_range_total(request: VerseRangeTotalRequest):
+    """Başlangıç ve bitiş ayeti dahil aralığın ebced toplamını döndürür"""
+    index = tables.verse_ranges
+    end_surah = request.surah_number if request.end_surah is None else request.end_surah
+    start = index.position(request.surah_number, request.start_verse)
+    end = index.position(end_surah, request.end_verse)
+    if start is None:
+        raise HTTPException(status_code=404, detail=f"Ayet bulunamadı: {request.surah_number}:{request.start_verse}")
+    if end is None:
+        raise HTTPException(status_code=404, detail=f"Ayet bulunamadı: {end_surah}:{request.end_verse}")
+    if end < start:
+        raise HTTPException(status_code=400, detail="Bitiş ayeti başlangıç ayetinden önce olamaz")
+    return to_range(start, end + 1)
+
+@router.post("/search", response_model=VerseRangeSearchResponse)
+@offload(light_pool)
+def search_verse_ranges(request: VerseRangeSearchRequest):
+    """Ebced toplamı hedef değere eşit ardışık ayet aralıklarını döndürür"""
+    if not 1 <= request.limit <= MAX_RESULTS:
+        raise HTTPException(status_code=400, detail=f"limit 1 ile {MAX_RESULTS} arasında olmalıdır")
+    if request.target_ebced is None:
+        if not request.names:
+            raise HTTPException(status_code=400, detail="target_ebced veya names verilmelidir")
+        target = sum(
+            convert_to_arabic_and_calculate_ebced(name, tables.names, True)[1] for name in request.names
+        )
+    else:
+        target = request.target_ebced
+
+    matches = tables.verse_ranges.find(target, request.cross_surah)
+    return VerseRangeSearchResponse(
+        target_ebced=target,
+        names=request.names,
+        cross_surah=request.cross_surah,
+        count=len(matches),
+        ranges=[to_range(start, end) for start, end in matches[:request.limit]]
+    )
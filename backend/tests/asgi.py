@@ -0,0 +1,37 @@
+"""Testler için küçük ASGI istemcisi (TestClient yeni httpx sürümü gerektirir)"""
+import asyncio
+import json
+from fastapi import FastAPI
+
+def app_with(*routers) -> FastAPI:
+    """Router'ları kimlik doğrulamasız bir uygulamaya ekler"""
+    app = FastAPI()
+    for router in routers:
+        app.include_router(router)
+    return app
+
+async def request(app, path: str, body: dict = None, method: str = "POST") -> tuple:
+    """İstek gönderir: (durum kodu, JSON yanıt, başlıklar); aynı event loop'ta eşzamanlı kullanılabilir"""
+    data = json.dumps(body).encode() if body is not None else b""
+    messages = [{"type": "http.request", "body": data, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "http_version": "1.1", "method": method, "path": path, "raw_path": path.encode(),
+             "query_string": b"", "headers": [(b"content-type", b"application/json")],
+             "scheme": "http", "server": ("test", 80), "client": ("test", 1), "root_path": ""}
+    await app(scope, receive, send)
+    start = next(m for m in sent if m["type"] == "http.response.start")
+    payload = b"".join(m.get("body", b"") for m in sent if m["type"] == "http.response.body")
+    headers = {key.decode(): value.decode() for key, value in start.get("headers", [])}
+    return start["status"], json.loads(payload) if payload else None, headers
+
+def post(app, path: str, body: dict) -> tuple:
+    """JSON POST isteği gönderir: (durum kodu, JSON yanıt)"""
+    status, payload, _ = asyncio.run(request(app, path, body))
+    return status, payload
@@ -0,0 +1,45 @@
+import time
+import pytest
+from routers import comprehensive_analysis
+from tests.asgi import app_with, post
+from utils.workers import light_pool
+
+app = app_with(comprehensive_analysis.router)
+
+SECTION_SECONDS = 0.1
+
+def slow_section(mother, child, data) -> dict:
+    time.sleep(SECTION_SECONDS)
+    return {"child": data["child_name"]}
+
+@pytest.fixture
+def slow_sections(monkeypatch):
+    """Bölümleri sabit süreli sahte analizlerle değiştirir; başlangıç anlarını kaydeder"""
+    started = {}
+
+    def section(key):
+        def run(mother, child, data):
+            started[key] = time.perf_counter()
+            return slow_section(mother, child, data)
+        return run
+
+    for name in ("CPU_SECTIONS", "IO_SECTIONS"):
+        sections = getattr(comprehensive_analysis, name)
+        monkeypatch.setattr(comprehensive_analysis, name,
+                            tuple((key, section(key), label, io) for key, _, label, io in sections))
+    return started
+
+@pytest.mark.parametrize("workers", [1, 0])
+def test_io_sections_overlap_cpu_sections(slow_sections, monkeypatch, workers):
+    monkeypatch.setattr(light_pool, "workers", workers)
+    cpu_count = len(comprehensive_analysis.CPU_SECTIONS)
+    status, body = post(app, "/comprehensive-analysis/analyze",
+                        {"mother_name": "Ayşe", "child_name": "Ahmet", "disease_name": "Baş Ağrısı"})
+    assert status == 200, body
+    assert body["disease_analysis"] == {"success": True, "data": {"child": "Ahmet"}, "error": None}
+    # Çeviri bölümü ilk CPU bölümünden önce başlar; toplam süre bölümlerin sıralı toplamından kısadır
+    first_cpu = min(started for key, started in slow_sections.items() if key != "disease")
+    assert slow_sections["disease"] <= first_cpu
+    serial = (cpu_count + 1) * SECTION_SECONDS * 1000
+    assert body["timings"]["total"] < serial - SECTION_SECONDS * 1000 / 2
+    assert all(body["timings"][key] >= SECTION_SECONDS * 1000 for key, *_ in comprehensive_analysis.SECTIONS)
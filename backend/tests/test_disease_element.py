@@ -0,0 +1,49 @@
+import pytest
+from routers import disease_element
+from tests.asgi import app_with, post
+
+app = app_with(disease_element.router)
+
+def request_body(mode: str, **extra) -> dict:
+    return {"name": "Ahmet", "mother_name": "Ayşe", "disease_type": "Baş ağrısı", "target_element": "SU",
+            "recommendation_mode": mode, **extra}
+
+def test_classic_recommends_esmas_with_target_element():
+    status, body = post(app, "/disease-element/calculate", request_body("classic"))
+    assert status == 200, body
+    assert body["total_ebced"] == body["person_name_analysis"]["ebced"] + body["mother_name_analysis"]["ebced"]
+    esmas = body["matching_esmas"]
+    assert 0 < len(esmas) <= 10
+    assert all(esma["element_counts"].get("SU", 0) > 0 for esma in esmas)
+    differences = [esma["ebced_difference"] for esma in esmas]
+    assert differences == sorted(differences)
+
+def test_similarity_recommends_top_k_esmas():
+    status, body = post(app, "/disease-element/calculate", request_body("similarity", top_k=7))
+    assert status == 200, body
+    esmas = body["matching_esmas"]
+    assert len(esmas) == 7
+    assert len({esma["name"] for esma in esmas}) == 7
+
+@pytest.mark.parametrize("target", ["ATEŞ", "HAVA", "TOPRAK", "SU"])
+def test_similarity_applies_target_element(target):
+    body = request_body("similarity", top_k=disease_element.MAX_TOP_K)
+    status, body = post(app, "/disease-element/calculate", {**body, "target_element": target})
+    assert status == 200, body
+    esmas = body["matching_esmas"]
+    assert esmas and all(esma["element_counts"].get(target, 0) > 0 for esma in esmas)
+    # Hedef elementi baskın olan esmalar, elementi sadece içerenlerden önce gelir
+    dominated = [esma["element_counts"][target] == max(esma["element_counts"].values()) for esma in esmas]
+    assert dominated == sorted(dominated, reverse=True)
+
+def test_letters_are_mapped_from_letter_records():
+    status, body = post(app, "/disease-element/calculate", request_body("classic"))
+    assert status == 200, body
+    letters = body["person_name_analysis"]["letters"]
+    assert letters and sum(letter["ebced"] for letter in letters) == body["person_name_analysis"]["ebced"]
+    assert all(letter["arabic"] == letter["letter"] and letter["gender"] in ("E", "D") for letter in letters)
+
+@pytest.mark.parametrize("top_k", [0, disease_element.MAX_TOP_K + 1])
+def test_similarity_rejects_out_of_range_top_k(top_k):
+    status, _ = post(app, "/disease-element/calculate", request_body("similarity", top_k=top_k))
+    assert status == 400
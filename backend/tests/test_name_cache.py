@@ -0,0 +1,49 @@
+import pytest
+from types import MappingProxyType
+from utils import arabic_converter
+from utils.arabic_converter import convert_to_arabic_and_calculate_ebced
+from utils.cache import LRUCache
+from utils.registry import registry
+
+tables = registry.bind("test_name_cache", "names")
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = LRUCache("test", 2)
+    monkeypatch.setattr(arabic_converter, "CONVERSION_CACHE", cache)
+    return cache
+
+def convert(text: str):
+    return convert_to_arabic_and_calculate_ebced(text, tables.names, is_name=True)
+
+def test_case_and_whitespace_variants_share_one_entry(cache):
+    results = [convert(text) for text in ("Ahmet", "AHMET", " ahmet ")]
+    assert results[0] == results[1] == results[2]
+    stats = cache.stats()
+    assert (stats["size"], stats["hits"], stats["misses"], stats["evictions"]) == (1, 2, 1, 0)
+
+def test_turkish_dotless_i_variants_share_one_entry(cache):
+    assert convert("IRMAKX") == convert("ırmakx")
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_least_recently_used_entry_is_evicted(cache):
+    for text in ("Ahmet", "Ayşe", "Ahmet", "Mehmet"):
+        convert(text)
+    # Ayşe en uzun süre kullanılmayan kayıttı
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 3, 1)
+    convert("Ahmet")
+    convert("Ayşe")
+    assert (cache.hits, cache.misses, cache.evictions) == (2, 4, 2)
+
+def test_cached_result_is_not_changed_by_callers(cache):
+    arabic, ebced, result = convert("Ahmet")
+    expected = [dict(letter) for letter in result["letters"]]
+    result["letters"][0]["ebced"] = 999
+    result["letters"].clear()
+    _, _, again = convert("Ahmet")
+    assert again["letters"] == expected and again["total_ebced"] == ebced
+    # Önbellekteki harf kayıtları salt okunurdur
+    (cached,) = cache._data.values()
+    assert all(isinstance(letter, MappingProxyType) for letter in cached[2])
+    with pytest.raises(TypeError):
+        cached[2][0]["ebced"] = 999
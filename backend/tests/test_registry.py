@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import time
+import pandas as pd
+import pytest
+from fastapi import APIRouter
+from tests.asgi import app_with, request
+from utils.registry import DataRegistry, DatasetPinMiddleware
+
+class FakeSource:
+    """Her tablo için tek satırlık DataFrame döndüren kaynak"""
+    kind = 'fake'
+
+    def __init__(self, number: int):
+        self.number = number
+
+    def load(self, table_name: str) -> pd.DataFrame:
+        return pd.DataFrame({'source': [self.number]})
+
+def fake_registry(gate: threading.Event = None) -> DataRegistry:
+    """Kaynak açılışları sayılır; gate verilirse ilk açılış o olayı bekler"""
+    opened = []
+
+    def open_source():
+        number = len(opened) + 1
+        opened.append(number)
+        if gate is not None and number == 1:
+            gate.wait(5)
+        return FakeSource(number)
+
+    return DataRegistry(open_source=open_source, watch_paths=())
+
+def test_reload_swaps_version_and_warms_loaded_tables():
+    data = fake_registry()
+    old = data.current()
+    old.table('names')
+    old.derived('rows', lambda dataset: len(dataset.table('names')))
+    new = data.reload('test')
+    assert data.current() is new and new.version == old.version + 1
+    # Eski sürümde yüklü olanlar değişimden önce yeni sürümde de hazırlanır
+    assert new.is_loaded('names') and not new.is_loaded('esma')
+    assert new.table('names')['source'][0] == 2 and old.table('names')['source'][0] == 1
+    assert [key for key, _ in new.derived_keys()] == ['rows']
+    assert data.report()['reloads'][-1]['version'] == new.version
+
+def test_failed_reload_keeps_current_version():
+    data = fake_registry()
+    old = data.current()
+    data._open_source = lambda: (_ for _ in ()).throw(OSError('okunamadı'))
+    with pytest.raises(OSError):
+        data.reload('test')
+    assert data.current() is old and not data.report()['reloading']
+
+def test_slow_reload_does_not_block_first_access():
+    gate = threading.Event()
+    data = fake_registry(gate)
+    reload = threading.Thread(target=data.reload, args=('test',))
+    reload.start()
+    while not data._reload_lock.locked():
+        time.sleep(0.01)
+    seen = []
+    first = threading.Thread(target=lambda: seen.append(data.current()))
+    first.start()
+    first.join(2)
+    try:
+        # Yeniden yükleme kaynağı açarken ilk erişim kendi sürümünü oluşturabilir
+        assert seen and seen[0].source.number == 2
+        assert data.reload('test') is None
+    finally:
+        gate.set()
+        reload.join(5)
+    assert data.current().source.number == 1 and len({seen[0].version, data.current().version}) == 2
+
+def test_pinned_request_keeps_its_version_during_reload():
+    data = fake_registry()
+    data.current()
+    started, proceed = asyncio.Event(), asyncio.Event()
+    router = APIRouter()
+
+    @router.post("/versions")
+    async def versions():
+        before = data.current().version
+        started.set()
+        await proceed.wait()
+        return {"before": before, "after": data.current().version}
+
+    app = DatasetPinMiddleware(app_with(router), registry=data)
+
+    async def scenario():
+        held = asyncio.ensure_future(request(app, "/versions"))
+        await started.wait()
+        data.reload('test')
+        proceed.set()
+        return await held, await request(app, "/versions")
+
+    (status, pinned, _), (_, fresh, _) = asyncio.run(scenario())
+    assert status == 200
+    assert pinned == {"before": 1, "after": 1}
+    assert fresh == {"before": 2, "after": 2}
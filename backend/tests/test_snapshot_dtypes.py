@@ -0,0 +1,23 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils import dataset
+from utils.corpus import narrow
+
+def test_snapshot_keeps_integer_column_dtypes(tmp_path):
+    frame = pd.DataFrame({
+        'position': np.array([1, 300, 32767], dtype=np.int16),
+        'count': np.array([0, 7, 255], dtype=np.uint8),
+        'ebced': np.array([9, 39035, 2 ** 31 - 1], dtype=np.int32),
+        'wide': np.array([-1, 0, 2 ** 40], dtype=np.int64),
+        'mixed': pd.Series([1, 2, 3], dtype=object),
+    })
+    path = str(tmp_path / 'tables.snap')
+    dataset.write_snapshot({'table': frame}, path, sources={})
+    _, tables = dataset.read_snapshot(path)
+    pd.testing.assert_frame_equal(tables['table'], frame)
+
+def test_narrow_rejects_values_outside_dtype():
+    assert narrow('count', np.array([0, 255]), np.uint8).dtype == np.uint8
+    with pytest.raises(ValueError):
+        narrow('count', np.array([0, 256]), np.uint8)
@@ -0,0 +1,82 @@
+import pytest
+from routers import value_lookup
+from tests.asgi import app_with, post
+from utils.value_index import KINDS
+
+app = app_with(value_lookup.router)
+tables = value_lookup.tables
+
+def reference(low: int, high: int, kinds=KINDS) -> list:
+    """Tüm kayıtları tarayarak (değer, tür sırası, tablo sırası) ile sıralı sonuç"""
+    index = tables.value_index
+    sources = {
+        'name': [(record.ebced, record) for record in tables.names.records],
+        'esma': [(record.ebced, record) for record in tables.esmas.records],
+        'surah': [(record.ebced, record) for record in index.surahs],
+        'verse': [(record.verse_ebced, record) for record in tables.verses.records],
+    }
+    found = []
+    for code, kind in enumerate(KINDS):
+        position = 0
+        for value, record in sources[kind]:
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and float(value).is_integer():
+                if kind in kinds and low <= value <= high:
+                    found.append((int(value), code, position, kind, record))
+                position += 1
+    return [(kind, value, record) for value, _, _, kind, record in sorted(found, key=lambda item: item[:3])]
+
+@pytest.mark.parametrize("value", [66, 92, 786, 1000])
+def test_lookup_matches_full_scan(value):
+    page = tables.value_index.lookup(value, limit=1000)
+    assert page.items == reference(value, value)
+    assert page.total == len(page.items) == sum(page.counts.values())
+
+def test_range_pages_concatenate_to_full_result():
+    index = tables.value_index
+    expected = reference(100, 400, ('name', 'esma', 'surah'))
+    pages = [index.between(100, 400, ['surah', 'name', 'esma'], offset, 25) for offset in range(0, len(expected) + 25, 25)]
+    assert [item for page in pages for item in page.items] == expected
+    assert all(page.total == len(expected) for page in pages)
+    assert set(pages[0].counts) == {'name', 'esma', 'surah'}
+    assert index.count(100, 400, ['name']) == pages[0].counts['name']
+    assert index.between(400, 100).total == 0
+
+def test_surah_value_is_sum_of_verse_values():
+    index = tables.value_index
+    assert len(index.surahs) == len({record.surah_number for record in tables.verses.records})
+    first = index.surahs[0]
+    verses = tables.verses.surah(first.surah_number)
+    assert first.verse_count == len(verses) and first.ebced == sum(int(record.verse_ebced) for record in verses)
+    assert index.lookup(first.ebced, ['surah']).items == reference(first.ebced, first.ebced, ('surah',))
+    assert ('surah', first.ebced, first) in index.lookup(first.ebced).items
+
+def test_unknown_kind_is_rejected():
+    with pytest.raises(ValueError):
+        tables.value_index.lookup(66, ['isim'])
+    status, _ = post(app, "/value-lookup/lookup", {"ebced": 66, "kinds": ["isim"]})
+    assert status == 422
+
+def test_lookup_endpoint_returns_entities():
+    status, body = post(app, "/value-lookup/lookup", {"ebced": 66, "kinds": ["esma", "name"], "limit": 2})
+    assert status == 200, body
+    assert body["total"] == sum(body["counts"].values()) and set(body["counts"]) == {"name", "esma"}
+    assert len(body["items"]) == min(2, body["total"])
+    assert all(item["ebced"] == 66 and item["kind"] in ("name", "esma") for item in body["items"])
+
+@pytest.mark.parametrize("path, body", [
+    ("/value-lookup/range", {"min_ebced": 10, "max_ebced": 5}),
+    ("/value-lookup/lookup", {"ebced": 66, "limit": 0}),
+    ("/value-lookup/lookup", {"ebced": 66, "limit": value_lookup.MAX_PAGE_SIZE + 1}),
+    ("/value-lookup/lookup", {"ebced": 66, "offset": -1}),
+    ("/value-lookup/words", {}),
+])
+def test_invalid_requests_get_400(path, body):
+    status, _ = post(app, path, body)
+    assert status == 400
+
+def test_words_by_name_use_the_name_value():
+    status, by_name = post(app, "/value-lookup/words", {"name": "Ahmet", "limit": 5})
+    assert status == 200, by_name
+    status, by_value = post(app, "/value-lookup/words", {"ebced": by_name["ebced"], "limit": 5})
+    assert status == 200 and by_value["words"] == by_name["words"] and by_value["total"] == by_name["total"]
+    assert all(word["ebced"] == by_name["ebced"] for word in by_name["words"])
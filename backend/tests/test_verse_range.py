@@ -0,0 +1,17 @@
+from routers import verse_range
+from tests.asgi import app_with, post
+
+app = app_with(verse_range.router)
+
+def test_cross_surah_range_reports_both_surah_names():
+    status, body = post(app, "/verse-range/total",
+                         {"surah_number": 1, "start_verse": 6, "end_surah": 2, "end_verse": 3})
+    assert status == 200, body
+    assert (body["start_surah"], body["end_surah"]) == (1, 2)
+    assert body["surah_name"] != body["end_surah_name"]
+    assert body["verse_count"] == 5
+
+def test_single_surah_range_repeats_surah_name():
+    status, body = post(app, "/verse-range/total", {"surah_number": 2, "start_verse": 1, "end_verse": 3})
+    assert status == 200, body
+    assert body["surah_name"] == body["end_surah_name"] != ""
@@ -0,0 +1,134 @@
+import asyncio
+import contextvars
+import threading
+import pytest
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from tests.asgi import app_with, request
+from utils.workers import PoolBusy, WorkerPool, admitted, offload
+
+class Job(BaseModel):
+    action: str = "ok"
+
+def pool_app(pool: WorkerPool, release: threading.Event = None):
+    """Havuzda çalışan tek endpoint'li uygulama; release verilirse işler o olayı bekler"""
+    router = APIRouter()
+
+    @router.post("/job")
+    @offload(pool)
+    def job(body: Job):
+        if release is not None:
+            release.wait(5)
+        if body.action == "missing":
+            raise HTTPException(status_code=404, detail="Bulunamadı")
+        return {"thread": threading.get_ident()}
+
+    return app_with(router)
+
+def test_requests_beyond_queue_limit_get_503():
+    pool = WorkerPool("test", 1, 2)
+    release = threading.Event()
+    app = pool_app(pool, release)
+
+    async def scenario():
+        held = [asyncio.ensure_future(request(app, "/job", {})) for _ in range(2)]
+        while pool.pending < 2:
+            await asyncio.sleep(0.01)
+        busy = await request(app, "/job", {})
+        release.set()
+        return busy, await asyncio.gather(*held)
+
+    try:
+        (status, body, headers), held = asyncio.run(scenario())
+    finally:
+        release.set()
+        pool.shutdown()
+    assert status == 503 and headers["retry-after"] == "1"
+    assert "test havuzunda 2 bekleyen iş" in body["detail"]
+    assert [status for status, *_ in held] == [200, 200]
+    stats = pool.stats()
+    assert (stats["rejected"], stats["completed"], stats["peak_pending"], stats["pending"]) == (1, 2, 2, 0)
+
+def test_admitted_turns_pool_busy_into_503():
+    pool = WorkerPool("test", 1, 1)
+    with pool.admit():
+        with pytest.raises(PoolBusy):
+            with pool.admit():
+                pass
+        with pytest.raises(HTTPException) as error:
+            with admitted(pool):
+                pass
+    assert error.value.status_code == 503
+    assert (pool.rejected, pool.pending) == (2, 0)
+
+def test_handler_http_errors_are_not_pool_failures():
+    pool = WorkerPool("test", 1, 4)
+    app = pool_app(pool)
+
+    async def scenario():
+        return [await request(app, "/job", {"action": action}) for action in ("ok", "missing")]
+
+    try:
+        (ok, *_), (missing, *_) = asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+    assert (ok, missing) == (200, 404)
+    stats = pool.stats()
+    assert (stats["completed"], stats["http_errors"], stats["failed"]) == (1, 1, 0)
+
+def test_worker_exceptions_count_as_failures():
+    pool = WorkerPool("test", 1, 4)
+
+    def broken():
+        raise ValueError("bozuk")
+
+    try:
+        with pytest.raises(ValueError):
+            asyncio.run(pool.call(broken))
+    finally:
+        pool.shutdown()
+    assert (pool.failed, pool.http_errors, pool.completed, pool.active) == (1, 0, 0, 0)
+
+marker = contextvars.ContextVar("marker", default=None)
+
+@pytest.mark.parametrize("workers", [0, 1])
+def test_inline_and_threaded_paths(workers):
+    pool = WorkerPool("test", workers, 4)
+
+    def where() -> tuple:
+        return threading.get_ident(), marker.get()
+
+    async def scenario():
+        marker.set("istek")
+        return await pool.call(where)
+
+    try:
+        thread, seen = asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+    # İşler isteğin context'iyle çalışır; 0 worker event loop'un thread'inde çalıştırır
+    assert seen == "istek"
+    assert (thread == threading.get_ident()) == (workers == 0)
+    stats = pool.stats()
+    assert (stats["completed"], stats["running"], stats["queued"]) == (1, 0, 0)
+    assert stats["run_ms"]["p50"] >= 0
+
+def test_cancelled_wait_is_counted_and_released():
+    pool = WorkerPool("test", 1, 4)
+    release = threading.Event()
+
+    async def scenario():
+        with pool.admit():
+            task = asyncio.ensure_future(pool.call(release.wait, 5))
+            while pool.active < 1:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+        pool.shutdown()
+    assert (pool.cancelled, pool.failed, pool.active, pool.pending) == (1, 0, 0, 0)
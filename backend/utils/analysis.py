@@ -0,0 +1,732 @@
+"""FastAPI'den bağımsız analiz motoru
+
+Anne/çocuk ismi analizleri (yönetici esma, kişisel yönetici esma, yönetici ayet,
+kişiye özel hastalık, büyü, hastalığa yatkınlık, maddi blokaj) burada düz
+fonksiyonlar olarak tanımlıdır; sonuçlar slotlu dataclass'lardır. Router'lar
+ve kapsamlı analiz aynı fonksiyonları çağırır. Pydantic modelleri sadece HTTP
+katmanında (istek doğrulama ve yanıt) kullanılır; sonuçlar to_dict ile yanıt
+sözlüğüne çevrilir.
+
+Dataclass alanları router yanıt modellerindeki alanlarla aynı sıradadır.
+Sonuçlar (ve içlerindeki harf listeleri) alt analizler arasında paylaşılabilir;
+oluşturulduktan sonra değiştirilmezler.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from utils.arabic_converter import convert_to_arabic_and_calculate_ebced, transliterate_turkish
+from utils.esma_profiles import ELEMENTS
+from utils.registry import registry
+from utils.store import is_missing
+
+tables = registry.bind("analysis", "names", "esma", "quran", "verse_profiles")
+
+class AnalysisError(Exception):
+    """Analiz yapılamadığında (veri yok, uygun kayıt yok); HTTP katmanı durum koduna çevirir"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+def to_dict(value):
+    """Sonuç dataclass'larını (iç içe listeler ve sözlüklerle) yanıt sözlüğüne çevirir"""
+    fields = getattr(type(value), '__dataclass_fields__', None)
+    if fields is not None:
+        return {name: to_dict(getattr(value, name)) for name in fields}
+    if isinstance(value, (list, tuple)):
+        return [to_dict(item) for item in value]
+    if isinstance(value, dict):
+        return {key: to_dict(item) for key, item in value.items()}
+    return value
+
+# Ortak tipler
+@dataclass(slots=True)
+class Letter:
+    letter: str
+    ebced: int
+    element: str
+    nurani_zulmani: str
+    gender: str
+
+@dataclass(slots=True)
+class ConvertedName:
+    """Arapçaya çevrilmiş isim ve harf analizi"""
+    name: str
+    arabic: str
+    ebced: int
+    letters: List[Letter]
+
+@dataclass(slots=True)
+class EsmaInfo:
+    ebced: int
+    name: str
+    arabic: str
+    meaning: str
+
+def letters_of(result: dict) -> List[Letter]:
+    return [Letter(**letter) for letter in result['letters']]
+
+def convert_name(name: str) -> ConvertedName:
+    """İsmi Arapçaya çevirir (önce isim tablosunda aranır, yoksa harf harf)"""
+    arabic, ebced, result = convert_to_arabic_and_calculate_ebced(name, tables.names, is_name=True)
+    return ConvertedName(name, arabic, ebced, letters_of(result))
+
+# Yönetici Esma
+@dataclass(slots=True)
+class ManagerEsmaResult:
+    mother_name: str
+    mother_name_arabic: str
+    mother_name_ebced: int
+    mother_name_letters: List[Letter]
+    child_name: str
+    child_name_arabic: str
+    child_name_ebced: int
+    child_name_letters: List[Letter]
+    total_ebced: int
+    selected_esma: str
+    selected_esma_arabic: str
+    selected_esma_ebced: int
+    selected_esma_meaning: str
+    ebced_difference: int
+
+def find_closest_esma(total_ebced: int) -> tuple:
+    """Toplam ebced değerine en yakın esma: (isim, arapça, ebced, anlam, fark)"""
+    # Eksik alanı olmayan esmaların ebced indeksi
+    index = tables.esmas.complete_index
+    if not len(index):
+        raise AnalysisError(404, "Uygun esma bulunamadı")
+
+    # Tam eşleşme yoksa en yakın değer (eşit farkta tablodaki ilk esma)
+    exact = index.exact(total_ebced)
+    row = exact[0] if exact else index.nearest(total_ebced)[0]
+    return (
+        row.esma,
+        row.arabic,
+        int(row.ebced),
+        row.meaning,
+        0 if exact else int(abs(row.ebced - total_ebced))
+    )
+
+def manager_esma(mother: ConvertedName, child: ConvertedName) -> ManagerEsmaResult:
+    """Anne ve çocuk isimlerinin toplam ebcedine en yakın esma"""
+    total_ebced = mother.ebced + child.ebced
+    print(f"Toplam ebced: {total_ebced}")
+
+    print("En yakın esma aranıyor...")
+    esma_name, esma_arabic, esma_ebced, esma_meaning, diff = find_closest_esma(total_ebced)
+    print(f"Bulunan esma: name={esma_name}, arabic={esma_arabic}, ebced={esma_ebced}, diff={diff}")
+
+    return ManagerEsmaResult(
+        mother.name, mother.arabic, mother.ebced, mother.letters,
+        child.name, child.arabic, child.ebced, child.letters,
+        total_ebced, esma_name, esma_arabic, esma_ebced, esma_meaning, diff
+    )
+
+# Kişisel Yönetici Esma
+@dataclass(slots=True)
+class NameSummary:
+    arabic: str
+    letters: List[Letter]
+    total_ebced: int
+
+@dataclass(slots=True)
+class PersonalManagerResult:
+    name_analysis: NameSummary
+    selected_esma: EsmaInfo
+    lower_esma: Optional[EsmaInfo]
+    upper_esma: Optional[EsmaInfo]
+    differences: Dict[str, int]
+
+def esma_info(row) -> EsmaInfo:
+    return EsmaInfo(int(row.ebced), row.esma, row.arabic, row.meaning)
+
+def analyze_name(name: str) -> NameSummary:
+    """İsmi analiz et - önce veritabanında ara, yoksa çeviri yap"""
+    record = tables.names.find(name)
+    if record is not None:
+        arabic, total_ebced = record.arabic, int(record.ebced)
+        print(f"Found {name} in database: {arabic} ({total_ebced})")
+        _, _, result = convert_to_arabic_and_calculate_ebced(name, tables.names)
+    else:
+        arabic, total_ebced, result = convert_to_arabic_and_calculate_ebced(name, tables.names, is_name=True)
+        print(f"Translated {name}: {arabic} ({total_ebced})")
+    return NameSummary(arabic, letters_of(result), total_ebced)
+
+def find_nearest_esma(target_value: int) -> Tuple[Optional[EsmaInfo], Optional[EsmaInfo], EsmaInfo, Dict[str, int]]:
+    """Hedef değere en yakın Esma'yı bul ve farkları hesapla"""
+    index = tables.esmas.index
+
+    # Tam eşleşme ara
+    exact = index.exact(target_value)
+    if exact:
+        return None, None, esma_info(exact[0]), {}
+
+    # En yakın alt ve üst değerleri bul (eşit değerlerde tablodaki ilk esma)
+    lower_group = index.lower(target_value)
+    upper_group = index.upper(target_value)
+    lower_info = esma_info(lower_group[0]) if lower_group else None
+    upper_info = esma_info(upper_group[0]) if upper_group else None
+
+    # Farkları hesapla
+    differences = {}
+    if lower_info:
+        differences[lower_info.name] = target_value - lower_info.ebced
+    if upper_info:
+        differences[upper_info.name] = upper_info.ebced - target_value
+
+    # En yakın olanı seç
+    selected = lower_info if lower_info and (not upper_info or (target_value - lower_info.ebced) <= (upper_info.ebced - target_value)) else upper_info
+
+    if not selected:
+        raise AnalysisError(404, "Uygun esma bulunamadı")
+
+    return lower_info, upper_info, selected, differences
+
+def personal_manager_esma(name: str) -> PersonalManagerResult:
+    """İsmin ebcedine en yakın esma ve alt/üst komşuları"""
+    name_analysis = analyze_name(name)
+    lower_esma, upper_esma, selected_esma, differences = find_nearest_esma(name_analysis.total_ebced)
+    return PersonalManagerResult(name_analysis, selected_esma, lower_esma, upper_esma, differences)
+
+# Yönetici Ayet
+@dataclass(slots=True)
+class VerseMatch:
+    verse_number: str
+    arabic_text: str
+    turkish_meaning: str
+    surah_name: str
+    ebced: int
+    ebced_difference: int
+
+@dataclass(slots=True)
+class ManagerVerseResult:
+    mother_name: str
+    mother_arabic: str
+    mother_ebced: int
+    mother_letters: List[Letter]
+    child_name: str
+    child_arabic: str
+    child_ebced: int
+    child_letters: List[Letter]
+    total_ebced: int
+    total_arabic_letters: int
+    method1_verses: List[VerseMatch]
+    method2_verses: List[VerseMatch]
+
+def _text(value) -> str:
+    return "" if is_missing(value) else str(value)
+
+def find_verse_matches(surah_number: int, verse_number: int, total_ebced: int) -> List[VerseMatch]:
+    """Sure ve ayet numarasındaki ayet(ler) ve toplam ebcedle farkları"""
+    matching_verses = []
+    print(f"Aranacak sure no: {surah_number}, ayet no: {verse_number}")
+    verses = tables.verses.find(surah_number, verse_number)
+    print(f"Bulunan ayet sayısı: {len(verses)}")
+
+    for verse in verses:
+        ebced = 0 if is_missing(verse.verse_ebced) else int(verse.verse_ebced)
+        matching_verses.append(VerseMatch(
+            f"{verse.surah_number}:{verse.verse_number}",
+            _text(verse.arabic_text),
+            _text(verse.turkish_meaning),
+            _text(verse.surah_name),
+            ebced,
+            abs(total_ebced - ebced)
+        ))
+    return matching_verses
+
+def find_verse_by_method1(mother_arabic: str, child_arabic: str, total_ebced: int) -> List[VerseMatch]:
+    """1. Yöntem: toplam harf sayısı sure, toplam ebced ayet numarası"""
+    total_letters = len(mother_arabic) + len(child_arabic)
+    # Ayet numarası 286'nın (en uzun sure olan Bakara suresi) altına inene kadar sadeleştirilir
+    surah_number, verse_number = tables.verse_resolver.resolve(total_letters, total_ebced, verse_rule='repeat')
+    print(f"1. Yöntem: harf sayısı {total_letters}, ebced {total_ebced} -> {surah_number}:{verse_number}")
+    return find_verse_matches(surah_number, verse_number, total_ebced)
+
+def find_verse_by_method2(mother_arabic: str, child_arabic: str, total_ebced: int) -> List[VerseMatch]:
+    """2. Yöntem: anne isminin harf sayısı sure, çocuk isminin harf sayısı ayet numarası"""
+    surah_number, verse_number = len(mother_arabic), len(child_arabic)
+    print(f"2. Yöntem: {surah_number}:{verse_number} (ebced {total_ebced})")
+    return find_verse_matches(surah_number, verse_number, total_ebced)
+
+def manager_verse(mother: ConvertedName, child: ConvertedName) -> ManagerVerseResult:
+    """Anne ve çocuk isimlerinin harf sayıları ve ebcedlerinden iki yöntemle ayet"""
+    total_ebced = mother.ebced + child.ebced
+    total_arabic_letters = len(mother.arabic) + len(child.arabic)
+    print(f"Toplam değerler hesaplandı - Ebced: {total_ebced}, Harf sayısı: {total_arabic_letters}")
+
+    method1_verses = find_verse_by_method1(mother.arabic, child.arabic, total_ebced)
+    method2_verses = find_verse_by_method2(mother.arabic, child.arabic, total_ebced)
+
+    return ManagerVerseResult(
+        mother.name, mother.arabic, mother.ebced, mother.letters,
+        child.name, child.arabic, child.ebced, child.letters,
+        total_ebced, total_arabic_letters, method1_verses, method2_verses
+    )
+
+# Kişiye Özel Hastalık
+WARNING_MESSAGE = "Şifalanmak için esmaları ve ayetleri en az 21 gün, istediğiniz sayıda okuyabilirsiniz."
+SHIFA_ARABIC = "شفاء"  # Şifa kelimesinin Arapçası
+
+@dataclass(slots=True)
+class ElementTally:
+    count: int
+    ebced: int
+
+@dataclass(slots=True)
+class NuraniSummary:
+    total_count: int
+    total_ebced: int
+    elements: Dict[str, ElementTally]
+    dominant_element: str
+
+@dataclass(slots=True)
+class PersonNurani:
+    name: str
+    arabic: str
+    nurani_analysis: NuraniSummary
+    letters: List[Letter]
+
+@dataclass(slots=True)
+class EsmaSuggestion:
+    name: str
+    arabic: str
+    ebced: int
+    meaning: str
+    element_counts: Dict[str, int]
+    selection_reason: str
+
+@dataclass(slots=True)
+class VerseSuggestion:
+    surah_number: int
+    verse_number: int
+    surah_name: str
+    arabic_text: str
+    turkish_meaning: str
+
+@dataclass(slots=True)
+class PersonalDiseaseResult:
+    mother: PersonNurani
+    child: PersonNurani
+    disease: PersonNurani
+    combined_analysis: NuraniSummary
+    recommended_esmas: List[EsmaSuggestion]
+    recommended_verses: List[VerseSuggestion]
+    warning_message: str
+
+translator = None
+
+def get_translator():
+    """googletrans çevirmenini ilk kullanımda oluşturur"""
+    global translator
+    if translator is None:
+        from googletrans import Translator
+        translator = Translator()
+    return translator
+
+def dominant_element(elements: Dict[str, ElementTally]) -> str:
+    """En çok nurani harfi olan element; eşitlikte ebcedi büyük olan"""
+    max_count = 0
+    dominant = 'ATEŞ'  # Varsayılan değer
+    for element, data in elements.items():
+        if data.count > max_count:
+            max_count = data.count
+            dominant = element
+        elif data.count == max_count and data.ebced > elements[dominant].ebced:
+            dominant = element
+    return dominant
+
+def analyze_nurani_letters(letters: List[Letter]) -> NuraniSummary:
+    """Sadece nurani harflerin element sayıları ve ebcedleri"""
+    elements = {element: ElementTally(0, 0) for element in ELEMENTS}
+    total_count = 0
+    total_ebced = 0
+    for letter in letters:
+        if letter.nurani_zulmani == 'N':
+            tally = elements[letter.element]
+            tally.count += 1
+            tally.ebced += letter.ebced
+            total_count += 1
+            total_ebced += letter.ebced
+    return NuraniSummary(total_count, total_ebced, elements, dominant_element(elements))
+
+def combine_nurani(*analyses: NuraniSummary) -> NuraniSummary:
+    """Nurani analizlerinin element bazında toplamı"""
+    elements = {
+        element: ElementTally(sum(analysis.elements[element].count for analysis in analyses),
+                              sum(analysis.elements[element].ebced for analysis in analyses))
+        for element in ELEMENTS
+    }
+    return NuraniSummary(
+        sum(analysis.total_count for analysis in analyses),
+        sum(analysis.total_ebced for analysis in analyses),
+        elements,
+        dominant_element(elements)
+    )
+
+def translate_disease(disease_name: str) -> str:
+    """Hastalık ismini Google Translate ile Arapçaya çevirir; hata durumunda harf harf çeviri
+
+    Çeviri servisine ağ isteği atar (bloke eder); CPU iş havuzunda değil, IO için
+    ayrılmış executor'da çağrılmalıdır.
+    """
+    try:
+        disease_arabic = get_translator().translate(disease_name, src='tr', dest='ar').text
+        print(f"Google Translate sonucu: {disease_arabic}")
+    except Exception as e:
+        print(f"Google Translate hatası: {str(e)}")
+        disease_arabic = transliterate_turkish(disease_name)
+
+    print(f"\nHastalık ismi: {disease_name}")
+    print(f"Hastalık Arapçası: {disease_arabic}")
+    return disease_arabic
+
+def analyze_disease_and_shifa(disease_arabic: str) -> Tuple[str, List[Letter], NuraniSummary]:
+    """Arapça hastalık ismi ve şifa kelimesinin nurani harfleri ve analizi"""
+    print(f"Şifa Arapçası: {SHIFA_ARABIC}")
+
+    # Hastalık ve şifa kelimeleri ayrı ayrı analiz edilir, sadece nurani harfler alınır
+    _, _, disease_result = convert_to_arabic_and_calculate_ebced(disease_arabic, tables.names, is_name=True)
+    _, _, shifa_result = convert_to_arabic_and_calculate_ebced(SHIFA_ARABIC, tables.names, is_name=True)
+    nurani_letters = [
+        Letter(**letter)
+        for letter in disease_result['letters'] + shifa_result['letters']
+        if letter['nurani_zulmani'] == 'N'
+    ]
+
+    nurani_analysis = analyze_nurani_letters(nurani_letters)
+    print("\nElement analizi:")
+    for element, data in nurani_analysis.elements.items():
+        print(f"{element}: {data.count} harf - Ebced: {data.ebced}")
+
+    return f"{disease_arabic} {SHIFA_ARABIC}", nurani_letters, nurani_analysis
+
+def find_matching_esmas(element: str, ebced: int, elements: Dict[str, ElementTally]) -> List[EsmaSuggestion]:
+    """Element ebcedine ve toplam nurani ebcede en yakın, elementi içeren 2 esma"""
+    profiles = tables.esma_profiles
+    total_ebced = sum(elements[e].ebced for e in elements)
+    recommendations = []
+    # Önce element ebced değerine, sonra toplam nurani ebced değerine en yakın esmalar
+    for target, label in ((ebced, "Ebced değeri"), (total_ebced, "Toplam nurani ebced değeri")):
+        for esma in tables.esmas.index.nearest(target):
+            # Esmanın element dağılımı (sadece nurani harfler, önceden hesaplanmış)
+            element_counts = dict(profiles.profile(esma).key_element_counts)
+            if element_counts[element] > 0:  # İstenen elementten en az 1 tane varsa
+                recommendations.append(EsmaSuggestion(
+                    esma.esma,
+                    esma.arabic,
+                    int(esma.ebced),
+                    esma.meaning,
+                    element_counts,
+                    f"{label} ({target})'e yakın ve {element_counts[element]} adet {element} elementi içeriyor"
+                ))
+
+    # Önerileri ebced farkına göre sırala
+    recommendations.sort(key=lambda x: abs(x.ebced - ebced))
+    return recommendations[:2]
+
+def element_counts_of(nurani_analysis: NuraniSummary) -> List[int]:
+    return [nurani_analysis.elements[element].count for element in ELEMENTS]
+
+def verse_suggestion(verse, verse_number: Optional[int] = None) -> VerseSuggestion:
+    return VerseSuggestion(
+        int(verse.surah_number),
+        int(verse.verse_number) if verse_number is None else verse_number,
+        verse.surah_name,
+        _text(verse.arabic_text),
+        _text(verse.turkish_meaning)
+    )
+
+def find_similar_esmas(nurani_analysis: NuraniSummary, k: int) -> List[EsmaSuggestion]:
+    """Nurani element profili (ve nurani ebcedi) en çok benzeyen k esma"""
+    profiles = tables.esma_profiles
+    records = tables.esmas.records
+    recommendations = []
+    for row, distance in tables.esma_similarity.nearest(element_counts_of(nurani_analysis),
+                                                        nurani_analysis.total_ebced, k):
+        esma = records[row]
+        recommendations.append(EsmaSuggestion(
+            esma.esma,
+            esma.arabic,
+            int(esma.ebced),
+            esma.meaning,
+            dict(profiles.profile(esma).element_counts),
+            f"Nurani element profili benzerliği (uzaklık: {distance:.3f})"
+        ))
+    return recommendations
+
+def find_similar_verses(nurani_analysis: NuraniSummary, k: int) -> List[VerseSuggestion]:
+    """Nurani element profili (ve nurani ebcedi) en çok benzeyen k ayet"""
+    records = tables.verses.records
+    return [
+        verse_suggestion(records[row])
+        for row, _ in tables.verse_similarity.nearest(element_counts_of(nurani_analysis),
+                                                      nurani_analysis.total_ebced, k)
+    ]
+
+def find_verse_by_numbers(surah_number: int, verse_number: int) -> Optional[VerseSuggestion]:
+    """Sure ve ayet numarasına göre ayet bulur"""
+    # Sure numarası 114'ü, ayet numarası 286'yı (en uzun sure olan Bakara suresi) aşarsa basamakları bir kez toplanır
+    resolved_surah, resolved_verse = tables.verse_resolver.resolve(surah_number, verse_number, 'once', 'once')
+    print(f"Ayet hesaplama: Sure {surah_number}, Ayet {verse_number} -> Sure {resolved_surah}, Ayet {resolved_verse}")
+
+    verses = tables.verses.surah(resolved_surah)
+    if not verses:
+        print(f"Sure bulunamadı: {resolved_surah}")
+        return None
+
+    # Kısa surelerde (7 ayet ve altı) tüm sure önerilir
+    if len(verses) <= 7:
+        print("Kısa sure olduğu için tamamı öneriliyor")
+        verse = verses[0]
+        return VerseSuggestion(
+            int(verse.surah_number),
+            1,  # İlk ayetten başla
+            verse.surah_name,
+            "\n".join(v.arabic_text for v in verses if not is_missing(v.arabic_text)),
+            "\n".join(v.turkish_meaning for v in verses if not is_missing(v.turkish_meaning))
+        )
+
+    # Belirtilen ayet yoksa en yakın ayet (eşit uzaklıkta tablodaki ilk ayet)
+    verse = tables.verses.get(resolved_surah, resolved_verse)
+    if verse is None:
+        verse = tables.verses.nearest(resolved_surah, resolved_verse)
+        print(f"En yakın ayet seçildi: {verse.verse_number}")
+    return verse_suggestion(verse)
+
+def find_recommended_verses(nurani_analysis: NuraniSummary) -> List[VerseSuggestion]:
+    """Baskın elemente ve nurani toplamlara göre dört yöntemle ayet önerileri"""
+    dominant = nurani_analysis.dominant_element
+    element_data = nurani_analysis.elements[dominant]
+    print(f"\nAyet önerileri: baskın element {dominant} ({element_data.count} harf, {element_data.ebced} ebced), "
+          f"nurani toplam {nurani_analysis.total_count} harf, {nurani_analysis.total_ebced} ebced")
+
+    digit_sum = tables.verse_resolver.digit_sum
+    simplified_ebced = digit_sum(element_data.ebced)
+    simplified_nurani_ebced = digit_sum(nurani_analysis.total_ebced)
+    candidates = (
+        # Element-1: element adedi -> sure, element ebcedi -> ayet
+        (element_data.count, element_data.ebced),
+        # Element-2: sadeleştirilmiş element ebcedi -> sure, element adedi -> ayet
+        (simplified_ebced, element_data.count),
+        # Nurani-1: nurani harf sayısı -> sure, sadeleştirilmiş nurani ebcedi -> ayet
+        (nurani_analysis.total_count, simplified_nurani_ebced),
+        # Nurani-2: sadeleştirilmiş nurani ebcedi -> sure, nurani harf sayısı -> ayet
+        (simplified_nurani_ebced, nurani_analysis.total_count),
+    )
+    verses = [verse for verse in (find_verse_by_numbers(*numbers) for numbers in candidates) if verse]
+    print(f"Bulunan ayet sayısı: {len(verses)}")
+    return verses
+
+def personal_disease(mother: ConvertedName, child: ConvertedName, disease_name: str, disease_arabic: str,
+                     recommendation_mode: str = "classic", top_k: int = 5) -> PersonalDiseaseResult:
+    """Anne, çocuk ve hastalık/şifa kelimelerinin nurani harflerine göre esma ve ayet önerileri
+
+    disease_arabic: translate_disease ile çevrilmiş hastalık ismi (çeviri CPU işinden ayrı yapılır)
+    """
+    mother_nurani = analyze_nurani_letters(mother.letters)
+    child_nurani = analyze_nurani_letters(child.letters)
+    disease_arabic, disease_letters, disease_nurani = analyze_disease_and_shifa(disease_arabic)
+
+    # Birleşik analiz (sadece nurani harfler)
+    combined = combine_nurani(mother_nurani, child_nurani, disease_nurani)
+
+    if recommendation_mode == "similarity":
+        recommended_esmas = find_similar_esmas(combined, top_k)
+        recommended_verses = find_similar_verses(combined, top_k)
+    else:
+        recommended_esmas = find_matching_esmas(
+            combined.dominant_element,
+            combined.elements[combined.dominant_element].ebced,
+            combined.elements
+        )
+        recommended_verses = find_recommended_verses(combined)
+
+    return PersonalDiseaseResult(
+        PersonNurani(mother.name, mother.arabic, mother_nurani, mother.letters),
+        PersonNurani(child.name, child.arabic, child_nurani, child.letters),
+        PersonNurani(disease_name, disease_arabic, disease_nurani, disease_letters),
+        combined,
+        recommended_esmas,
+        recommended_verses,
+        WARNING_MESSAGE
+    )
+
+# Büyü Analizi
+ISSUE_MAP = {
+    1: ("Fiziksel", "Kişinin rahatsızlıkları fizikseldir. Fiziksel sağlığına dikkat etmeli. (Bu sonuçlar mutlak ve nihai sonuçlar değildir. Yalnızca ihtimalleri verir. Burada çıkan sonuç ne olursa olsun kişilerin kendilerini koruma altına aldıktan sonra Allah’ın izniyle bir sıkıntı yaşamayacağıdır.)"),
+    2: ("Nazar", "Kişinin rahatsızlarının nazardan kaynaklanması muhtemeldir. (İnsanın nazar, büyü, sihir, musallat gibi durumlardan etkilenmesinin temel sebebi günahlarıdır. Günahlarımız bizlerin aura dediğimiz alanda yırtıklar oluşturur ve içeriye negatif enerjilerin girmesine sebep olur. Dolayısıyla bu giren negatif enerjiler de bizleri hasta eder. Günlük olarak tevbe namazı kılmak, tevbe duası yapmak ve tevbe zikri çekmekle beraber yapılan korunma duaları, mümince bir yaşam ve salih ameller ile kişiler, Allah’ın izniyle bu sıkıntılardan kurtulurlar.)"),
+    3: ("Sihir", "Kişinin sihirden büyüden etkilenme potansiyeli mevcuttur. (İnsanın nazar, büyü, sihir, musallat gibi durumlardan etkilenmesinin temel sebebi günahlarıdır. Günahlarımız bizlerin aura dediğimiz alanda yırtıklar oluşturur ve içeriye negatif enerjilerin girmesine sebep olur. Dolayısıyla bu giren negatif enerjiler de bizleri hasta eder. Günlük olarak tevbe namazı kılmak, tevbe duası yapmak ve tevbe zikri çekmekle beraber yapılan korunma duaları, mümince bir yaşam ve salih ameller ile kişiler, Allah’ın izniyle bu sıkıntılardan kurtulurlar.)"),
+    4: ("Düşük Enerji", "Kişinin rahatsızlıklarının düşük enerjili varlıkların alanına ve iradelerine müdahaleden kaynaklanma potansiyeli vardır. (İnsanın nazar, büyü, sihir, musallat gibi durumlardan etkilenmesinin temel sebebi günahlarıdır. Günahlarımız bizlerin aura dediğimiz alanda yırtıklar oluşturur ve içeriye negatif enerjilerin girmesine sebep olur. Dolayısıyla bu giren negatif enerjiler de bizleri hasta eder. Günlük olarak tevbe namazı kılmak, tevbe duasıyapmak ve tevbe zikri çekmekle beraber yapılan korunma duaları, mümince bir yaşam ve salih ameller ile kişiler, Allah’ın izniyle bu sıkıntılardan kurtulurlar.) Banyo ve tuvalette dikkat edilecek hususlardan bazıları; Banyoda çıplak ve uzun süre kalmamak. Yıkanılan yere bevl etmemek. Gusülde çok dikkatli davranmak. Tuvalette konuşmamak. Tuvalet ve banyoda kısa süreli kalmak. Taharete ihtimam göstermektir. Mutfakta dikkat edilmesi gereken hususlardan bazıları; Lavaboya kaynar su dökmemek. Su dökerken soğuk suyu da açmak. Su dökerken destur demek. Lavabo içerisine yemek artıkları dökmemek. Yemek yenilen alanı yemekten sonra mutlaka süpürmek. Tavuk kemiklerini diğer çöplerle karıştırmamak. Mutfakta çöp ve bulaşık bırakmamak)"),
+    5: ("Yel veya Romatizma", "Kişinin rahatsızlıkları yel girmesi veya romatizma kaynaklı olma potansiyeli vardır. (Bu sonuçlar mutlak ve nihai sonuçlar değildir. Yalnızca ihtimalleri verir. Burada çıkan sonuç ne olursa olsun kişilerin kendilerini koruma altına aldıktan sonra Allah’ın izniyle bir sıkıntı yaşamayacağıdır.)"),
+    0: ("Yel veya Romatizma", "Kişinin rahatsızlıkları yel girmesi veya romatizma kaynaklı olma potansiyeli vardır. (Bu sonuçlar mutlak ve nihai sonuçlar değildir. Yalnızca ihtimalleri verir. Burada çıkan sonuç ne olursa olsun kişilerin kendilerini koruma altına aldıktan sonra Allah’ın izniyle bir sıkıntı yaşamayacağıdır.)")
+}
+
+@dataclass(slots=True)
+class MagicResult:
+    mother_name: str
+    mother_arabic: str
+    mother_ebced: int
+    mother_letters: List[Letter]
+    child_name: str
+    child_arabic: str
+    child_ebced: int
+    child_letters: List[Letter]
+    total_ebced: int
+    remainder: int
+    issue_type: str
+    issue_description: str
+
+def magic_analysis(mother: ConvertedName, child: ConvertedName) -> MagicResult:
+    """Toplam ebcedin 5'e bölümünden kalana göre manevi sıkıntı türü"""
+    total_ebced = mother.ebced + child.ebced
+    remainder = total_ebced % 5
+    issue_type, issue_description = ISSUE_MAP[remainder]
+    return MagicResult(
+        mother.name, mother.arabic, mother.ebced, mother.letters,
+        child.name, child.arabic, child.ebced, child.letters,
+        total_ebced, remainder, issue_type, issue_description
+    )
+
+# Hastalığa Yatkınlık
+DISEASE_MAP = {
+    1: ("Baş bölgesi", "Baş bölgesi ile ilgili hastalıklara yatkınlık mevcut (Bu sonuçlar mutlak ve nihai sonuçlar değildir. Yalnızca ihtimalleri verir. O nedenle sonuçlara bakarak endişeye kapılmamalısınız.)"),
+    2: ("Boğaz bölgesi", "Boğaz bölgesi ile ilgili hastalıklara yatkınlık mevcut (Bu sonuçlar mutlak ve nihai sonuçlar değildir. Yalnızca ihtimalleri verir. O nedenle sonuçlara bakarak endişeye kapılmamalısınız.)"),
+    3: ("Göğüs bölgesi", " Göğüs bölgesi ile ilgili hastalıklara yatkınlık mevcut (Bu sonuçlar mutlak ve nihai sonuçlar değildir. Yalnızca ihtimalleri verir. O nedenle sonuçlara bakarak endişeye kapılmamalısınız.)"),
+    4: ("Üst Karın bölgesi", "Üst karın bölgesi ile ilgili hastalıklara yatkınlık mevcut (Bu sonuçlar mutlak ve nihai sonuçlar değildir. Yalnızca ihtimalleri verir. O nedenle sonuçlara bakarak endişeye kapılmamalısınız.)"),
+    5: ("Alt Karın bölgesi", "Alt karın bölgesi ile ilgili hastalıklara yatkınlık mevcut (Bu sonuçlar mutlak ve nihai sonuçlar değildir. Yalnızca ihtimalleri verir. O nedenle sonuçlara bakarak endişeye kapılmamalısınız.)"),
+    6: ("Bacaklar", "Bacaklar ile ilgili hastalıklara yatkınlık mevcut (Bu sonuçlar mutlak ve nihai sonuçlar değildir. Yalnızca ihtimalleri verir. O nedenle sonuçlara bakarak endişeye kapılmamalısınız.)"),
+    7: ("Ayaklar", "Ayaklar ile ilgili hastalıklara yatkınlık mevcut (Bu sonuçlar mutlak ve nihai sonuçlar değildir. Yalnızca ihtimalleri verir. O nedenle sonuçlara bakarak endişeye kapılmamalısınız.)"),
+    0: ("Ayaklar", "Ayaklar ile ilgili hastalıklara yatkınlık mevcut (Bu sonuçlar mutlak ve nihai sonuçlar değildir. Yalnızca ihtimalleri verir. O nedenle sonuçlara bakarak endişeye kapılmamalısınız.)")
+}
+
+@dataclass(slots=True)
+class PersonProfile:
+    name: str
+    arabic: str
+    ebced: int
+    letters: List[Letter]
+    element_counts: Dict[str, int]
+    nurani_ratio: float
+    gender_ratio: float
+
+@dataclass(slots=True)
+class DiseaseProneResult:
+    mother: PersonProfile
+    child: PersonProfile
+    total_ebced: int
+    remainder: int
+    disease_type: str
+    disease_description: str
+
+def person_profile(person: ConvertedName) -> PersonProfile:
+    """Element sayıları, nurani ve eril harf oranları"""
+    element_counts = {element: 0 for element in ELEMENTS}
+    nurani_count = 0
+    eril_count = 0
+    for letter in person.letters:
+        element_counts[letter.element] += 1
+        if letter.nurani_zulmani == 'N':
+            nurani_count += 1
+        if letter.gender == 'E':
+            eril_count += 1
+    total_count = len(person.letters)
+    return PersonProfile(
+        person.name, person.arabic, person.ebced, person.letters, element_counts,
+        nurani_count / total_count if total_count > 0 else 0.0,
+        eril_count / total_count if total_count > 0 else 0.0
+    )
+
+def disease_prone(mother: ConvertedName, child: ConvertedName) -> DiseaseProneResult:
+    """Toplam ebcedin 7'ye bölümünden kalana göre yatkın olunan bölge"""
+    total_ebced = mother.ebced + child.ebced
+    remainder = total_ebced % 7
+    disease_type, disease_description = DISEASE_MAP[remainder]
+    return DiseaseProneResult(person_profile(mother), person_profile(child),
+                              total_ebced, remainder, disease_type, disease_description)
+
+# Maddi Blokaj/Bolluk Bereket Rızık
+def word_letters(chars: str) -> List[Letter]:
+    """Kelimenin harfleri (harekeler atlanır)"""
+    letters = []
+    for char in chars:
+        _, _, result = convert_to_arabic_and_calculate_ebced(char)
+        if result['letters']:
+            letters.append(Letter(**result['letters'][0]))
+    return letters
+
+BLESSING_WORD = "وَفْرَة"  # Bolluk Bereket
+BLESSING_EBCED = 291
+PROVISION_WORD = "رِزْق"  # Rızık
+PROVISION_EBCED = 307
+HEALING_WORD = "شِفَا"  # Şifa
+HEALING_EBCED = 382
+HEALING_LETTER_COUNT = 4  # Son harf tekrar edilerek 4 harf olarak sayılır
+
+# Sabit kelimelerin harfleri isimlere bağlı değildir; bir kez hesaplanır
+BLESSING_LETTERS = word_letters(BLESSING_WORD)
+PROVISION_LETTERS = word_letters(PROVISION_WORD)
+HEALING_LETTERS = word_letters("شفاا")
+
+@dataclass(slots=True)
+class FinancialBlessingResult:
+    mother_name: str
+    mother_arabic: str
+    mother_letters: List[Letter]
+    mother_letter_count: int
+    mother_ebced: int
+    child_name: str
+    child_arabic: str
+    child_letters: List[Letter]
+    child_letter_count: int
+    child_ebced: int
+    blessing_word: str
+    blessing_letters: List[Letter]
+    blessing_letter_count: int
+    blessing_ebced: int
+    provision_word: str
+    provision_letters: List[Letter]
+    provision_letter_count: int
+    provision_ebced: int
+    healing_word: str
+    healing_letters: List[Letter]
+    healing_letter_count: int
+    healing_ebced: int
+    total_letter_count: int
+    total_ebced: int
+    first_verse: dict
+    second_verse: dict
+
+def verse_summary(surah_number: int, verse_number: int) -> dict:
+    verse = tables.verses.get(surah_number, verse_number)
+    if verse is None:
+        raise ValueError(f"Ayet bulunamadı: {surah_number}:{verse_number}")
+    return {
+        "sure": surah_number,
+        "ayet": verse_number,
+        "sure_name": verse.surah_name,
+        "arabic_text": verse.arabic_text,
+        "turkish_meaning": verse.turkish_meaning
+    }
+
+def financial_blessing(mother: ConvertedName, child: ConvertedName) -> FinancialBlessingResult:
+    """İsimler ve bolluk/rızık/şifa kelimelerinin harf sayısı ve ebcedinden iki ayet"""
+    total_letter_count = (len(mother.letters) + len(child.letters) + len(BLESSING_LETTERS)
+                          + len(PROVISION_LETTERS) + HEALING_LETTER_COUNT)
+    total_ebced = mother.ebced + child.ebced + BLESSING_EBCED + PROVISION_EBCED + HEALING_EBCED
+
+    # 1. ayet: sure = toplam harf sayısı, ayet = toplam ebced (286'yı aşarsa tek haneye sadeleştirilir)
+    first_verse = tables.verse_resolver.resolve(total_letter_count, total_ebced, verse_rule='root')
+    # 2. ayet: sure = toplam ebced (114'ü aşarsa tek haneye sadeleştirilir), ayet = toplam harf sayısı
+    second_verse = tables.verse_resolver.resolve(total_ebced, total_letter_count, surah_rule='root')
+    first_summary = verse_summary(*first_verse)
+    second_summary = verse_summary(*second_verse)
+
+    return FinancialBlessingResult(
+        mother.name, mother.arabic, mother.letters, len(mother.letters), mother.ebced,
+        child.name, child.arabic, child.letters, len(child.letters), child.ebced,
+        BLESSING_WORD, BLESSING_LETTERS, len(BLESSING_LETTERS), BLESSING_EBCED,
+        PROVISION_WORD, PROVISION_LETTERS, len(PROVISION_LETTERS), PROVISION_EBCED,
+        HEALING_WORD, HEALING_LETTERS, HEALING_LETTER_COUNT, HEALING_EBCED,
+        total_letter_count, total_ebced, first_summary, second_summary
+    )
@@ -1,7 +1,13 @@
-from typing import Dict, Tuple, NamedTuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple, NamedTuple
 import json
 import os
+from types import MappingProxyType
+import numpy as np
 from pyarabic import araby
+from utils.cache import LRUCache, OnceCache
+from utils.store import turkish_casefold
 
 class LetterProperties(NamedTuple):
     arabic: str
@@ -55,33 +61,173 @@ def load_letter_properties():
 # Harf özelliklerini JSON'dan yükle
 LETTER_PROPERTIES = load_letter_properties()
 
-def find_name_in_database(name: str, names_df) -> tuple[str, int] | None:
+# Türkçe harflerin Arapça karşılıkları (isim veritabanında yoksa harf harf çeviri)
+TURKISH_TO_ARABIC = {
+    'a': 'ا',
+    'b': 'ب',
+    'c': 'ج',
+    'ç': 'چ',
+    'd': 'د',
+    'e': 'ه',
+    'f': 'ف',
+    'g': 'گ',
+    'ğ': 'غ',
+    'h': 'ح',
+    'ı': 'ى',
+    'i': 'ي',
+    'j': 'ژ',
+    'k': 'ك',
+    'l': 'ل',
+    'm': 'م',
+    'n': 'ن',
+    'o': 'و',
+    'ö': 'و',
+    'p': 'پ',
+    'r': 'ر',
+    's': 'س',
+    'ş': 'ش',
+    't': 'ت',
+    'u': 'و',
+    'ü': 'و',
+    'v': 'و',
+    'y': 'ي',
+    'z': 'ز',
+}
+
+def resolve_letter(char: str) -> Optional[LetterProperties]:
+    """Karakterin harf özelliklerini döndürür; arabic alanı sonuçta görünecek harftir
+
+    Karakter doğrudan tabloda yoksa normalize edilmiş hali denenir (ة -> ه).
+    """
+    props = LETTER_PROPERTIES.get(char)
+    if props is not None:
+        return props._replace(arabic=char)
+    normalized_char = normalize_arabic_char(char)
+    props = LETTER_PROPERTIES.get(normalized_char)
+    if props is not None:
+        return props._replace(arabic=normalized_char)
+    return None
+
+def build_letter_table() -> List[Optional[LetterProperties]]:
+    """Unicode kod noktası -> harf özellikleri dizisi; normalizasyon tablo oluşturulurken uygulanır"""
+    # Metinler karakter karakter işlendiği için sadece tek karakterlik harfler dikkate
+    # alınır; tablo en büyük harf kod noktasına (sunum biçimleri, U+FExx) kadar uzanır
+    size = max(ord(char) for char in LETTER_PROPERTIES if len(char) == 1) + 1
+    table: List[Optional[LetterProperties]] = [None] * size
+    for char, props in LETTER_PROPERTIES.items():
+        if len(char) == 1:
+            table[ord(char)] = props._replace(arabic=char)
+    # Normalizasyon tüm kod noktalarına tek seferde uygulanır; sadece normalize edilince
+    # değişen ve doğrudan tabloda olmayan karakterler normalize hallerine bağlanır
+    codepoints = np.arange(size, dtype='<u4')
+    chars = codepoints.tobytes().decode('utf-32-le', 'surrogatepass')
+    normalized = normalize_arabic_char(chars)
+    if len(normalized) != size:
+        return [resolve_letter(char) for char in chars]
+    changed = np.flatnonzero(
+        codepoints != np.frombuffer(normalized.encode('utf-32-le', 'surrogatepass'), dtype='<u4')
+    )
+    for codepoint in changed.tolist():
+        if table[codepoint] is None:
+            table[codepoint] = resolve_letter(chars[codepoint])
+    return table
+
+def letter_record(props: LetterProperties) -> dict:
+    """API yanıtlarındaki harf kaydı"""
+    return {
+        'letter': props.arabic,
+        'ebced': props.ebced,
+        'element': props.element,
+        'nurani_zulmani': 'N' if props.is_nurani else 'Z',
+        'gender': 'E' if props.is_eril else 'D'
+    }
+
+LETTER_TABLE = build_letter_table()
+# Her kod noktasının hazır harf kaydı; istek sırasında sadece kopyalanır
+LETTER_RECORDS = [None if props is None else letter_record(props) for props in LETTER_TABLE]
+
+def letter_at(char: str) -> Optional[LetterProperties]:
+    """Karakterin harf özellikleri (tablonun dışındaki karakterler için yavaş yol)"""
+    codepoint = ord(char)
+    if codepoint < len(LETTER_TABLE):
+        return LETTER_TABLE[codepoint]
+    return resolve_letter(char)
+
+class _NameTransliteration(dict):
+    """str.translate tablosu: Türkçe harfi Arapça karşılığına çevirir, harf olmayanları siler
+
+    Tablo sonucu eski harf harf döngüyle aynıdır: karşılığı (veya normalize edilmiş
+    hali) harf tablosunda olmayan karakterler çıktıya eklenmez. Tabloda olmayan kod
+    noktaları ilk görüldüklerinde çözülüp saklanır.
+    """
+
+    def __missing__(self, codepoint: int):
+        char = chr(codepoint)
+        props = letter_at(TURKISH_TO_ARABIC.get(char, char))
+        value = props.arabic if props is not None else None
+        self[codepoint] = value
+        return value
+
+def build_name_transliteration() -> _NameTransliteration:
+    # Türkçe harfler, ASCII ve Arapça harfler önceden çözülür; diğerleri ilk görüldüğünde
+    table = _NameTransliteration()
+    for char in TURKISH_TO_ARABIC:
+        table[ord(char)]
+    for codepoint in range(128):
+        table[codepoint]
+    for props in LETTER_TABLE:
+        if props is not None:
+            table[ord(props.arabic)]
+    return table
+
+NAME_TRANSLITERATION = build_name_transliteration()
+
+# Sadece Türkçe harfleri çeviren, diğer karakterleri olduğu gibi bırakan tablo
+TURKISH_TRANSLITERATION = str.maketrans(TURKISH_TO_ARABIC)
+
+def transliterate_turkish(text: str) -> str:
+    """Türkçe harfleri Arapça karakterlere çevirir (diğer karakterler olduğu gibi kalır)"""
+    return text.lower().translate(TURKISH_TRANSLITERATION)
+
+def analyze_letters(arabic: str) -> Tuple[int, list]:
+    """Arapça metnin toplam ebced değerini ve harf listesini tek geçişte hesaplar"""
+    records = LETTER_RECORDS
+    size = len(records)
+    total_ebced = 0
+    letters = []
+    for char in arabic:
+        codepoint = ord(char)
+        if codepoint < size:
+            record = records[codepoint]
+            if record is None:
+                continue
+            record = record.copy()
+        else:
+            props = resolve_letter(char)
+            if props is None:
+                continue
+            record = letter_record(props)
+        total_ebced += record['ebced']
+        letters.append(record)
+    return total_ebced, letters
+
+def find_name_in_database(name: str, names) -> tuple[str, int] | None:
     """İsmi veritabanında ara ve Arapça karşılığını ve ebced değerini döndür"""
-    if names_df is None:
+    if names is None:
         return None
     
-    name = name.lower().strip()
-    result = names_df[names_df['name'].str.lower() == name]
-    if not result.empty:
-        arabic = result.iloc[0]['arabic']
-        ebced = result.iloc[0]['ebced']
-        return arabic, int(ebced)
+    record = names.find(name)
+    if record is not None:
+        return record.arabic, int(record.ebced)
     return None
 
 def process_arabic_text(arabic: str) -> list[dict]:
     """Arapça metni işler ve her harfin özelliklerini döndürür"""
     letters = []
     for char in arabic:
-        # Önce doğrudan eşleşme ara
-        if char in LETTER_PROPERTIES:
-            props = LETTER_PROPERTIES[char]
-        else:
-            # Eşleşme yoksa normalize edilmiş hali dene
-            normalized_char = normalize_arabic_char(char)
-            if normalized_char in LETTER_PROPERTIES:
-                props = LETTER_PROPERTIES[normalized_char]
-            else:
-                continue
+        props = letter_at(char)
+        if props is None:
+            continue
         
         letters.append({
             'letter': char,
@@ -93,80 +239,85 @@ def process_arabic_text(arabic: str) -> list[dict]:
     
     return letters
 
-def convert_to_arabic_and_calculate_ebced(text: str, names_df=None, is_name=False) -> Tuple[str, int, Dict]:
+# Aynı isimler farklı endpoint'lerde tekrar tekrar hesaplanmasın diye çeviri sonuçları
+# (Türkçe küçük harfli metin, is_name, veri seti sürümü) anahtarıyla saklanır
+CONVERSION_CACHE = LRUCache('name_conversion', int(os.getenv('NAME_CACHE_SIZE', '4096')))
+
+# Bir istek kapsamındaki çeviriler (shared_conversions); alt analizler eşzamanlı çalışsa da
+# aynı isim önbellek boyutundan bağımsız olarak bir kez çevrilir
+_shared_conversions: ContextVar[Optional[OnceCache]] = ContextVar('shared_conversions', default=None)
+
+@contextmanager
+def shared_conversions() -> Iterator[OnceCache]:
+    """Blok içindeki (ve blokta başlatılan thread/task'lerdeki) çevirileri paylaştırır"""
+    scope = OnceCache()
+    token = _shared_conversions.set(scope)
+    try:
+        yield scope
+    finally:
+        _shared_conversions.reset(token)
+
+def convert_to_arabic_and_calculate_ebced(text: str, names=None, is_name=False) -> Tuple[str, int, Dict]:
     """
     Metni Arapça'ya çevirir ve ebced değerini hesaplar
+    names isim deposudur (utils.store.NameStore)
     is_name parametresi True ise isim çevirisi için harf harf çeviri yapar
+
+    Sonuçlar önbellekten gelir; her çağrı kendi harf listesini ve sözlüklerini alır.
     """
+    if names is None:
+        key = (text, bool(is_name), None)
+    elif names.version is not None:
+        # İsim deposu varsa sonuç boşlukları kırpılmış, Türkçe küçük harfe çevrilmiş metne
+        # bağlıdır (NameStore ile aynı normalleştirme); Ahmet, ahmet ve AHMET tek kayıttır
+        text = turkish_casefold(text.strip())
+        key = (text, bool(is_name), names.version)
+    else:
+        # Sürümü olmayan depolar (benchmark, test) önbelleğe alınmaz
+        return _convert_to_arabic_and_calculate_ebced(text, names, is_name)
+    def compute():
+        return CONVERSION_CACHE.get_or_compute(
+            key, lambda: _freeze(*_convert_to_arabic_and_calculate_ebced(text, names, is_name))
+        )
+    scope = _shared_conversions.get()
+    arabic, total_ebced, letters = compute() if scope is None else scope.get_or_compute(key, compute)
+    result = {
+        'letters': [letter.copy() for letter in letters],
+        'total_ebced': total_ebced
+    }
+    return arabic, total_ebced, result
+
+def _freeze(arabic: str, total_ebced: int, result: Dict) -> tuple:
+    """Önbellekte saklanacak değiştirilemez sonuç"""
+    return arabic, total_ebced, tuple(MappingProxyType(letter) for letter in result['letters'])
+
+def _convert_to_arabic_and_calculate_ebced(text: str, names=None, is_name=False) -> Tuple[str, int, Dict]:
     try:
         # İsim çevirisi için özel işlem
-        if is_name and names_df is not None:
+        if is_name and names is not None:
             # Önce veritabanında tam eşleşme ara
-            text = text.strip().lower()
-            name_match = names_df[names_df['name'].str.lower() == text]
+            name_match = names.find(text)
+            text = turkish_casefold(text.strip())
             
-            if not name_match.empty:
+            if name_match is not None:
                 # Veritabanında bulundu
-                arabic = name_match.iloc[0]['arabic']
+                arabic = name_match.arabic
                 print(f"İsim veritabanında bulundu: {text} -> {arabic}")
             else:
                 # Veritabanında bulunamadı, harf harf çevir
                 print(f"İsim veritabanında bulunamadı: {text}, harf harf çevriliyor...")
-                char_map = {
-                    'a': 'ا',
-                    'b': 'ب',
-                    'c': 'ج',
-                    'ç': 'چ',
-                    'd': 'د',
-                    'e': 'ه',
-                    'f': 'ف',
-                    'g': 'گ',
-                    'ğ': 'غ',
-                    'h': 'ح',
-                    'ı': 'ى',
-                    'i': 'ي',
-                    'j': 'ژ',
-                    'k': 'ك',
-                    'l': 'ل',
-                    'm': 'م',
-                    'n': 'ن',
-                    'o': 'و',
-                    'ö': 'و',
-                    'p': 'پ',
-                    'r': 'ر',
-                    's': 'س',
-                    'ş': 'ش',
-                    't': 'ت',
-                    'u': 'و',
-                    'ü': 'و',
-                    'v': 'و',
-                    'y': 'ي',
-                    'z': 'ز',
-                }
-                
-                # Harf harf çeviri yap
-                arabic = ''
-                for char in text.lower():
-                    arabic_char = char_map.get(char, char)
-                    # Eğer harfin karşılığı LETTER_PROPERTIES'de varsa ekle
-                    if arabic_char in LETTER_PROPERTIES:
-                        arabic += arabic_char
-                    else:
-                        # Normalize edilmiş halini dene
-                        normalized_char = normalize_arabic_char(arabic_char)
-                        if normalized_char in LETTER_PROPERTIES:
-                            arabic += normalized_char
+                arabic = text.translate(NAME_TRANSLITERATION)
                 
                 print(f"Harf harf çeviri sonucu: {text} -> {arabic}")
         else:
             # Normal çeviri işlemi
-            if names_df is not None:
+            if names is not None:
                 # Veritabanında ara
-                text = text.strip().lower()
-                name_match = names_df[names_df['name'].str.lower() == text]
+                name_match = names.find(text)
+                text = turkish_casefold(text.strip())
                 
-                if not name_match.empty:
-                    arabic = name_match.iloc[0]['arabic']
+                if name_match is not None:
+                    arabic = name_match.arabic
                     print(f"Veritabanında bulundu: {text} -> {arabic}")
                 else:
                     # Veritabanında yoksa normal çeviri
@@ -175,35 +326,7 @@ def convert_to_arabic_and_calculate_ebced(text: str, names_df=None, is_name=Fals
                 arabic = text
         
         # Ebced hesaplama ve harf analizi
-        total_ebced = 0
-        letters = []
-        
-        for char in arabic:
-            if char in LETTER_PROPERTIES:
-                props = LETTER_PROPERTIES[char]
-                total_ebced += props.ebced
-                
-                letters.append({
-                    'letter': char,
-                    'ebced': props.ebced,
-                    'element': props.element,
-                    'nurani_zulmani': 'N' if props.is_nurani else 'Z',
-                    'gender': 'E' if props.is_eril else 'D'
-                })
-            else:
-                # Normalize edilmiş hali dene
-                normalized_char = normalize_arabic_char(char)
-                if normalized_char in LETTER_PROPERTIES:
-                    props = LETTER_PROPERTIES[normalized_char]
-                    total_ebced += props.ebced
-                    
-                    letters.append({
-                        'letter': normalized_char,
-                        'ebced': props.ebced,
-                        'element': props.element,
-                        'nurani_zulmani': 'N' if props.is_nurani else 'Z',
-                        'gender': 'E' if props.is_eril else 'D'
-                    })
+        total_ebced, letters = analyze_letters(arabic)
         
         result = {
             'letters': letters,
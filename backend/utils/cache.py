@@ -0,0 +1,94 @@
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable
+import threading
+
+class LRUCache:
+    """Boyutu sınırlı, en uzun süre kullanılmayanı atan, thread-safe önbellek
+
+    Değerler önbelleğe konduktan sonra değiştirilmemelidir; çağıranlar değiştirilebilir
+    kopyalarla çalışır. İsabet, ıskalama ve atma sayıları stats() ile okunur.
+    """
+
+    def __init__(self, name: str, maxsize: int):
+        self.name = name
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable):
+        """Anahtarın değerini döndürür; yoksa hesaplayıp saklar"""
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+        # Hesaplama kilit dışında yapılır; aynı anahtar aynı anda iki kez hesaplanabilir,
+        # sonuç aynı olduğundan sonra gelen yazım zararsızdır
+        value = compute()
+        if self.maxsize <= 0:
+            return value
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'name': self.name,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+            }
+
+class OnceCache:
+    """Sınırsız, kısa ömürlü (ör. tek bir istek boyunca) önbellek; her anahtar tam olarak bir kez hesaplanır
+
+    LRUCache'ten farklı olarak aynı anahtarı aynı anda isteyen thread'ler hesaplamayı
+    tekrarlamaz, ilk çağıranın sonucunu bekler. Hesaplama hata verirse bekleyenler
+    de aynı hatayı alır.
+    """
+
+    def __init__(self):
+        self._futures: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.computed = 0
+        self.reused = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable):
+        with self._lock:
+            future = self._futures.get(key)
+            owner = future is None
+            if owner:
+                future = self._futures[key] = Future()
+                self.computed += 1
+            else:
+                self.reused += 1
+        if owner:
+            try:
+                future.set_result(compute())
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+        return future.result()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'computed': self.computed, 'reused': self.reused}
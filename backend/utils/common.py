@@ -1,31 +1,31 @@
-import pandas as pd
-from typing import Optional, Tuple
+from typing import Optional
 from models.schemas import EsmaInfo
+from utils.store import EsmaIndex, is_missing
 
-def find_nearest_ebced_values(target_ebced: int, df: pd.DataFrame) -> tuple:
+def find_nearest_ebced_values(target_ebced: int, index: EsmaIndex) -> tuple:
     """En yakın alt ve üst ebced değerlerini bulur"""
-    ebced_values = df['ebced'].unique()
-    ebced_values = sorted(ebced_values)
-    
-    # Alt değeri bul
-    lower_values = [x for x in ebced_values if x < target_ebced]
-    lower = max(lower_values) if lower_values else None
-    
-    # Üst değeri bul
-    upper_values = [x for x in ebced_values if x > target_ebced]
-    upper = min(upper_values) if upper_values else None
-    
-    return lower, upper
+    lower = index.lower(target_ebced)
+    upper = index.upper(target_ebced)
+    return (
+        lower[0].ebced if lower else None,
+        upper[0].ebced if upper else None
+    )
 
-def get_esma_info(ebced_value: float, df: pd.DataFrame) -> Optional[EsmaInfo]:
-    """Belirli bir ebced değeri için esma bilgilerini döndürür"""
-    if pd.isna(ebced_value):
+def get_esma_info(ebced_value: float, index: EsmaIndex) -> Optional[EsmaInfo]:
+    """Belirli bir ebced değeri için esma bilgilerini döndürür (eşit değerlerde tablodaki ilk esma)"""
+    if is_missing(ebced_value):
         return None
-        
-    row = df[df['ebced'] == ebced_value].iloc[0]
+    
+    matches = index.exact(ebced_value)
+    if not matches:
+        print(f"Ebced {ebced_value} için eşleşme bulunamadı")
+        return None
+    
+    row = matches[0]
+    print(f"Bulunan esma: {row.esma}, Ebced: {row.ebced}, Anlam: {row.meaning}")  # Debug için
     return EsmaInfo(
-        ebced=int(row['ebced']),
-        name=str(row['esma']),
-        arabic=str(row['arabic']),
-        meaning=str(row['meaning'])
-    ) 
\ No newline at end of file
+        ebced=int(row.ebced),
+        name=str(row.esma).strip(),
+        arabic=str(row.arabic).strip(),
+        meaning=str(row.meaning).strip()
+    )
@@ -0,0 +1,205 @@
+from typing import Dict, Iterable
+import numpy as np
+import pandas as pd
+from utils.arabic_converter import LETTER_PROPERTIES
+
+def calculate_verse_ebced(arabic_text: str) -> int:
+    """Ayetin ebced değerini harf harf hesaplar (referans döngü, benchmark için saklanır)"""
+    total = 0
+    for char in str(arabic_text):
+        for props in LETTER_PROPERTIES.values():
+            if props.arabic == char:
+                total += props.ebced
+                break
+    return total
+
+def build_ebced_lookup() -> np.ndarray:
+    """Unicode kod noktası -> ebced değeri dizisini oluşturur"""
+    # Referans döngüyle birebir aynı sonuç için LETTER_PROPERTIES.values() sırasında
+    # ilk eşleşen harf kazanır ve sadece tek karakterlik harfler dikkate alınır.
+    # Hareke ve diğer işaretler 0 değerinde kalır; harekesiz metin üzerinde
+    # hesaplamakla eşdeğerdir.
+    letters = {}
+    for props in LETTER_PROPERTIES.values():
+        if len(props.arabic) == 1:
+            letters.setdefault(ord(props.arabic), props.ebced)
+    # Son eleman 0: tablonun dışında kalan kod noktaları buraya kırpılır
+    lookup = np.zeros(max(letters) + 2, dtype=np.int32)
+    for codepoint, ebced in letters.items():
+        lookup[codepoint] = ebced
+    return lookup
+
+EBCED_LOOKUP = build_ebced_lookup()
+
+def texts_to_codepoints(texts: list) -> tuple:
+    """Metin listesini tek bir kod noktası dizisine ve metin uzunluklarına çevirir"""
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    codepoints = np.frombuffer(''.join(texts).encode('utf-32-le'), dtype=np.uint32)
+    return codepoints, lengths
+
+def segment_sums(values: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Ardışık segmentlerin toplamlarını döndürür (boş segmentler 0)"""
+    cumulative = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum(values, out=cumulative[1:])
+    ends = np.cumsum(lengths)
+    return cumulative[ends] - cumulative[ends - lengths]
+
+def calculate_verse_ebced_batch(arabic_texts: Iterable) -> np.ndarray:
+    """Tüm ayetlerin ebced değerlerini tek vektörel geçişte hesaplar"""
+    # Metin olmayan değerler (NaN vb.) harf içermediği için 0 verir
+    texts = [text if isinstance(text, str) else '' for text in arabic_texts]
+    codepoints, lengths = texts_to_codepoints(texts)
+    values = EBCED_LOOKUP.take(codepoints, mode='clip')
+    return segment_sums(values, lengths)
+
+# Profil tablolarındaki element kolonlarının önekleri (ates_count, ates_ebced, ...)
+ELEMENT_KEYS = (('ATEŞ', 'ates'), ('HAVA', 'hava'), ('TOPRAK', 'toprak'), ('SU', 'su'))
+
+def build_letter_profile_lookup() -> tuple:
+    """Kod noktası -> (element kodu, nurani mi, eril mi) dizileri; ebced tablosuyla aynı harf kaydı kullanılır"""
+    letters = {}
+    for props in LETTER_PROPERTIES.values():
+        if len(props.arabic) == 1:
+            letters.setdefault(ord(props.arabic), props)
+    element_codes = {element: code for code, (element, _) in enumerate(ELEMENT_KEYS)}
+    size = len(EBCED_LOOKUP)
+    elements = np.full(size, -1, dtype=np.int8)
+    nurani = np.zeros(size, dtype=bool)
+    eril = np.zeros(size, dtype=bool)
+    for codepoint, props in letters.items():
+        elements[codepoint] = element_codes.get(props.element, -1)
+        nurani[codepoint] = props.is_nurani
+        eril[codepoint] = props.is_eril
+    return elements, nurani, eril
+
+LETTER_ELEMENTS, LETTER_NURANI, LETTER_ERIL = build_letter_profile_lookup()
+
+def _whitespace_lookup() -> np.ndarray:
+    # Unicode boşluk karakterlerinin hepsi U+3000 ve altındadır
+    lookup = np.zeros(0x3002, dtype=bool)
+    for codepoint in range(0x3001):
+        lookup[codepoint] = chr(codepoint).isspace()
+    return lookup
+
+WHITESPACE_LOOKUP = _whitespace_lookup()
+
+def range_sums(values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """[start, end) aralıklarının toplamları (aralıklar arasında boşluk olabilir)"""
+    cumulative = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum(values, out=cumulative[1:])
+    return cumulative[ends] - cumulative[starts]
+
+def letter_profile_columns(codepoints: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                           detailed: bool = False) -> Dict[str, np.ndarray]:
+    """Her [start, end) aralığının ebced ve harf profili
+
+    detailed True ise zulmani, eril/dişil ve element bazında ebced ve nurani
+    sayıları da hesaplanır.
+    """
+    ebced_values = EBCED_LOOKUP.take(codepoints, mode='clip')
+    element_codes = LETTER_ELEMENTS.take(codepoints, mode='clip')
+    nurani = LETTER_NURANI.take(codepoints, mode='clip')
+    letters = element_codes >= 0
+    columns = {
+        'ebced': range_sums(ebced_values, starts, ends),
+        'letter_count': range_sums(letters, starts, ends),
+        'nurani_count': range_sums(nurani, starts, ends),
+        'nurani_ebced': range_sums(np.where(nurani, ebced_values, 0), starts, ends),
+    }
+    if detailed:
+        eril = LETTER_ERIL.take(codepoints, mode='clip')
+        columns['zulmani_count'] = columns['letter_count'] - columns['nurani_count']
+        columns['zulmani_ebced'] = columns['ebced'] - columns['nurani_ebced']
+        columns['eril_count'] = range_sums(letters & eril, starts, ends)
+        columns['disil_count'] = columns['letter_count'] - columns['eril_count']
+    for code, (_, key) in enumerate(ELEMENT_KEYS):
+        in_element = element_codes == code
+        columns[f'{key}_count'] = range_sums(in_element, starts, ends)
+        if detailed:
+            columns[f'{key}_ebced'] = range_sums(np.where(in_element, ebced_values, 0), starts, ends)
+            columns[f'{key}_nurani'] = range_sums(in_element & nurani, starts, ends)
+    return columns
+
+# Tablolar int64 ile hesaplanır, saklanırken kolonun değer aralığına yeten en dar tipe
+# indirilir (ayet ve kelime konumları int16, ebced değerleri int32). Harf sayıları
+# kelimelerde uint8, ayetlerde int16 sığar.
+WORD_POSITION_TYPES = {
+    'verse_row': np.int16,
+    'surah_number': np.int16,
+    'verse_number': np.int16,
+    'word_position': np.int16,
+    'char_start': np.int16,
+    'char_end': np.int16,
+}
+EBCED_TYPE = np.int32
+
+def narrow(name: str, values: np.ndarray, dtype) -> np.ndarray:
+    """Kolonu verilen tipe indirir; değerler tipe sığmıyorsa sessizce taşmak yerine ValueError"""
+    info = np.iinfo(dtype)
+    if len(values) and (values.min() < info.min or values.max() > info.max):
+        raise ValueError(f"{name} kolonu {np.dtype(dtype)} tipine sığmıyor "
+                         f"({values.min()}..{values.max()})")
+    return np.asarray(values).astype(dtype, copy=False)
+
+def profile_column_type(name: str, count_type):
+    """Profil kolonunun saklama tipi: ebced toplamları EBCED_TYPE, harf sayıları count_type"""
+    return EBCED_TYPE if name == 'ebced' or name.endswith('_ebced') else count_type
+
+def build_word_table(quran_df) -> pd.DataFrame:
+    """Ayet metinlerini boşluklardan kelimelere ayırır; her kelimenin ebced ve harf profilini hesaplar
+
+    Harf içermeyen parçalar (durak işaretleri vb.) kelime sayılmaz. Kelime metni
+    tabloda tutulmaz; ayet metnindeki [char_start, char_end) aralığıdır. Bir ayetin
+    kelime ebcedlerinin toplamı verse_ebced değerine eşittir.
+    """
+    texts = [text if isinstance(text, str) else '' for text in quran_df['arabic_text'].tolist()]
+    # Ayetler arasına boşluk konur; kelimeler ayet sınırını aşmaz
+    codepoints = np.frombuffer(' '.join(texts).encode('utf-32-le'), dtype=np.uint32)
+    verse_starts = np.zeros(len(texts), dtype=np.int64)
+    if texts:
+        np.cumsum([len(text) + 1 for text in texts[:-1]], out=verse_starts[1:])
+
+    is_word = ~WHITESPACE_LOOKUP.take(codepoints, mode='clip')
+    edges = np.diff(np.concatenate(([False], is_word, [False])).astype(np.int8))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    columns = letter_profile_columns(codepoints, starts, ends)
+    letter_counts = columns['letter_count']
+
+    keep = letter_counts > 0
+    starts, ends = starts[keep], ends[keep]
+    verse_rows = np.searchsorted(verse_starts, starts, side='right') - 1
+    # Ayet içindeki sıra (1'den başlar)
+    first_in_verse = np.zeros(len(verse_rows), dtype=bool)
+    first_in_verse[:1] = True
+    first_in_verse[1:] = verse_rows[1:] != verse_rows[:-1]
+    group_starts = np.flatnonzero(first_in_verse)
+    positions = np.arange(len(verse_rows)) - np.repeat(group_starts, np.diff(np.append(group_starts, len(verse_rows)))) + 1
+
+    surah_numbers = quran_df['surah_number'].to_numpy()
+    verse_numbers = quran_df['verse_number'].to_numpy()
+    table = {
+        'verse_row': verse_rows,
+        'surah_number': surah_numbers[verse_rows],
+        'verse_number': verse_numbers[verse_rows],
+        'word_position': positions,
+        'char_start': starts - verse_starts[verse_rows],
+        'char_end': ends - verse_starts[verse_rows],
+    }
+    table = {name: narrow(name, values, WORD_POSITION_TYPES[name]) for name, values in table.items()}
+    table.update({name: narrow(name, values[keep], profile_column_type(name, np.uint8))
+                  for name, values in columns.items()})
+    return pd.DataFrame(table)
+
+def build_verse_profile_table(quran_df) -> pd.DataFrame:
+    """Her ayetin harf profili (satırlar Kuran tablosuyla aynı sırada)
+
+    Nurani/zulmani, eril/dişil ve element bazında harf sayıları ile ebced
+    toplamları; ebced kolonu verse_ebced değerine eşittir.
+    """
+    texts = [text if isinstance(text, str) else '' for text in quran_df['arabic_text'].tolist()]
+    codepoints, lengths = texts_to_codepoints(texts)
+    ends = np.cumsum(lengths)
+    columns = letter_profile_columns(codepoints, ends - lengths, ends, detailed=True)
+    return pd.DataFrame({name: narrow(name, values, profile_column_type(name, np.int16))
+                         for name, values in columns.items()})
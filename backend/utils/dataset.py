@@ -0,0 +1,438 @@
+from typing import Dict, Optional, Tuple
+import hashlib
+import json
+import os
+import struct
+import time
+import numpy as np
+import pandas as pd
+from utils.corpus import build_verse_profile_table, build_word_table, calculate_verse_ebced_batch
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.normpath(os.path.join(current_dir, '..', 'data'))
+DATA_XLSX_PATH = os.path.join(DATA_DIR, 'data.xlsx')
+LETTER_JSON_PATH = os.path.join(DATA_DIR, 'letter.json')
+SNAPSHOT_PATH = os.path.join(DATA_DIR, 'dataset.snap')
+
+# Snapshot dosya formatı:
+#   MAGIC (8 bayt) | format sürümü (u32) | header uzunluğu (u32) | header (JSON) | payload
+# Payload içindeki her kolon tamponu ALIGNMENT'a hizalanır, böylece dosya doğrudan
+# mmap edilip numpy ile kopyasız okunabilir.
+SNAPSHOT_MAGIC = b'EBCEDSNP'
+# Temizleme kuralları veya kolon düzeni değiştiğinde artırılmalı; eski snapshot'lar bayat sayılır
+SNAPSHOT_VERSION = 4
+ALIGNMENT = 64
+_PREAMBLE = struct.Struct('<8sII')
+
+# quran_words ve verse_profiles Excel'de yoktur; veri seti oluşturulurken Kuran tablosundan hesaplanır
+TABLE_NAMES = ('names', 'esma', 'quran', 'quran_words', 'verse_profiles')
+
+
+class SnapshotError(Exception):
+    """Snapshot dosyası okunamadığında veya bozuk olduğunda fırlatılır"""
+
+
+def file_sha256(path: str) -> str:
+    """Dosyanın SHA-256 özetini döndürür"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_fingerprint(path: str) -> dict:
+    """Kaynak dosyanın boyut, değişiklik zamanı ve özet bilgisini döndürür"""
+    stat = os.stat(path)
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': file_sha256(path),
+    }
+
+
+def source_paths(xlsx_path: str = DATA_XLSX_PATH) -> Dict[str, str]:
+    """Snapshot içeriğini belirleyen kaynak dosyalar"""
+    # letter.json ayet ebced değerlerini etkilediği için kaynaklara dahil
+    return {'data.xlsx': xlsx_path, 'letter.json': LETTER_JSON_PATH}
+
+
+# ---------------------------------------------------------------------------
+# Excel okuma ve temizleme
+# ---------------------------------------------------------------------------
+
+def read_names_sheet(excel_file) -> pd.DataFrame:
+    """İsimler sayfasını okur ve temizler"""
+    print("\nİsimler sayfası okunuyor...")
+    names_df = pd.read_excel(excel_file, sheet_name='İsimler')
+    print(f"Sütunlar: {names_df.columns.tolist()}")
+    print(f"Satır sayısı: {len(names_df)}")
+
+    # İsimleri temizle
+    names_df = names_df.dropna(how='all')  # Tamamen boş satırları sil
+    names_df = names_df.iloc[1:]  # Header satırını atla
+    # Sütun isimlerini düzelt
+    names_df.columns = ['name', 'arabic', 'ebced', 'gender']
+    print(f"Temizleme sonrası isim sayısı: {len(names_df)}")
+    return names_df
+
+
+def read_esma_sheet(excel_file) -> pd.DataFrame:
+    """Esma Ebced sayfasını okur ve temizler"""
+    print("\nEsma sayfası okunuyor...")
+    try:
+        esma_df = pd.read_excel(excel_file, sheet_name='Esma Ebced', header=None, skiprows=2)
+        print("Ham veri boyutu:", esma_df.shape)
+
+        # Boş satırları temizle
+        esma_df = esma_df.dropna(how='all')  # Tamamen boş satırları sil
+
+        # Sütun isimlerini ayarla
+        esma_df.columns = ['no', 'ebced', 'esma', 'arabic', 'meaning']
+
+        # Ebced değerlerini sayıya çevir
+        esma_df['ebced'] = pd.to_numeric(esma_df['ebced'], errors='coerce')
+
+        # Eksik verileri temizle
+        esma_df = esma_df.dropna(subset=['ebced', 'esma'])
+        print(f"Temizleme sonrası esma sayısı: {len(esma_df)}")
+
+    except Exception as e:
+        print(f"\nEsma verilerini okurken hata: {str(e)}")
+        print("Hata detayları:")
+        import traceback
+        traceback.print_exc()
+        esma_df = pd.DataFrame(columns=['no', 'esma', 'arabic', 'ebced', 'meaning'])
+
+    return esma_df
+
+
+def read_quran_sheet(excel_file) -> pd.DataFrame:
+    """Arapça Kuran sayfasını okur, temizler ve ayet ebced değerlerini hesaplar"""
+    print("\nKuran sayfası okunuyor...")
+    quran_df = pd.read_excel(excel_file, sheet_name='Arapça Kuran')
+
+    # Gerekli sütunları seç ve yeniden adlandır
+    quran_df = quran_df.rename(columns={
+        'SURE NO': 'surah_number',
+        'AYET NO': 'verse_number',
+        'SURE ADI': 'surah_name',
+        'DiyanetHatti.1': 'arabic_text',
+        'TurkceMeal': 'turkish_meaning'
+    })
+    print("Mevcut sütunlar:", quran_df.columns.tolist())
+
+    # Kuran verilerini temizle
+    quran_df = quran_df.dropna(how='all')  # Tamamen boş satırları sil
+    print(f"Temizleme sonrası ayet sayısı: {len(quran_df)}")
+
+    # Sayısal sütunları dönüştür
+    quran_df['surah_number'] = pd.to_numeric(quran_df['surah_number'], errors='coerce')
+    quran_df['verse_number'] = pd.to_numeric(quran_df['verse_number'], errors='coerce')
+
+    print("Ayet ebced değerleri hesaplanıyor...")
+    quran_df['verse_ebced'] = calculate_verse_ebced_batch(quran_df['arabic_text'].tolist())
+    print("Ebced değerleri hesaplandı.")
+
+    # Sadece gerekli sütunları al
+    quran_df = quran_df[['surah_number', 'verse_number', 'surah_name', 'arabic_text', 'turkish_meaning', 'verse_ebced']]
+    print(f"Arabic text sütununda {quran_df['arabic_text'].isnull().sum()} adet null değer var")
+    return quran_df
+
+
+def load_tables_from_excel(xlsx_path: str = DATA_XLSX_PATH) -> Dict[str, pd.DataFrame]:
+    """Excel dosyasındaki tüm referans tablolarını okur"""
+    print("Excel dosyaları okunuyor...")
+    excel_file = pd.ExcelFile(xlsx_path)
+    print(f"Excel sayfaları: {excel_file.sheet_names}")
+    tables = {
+        'names': read_names_sheet(excel_file),
+        'esma': read_esma_sheet(excel_file),
+        'quran': read_quran_sheet(excel_file),
+    }
+    print("Kelime tablosu hesaplanıyor...")
+    tables['quran_words'] = build_word_table(tables['quran'])
+    print(f"{len(tables['quran_words'])} kelime hesaplandı.")
+    print("Ayet harf profilleri hesaplanıyor...")
+    tables['verse_profiles'] = build_verse_profile_table(tables['quran'])
+    print("\nVeri temizleme tamamlandı.")
+    return tables
+
+
+# ---------------------------------------------------------------------------
+# Snapshot yazma
+# ---------------------------------------------------------------------------
+
+def _align(n: int) -> int:
+    return (n + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class _PayloadWriter:
+    """Kolon tamponlarını hizalı şekilde payload'a ekler"""
+
+    def __init__(self):
+        self.parts = []
+        self.size = 0
+
+    def add(self, data: bytes) -> list:
+        padding = _align(self.size) - self.size
+        if padding:
+            self.parts.append(b'\0' * padding)
+            self.size += padding
+        offset = self.size
+        self.parts.append(data)
+        self.size += len(data)
+        return [offset, len(data)]
+
+    def getvalue(self) -> bytes:
+        return b''.join(self.parts)
+
+
+def _encode_strings(values, writer: _PayloadWriter) -> dict:
+    """Metin kolonunu NUL ile sonlandırılmış UTF-8 blok + ofset dizisi olarak yazar"""
+    encoded = []
+    valid = np.ones(len(values), dtype=np.uint8)
+    for i, value in enumerate(values):
+        if isinstance(value, str):
+            if '\0' in value:
+                raise ValueError("Metin kolonunda NUL karakteri desteklenmiyor")
+            encoded.append(value.encode('utf-8'))
+        elif pd.isna(value):
+            encoded.append(b'')
+            valid[i] = 0
+        else:
+            raise ValueError(f"Metin kolonunda beklenmeyen değer: {value!r}")
+    lengths = np.fromiter((len(b) + 1 for b in encoded), dtype=np.int64, count=len(encoded))
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    buffers = {
+        'offsets': writer.add(offsets.tobytes()),
+        'data': writer.add(b''.join(b + b'\0' for b in encoded)),
+    }
+    if not valid.all():
+        buffers['valid'] = writer.add(valid.tobytes())
+    return buffers
+
+
+def _encode_column(series: pd.Series, writer: _PayloadWriter) -> dict:
+    """Bir DataFrame kolonunu payload'a yazar ve header kaydını döndürür"""
+    dtype = str(series.dtype)
+    if series.dtype.kind in 'iu':
+        # Tamsayı kolonları kendi genişlikleriyle yazılır (int16 kolon 2 bayt/satır)
+        values = np.ascontiguousarray(series.to_numpy())
+        return {'kind': 'int', 'dtype': dtype, 'buffers': {'values': writer.add(values.tobytes())}}
+    if series.dtype.kind == 'f':
+        values = series.to_numpy(dtype=np.float64)
+        return {'kind': 'float64', 'dtype': dtype, 'buffers': {'values': writer.add(values.tobytes())}}
+    if series.dtype == object:
+        non_null = [v for v in series if not (isinstance(v, float) and np.isnan(v))]
+        if non_null and all(isinstance(v, (int, np.integer)) and not isinstance(v, bool) for v in non_null) \
+                and len(non_null) == len(series):
+            values = np.asarray(non_null, dtype=np.int64)
+            return {'kind': 'int64', 'dtype': dtype, 'buffers': {'values': writer.add(values.tobytes())}}
+        return {'kind': 'str', 'dtype': dtype, 'buffers': _encode_strings(series.tolist(), writer)}
+    raise ValueError(f"Desteklenmeyen kolon tipi: {series.name} ({dtype})")
+
+
+def write_snapshot(tables: Dict[str, pd.DataFrame], path: str = SNAPSHOT_PATH,
+                   sources: Optional[Dict[str, str]] = None) -> dict:
+    """Tabloları sürümlü ve checksum'lı ikili snapshot dosyasına yazar"""
+    sources = source_paths() if sources is None else sources
+    writer = _PayloadWriter()
+    table_headers = {}
+    for table_name, df in tables.items():
+        index = np.asarray(df.index, dtype=np.int64)
+        table_headers[table_name] = {
+            'rows': len(df),
+            'index': writer.add(index.tobytes()),
+            'columns': [
+                dict(name=str(column), **_encode_column(df[column], writer))
+                for column in df.columns
+            ],
+        }
+    payload = writer.getvalue()
+
+    header = {
+        'version': SNAPSHOT_VERSION,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'sources': {
+            name: source_fingerprint(source)
+            for name, source in sources.items() if os.path.exists(source)
+        },
+        'payload_size': len(payload),
+        'payload_sha256': hashlib.sha256(payload).hexdigest(),
+        'tables': table_headers,
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    payload_start = _align(_PREAMBLE.size + len(header_bytes))
+
+    # Dosyayı geçici isimle yazıp atomik olarak yerine taşı
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(_PREAMBLE.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b'\0' * (payload_start - _PREAMBLE.size - len(header_bytes)))
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return header
+
+
+# ---------------------------------------------------------------------------
+# Snapshot okuma
+# ---------------------------------------------------------------------------
+
+def read_snapshot_header(path: str = SNAPSHOT_PATH) -> Tuple[dict, int]:
+    """Snapshot header'ını ve payload başlangıç ofsetini döndürür"""
+    with open(path, 'rb') as f:
+        preamble = f.read(_PREAMBLE.size)
+        if len(preamble) != _PREAMBLE.size:
+            raise SnapshotError("Snapshot dosyası eksik")
+        magic, version, header_size = _PREAMBLE.unpack(preamble)
+        if magic != SNAPSHOT_MAGIC:
+            raise SnapshotError("Geçersiz snapshot dosyası")
+        if version != SNAPSHOT_VERSION:
+            raise SnapshotError(f"Snapshot sürümü uyumsuz: {version} (beklenen {SNAPSHOT_VERSION})")
+        header = json.loads(f.read(header_size).decode('utf-8'))
+    return header, _align(_PREAMBLE.size + header_size)
+
+
+def is_snapshot_stale(header: dict, sources: Optional[Dict[str, str]] = None) -> bool:
+    """Kaynak dosyalar snapshot oluşturulduktan sonra değiştiyse True döndürür"""
+    sources = source_paths() if sources is None else sources
+    for name, path in sources.items():
+        if not os.path.exists(path):
+            # Kaynak dağıtıma dahil edilmemiş olabilir, snapshot geçerli sayılır
+            continue
+        recorded = header['sources'].get(name)
+        if recorded is None:
+            return True
+        stat = os.stat(path)
+        if stat.st_size == recorded['size'] and stat.st_mtime_ns == recorded['mtime_ns']:
+            continue
+        # mtime checkout/kopyalama ile değişmiş olabilir, içerik özetine bak
+        if stat.st_size != recorded['size'] or file_sha256(path) != recorded['sha256']:
+            return True
+    return False
+
+
+def _buffer(payload, ref: list, dtype) -> np.ndarray:
+    offset, size = ref
+    return np.frombuffer(payload, dtype=dtype, count=size // np.dtype(dtype).itemsize, offset=offset)
+
+
+def _decode_column(payload, column: dict, rows: int):
+    buffers = column['buffers']
+    if column['kind'] == 'int':
+        return _buffer(payload, buffers['values'], np.dtype(column['dtype']))
+    if column['kind'] == 'int64':
+        # Tamsayı değerli object kolonlar
+        return _buffer(payload, buffers['values'], np.int64).astype(object)
+    if column['kind'] == 'float64':
+        return _buffer(payload, buffers['values'], np.float64).astype(column['dtype'])
+    offset, size = buffers['data']
+    values = bytes(payload[offset:offset + size]).decode('utf-8').split('\0')[:rows]
+    result = np.array(values, dtype=object)
+    if 'valid' in buffers:
+        result[_buffer(payload, buffers['valid'], np.uint8) == 0] = np.nan
+    return result
+
+
+def tables_from_payload(header: dict, payload, table_names=None) -> Dict[str, pd.DataFrame]:
+    """Payload tamponlarından DataFrame'leri oluşturur"""
+    tables = {}
+    for table_name in table_names or header['tables'].keys():
+        table = header['tables'][table_name]
+        rows = table['rows']
+        index = _buffer(payload, table['index'], np.int64)
+        if np.array_equal(index, np.arange(rows)):
+            index = pd.RangeIndex(rows)
+        else:
+            index = pd.Index(index.copy())
+        tables[table_name] = pd.DataFrame(
+            {column['name']: _decode_column(payload, column, rows) for column in table['columns']},
+            index=index,
+        )
+    return tables
+
+
+def read_snapshot_payload(path: str = SNAPSHOT_PATH, verify: bool = True) -> Tuple[dict, bytes]:
+    """Snapshot header'ını ve checksum'ı doğrulanmış payload'ı döndürür"""
+    header, payload_offset = read_snapshot_header(path)
+    with open(path, 'rb') as f:
+        f.seek(payload_offset)
+        payload = f.read()
+    if len(payload) != header['payload_size']:
+        raise SnapshotError("Snapshot payload boyutu uyumsuz")
+    if verify and hashlib.sha256(payload).hexdigest() != header['payload_sha256']:
+        raise SnapshotError("Snapshot checksum doğrulaması başarısız")
+    return header, payload
+
+
+def read_snapshot(path: str = SNAPSHOT_PATH, verify: bool = True) -> Tuple[dict, Dict[str, pd.DataFrame]]:
+    """Snapshot dosyasını okur, checksum'ı doğrular ve tabloları döndürür"""
+    header, payload = read_snapshot_payload(path, verify)
+    return header, tables_from_payload(header, payload)
+
+
+# ---------------------------------------------------------------------------
+# Veri kaynakları
+# ---------------------------------------------------------------------------
+
+class SnapshotSource:
+    """Doğrulanmış snapshot payload'ından tabloları istendikçe oluşturur"""
+    kind = 'snapshot'
+
+    def __init__(self, path: str = SNAPSHOT_PATH):
+        self.path = path
+        self.header, self.payload = read_snapshot_payload(path)
+
+    def load(self, table_name: str) -> pd.DataFrame:
+        return tables_from_payload(self.header, self.payload, [table_name])[table_name]
+
+
+class ExcelSource:
+    """Tüm tabloları Excel dosyasından okur ve mümkünse snapshot'ı yeniden yazar"""
+    kind = 'excel'
+
+    def __init__(self, xlsx_path: str = DATA_XLSX_PATH, snapshot_path: str = SNAPSHOT_PATH):
+        self.path = xlsx_path
+        self.tables = load_tables_from_excel(xlsx_path)
+        try:
+            write_snapshot(self.tables, snapshot_path, source_paths(xlsx_path))
+            print(f"Snapshot oluşturuldu: {snapshot_path}")
+        except OSError as e:
+            # Salt okunur dosya sistemlerinde (ör. serverless) snapshot yazılamayabilir
+            print(f"Snapshot yazılamadı: {str(e)}")
+
+    def load(self, table_name: str) -> pd.DataFrame:
+        return self.tables[table_name]
+
+
+def open_source(xlsx_path: str = DATA_XLSX_PATH, snapshot_path: str = SNAPSHOT_PATH):
+    """Güncel snapshot varsa onu, yoksa Excel dosyasını veri kaynağı olarak açar"""
+    if os.getenv('DATASET_MODE') == 'mmap':
+        # Çok worker'lı dağıtımlar: snapshot tek süreçte oluşturulur, herkes paylaşımlı eşler
+        from utils.shared_dataset import open_mapped_source
+        return open_mapped_source(xlsx_path, snapshot_path)
+    if os.path.exists(snapshot_path):
+        try:
+            start = time.perf_counter()
+            header, _ = read_snapshot_header(snapshot_path)
+            if is_snapshot_stale(header, source_paths(xlsx_path)):
+                print("Snapshot bayat, Excel dosyasından okunacak.")
+            else:
+                source = SnapshotSource(snapshot_path)
+                elapsed = (time.perf_counter() - start) * 1000
+                print(f"Snapshot açıldı ({source.header['created_at']}, {elapsed:.1f} ms)")
+                return source
+        except (SnapshotError, OSError, ValueError, KeyError) as e:
+            print(f"Snapshot okunamadı, Excel dosyasından okunacak: {str(e)}")
+    else:
+        print("Snapshot bulunamadı, Excel dosyasından okunacak.")
+    return ExcelSource(xlsx_path, snapshot_path)
+
+
+def load_tables(xlsx_path: str = DATA_XLSX_PATH, snapshot_path: str = SNAPSHOT_PATH) -> Dict[str, pd.DataFrame]:
+    """Tüm tabloları snapshot'tan yükler; snapshot yoksa veya bayatsa Excel'e geri döner"""
+    source = open_source(xlsx_path, snapshot_path)
+    return {table_name: source.load(table_name) for table_name in TABLE_NAMES}
@@ -0,0 +1,88 @@
+"""Element profili benzerliğiyle en yakın komşu araması
+
+Bir kişi, esma veya ayet nurani harflerinin 4 elementli sayım vektörüne
+(ATEŞ/HAVA/TOPRAK/SU) indirgenir. Vektör toplamı 1 olacak şekilde oranlara
+çevrilir; ek boyut olarak nurani ebced değerinin logaritması eklenir (büyük
+ayet değerleriyle küçük isim değerleri aynı ölçekte karşılaştırılsın diye).
+Uzaklık:
+
+    d² = Σ (p_e - q_e)² + ebced_weight * (log(1 + E_p) - log(1 + E_q))²
+
+Esma (99) ve ayet (6236) profilleri küçük olduğu için ağaç yapısı yerine tüm
+satırlara karşı tek bir numpy işlemiyle uzaklık hesaplanır; en yakın k satır
+argpartition ile seçilir.
+"""
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from utils.esma_profiles import ELEMENTS, EsmaProfileTable
+from utils.store import EsmaStore
+from utils.verse_profiles import VerseProfileTable
+
+# Element oranları [0, 1] aralığında; ebced boyutu oranların önüne geçmesin diye küçük ağırlık
+EBCED_WEIGHT = 0.1
+DISTANCE_DECIMALS = 9
+
+def element_ratios(counts) -> np.ndarray:
+    """Satır başına toplamı 1 olan element oranları; nurani harf yoksa sıfır vektör"""
+    counts = np.asarray(counts, dtype=np.float64).reshape(-1, len(ELEMENTS))
+    totals = counts.sum(axis=1, keepdims=True)
+    return np.divide(counts, totals, out=np.zeros_like(counts), where=totals > 0)
+
+class ElementSimilarityIndex:
+    """Profil satırları üzerinde element oranı + ebced uzaklığıyla top-k arama"""
+
+    def __init__(self, counts, nurani_ebceds, rows: Optional[Sequence[int]] = None):
+        self.ratios = element_ratios(counts)
+        self.log_ebced = np.log1p(np.maximum(np.asarray(nurani_ebceds, dtype=np.float64), 0))
+        # Σ (p_e - q_e)² = |p|² - 2 p·q + |q|²; |p|² bir kez hesaplanır, sorguda tek bir matris-vektör çarpımı kalır
+        self._ratio_norms = (self.ratios ** 2).sum(axis=1)
+        # İndeks satırı -> kaynak tablodaki satır
+        self.rows = np.arange(len(self.ratios)) if rows is None else np.asarray(rows, dtype=np.int64)
+        for array in (self.ratios, self.log_ebced, self._ratio_norms, self.rows):
+            array.flags.writeable = False
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def distances(self, counts, nurani_ebced: int, ebced_weight: float = EBCED_WEIGHT) -> np.ndarray:
+        """Sorgu profiline tüm satırların uzaklığı"""
+        query = element_ratios(counts)[0]
+        squared = self._ratio_norms - 2 * (self.ratios @ query) + query @ query
+        squared += ebced_weight * (self.log_ebced - np.log1p(max(nurani_ebced, 0))) ** 2
+        # Yuvarlama hatasıyla oluşabilecek küçük negatif değerler kırpılır; eşit uzaklıklar
+        # kayan nokta gürültüsüyle ayrışmasın (tablo sırası korunsun) diye sonuç yuvarlanır
+        return np.round(np.sqrt(np.maximum(squared, 0)), DISTANCE_DECIMALS)
+
+    def nearest(self, counts, nurani_ebced: int, k: int, ebced_weight: float = EBCED_WEIGHT,
+                mask: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """En yakın k satır (kaynak tablo satırı, uzaklık); eşit uzaklıkta tablo sırası
+
+        mask (kaynak tablo satırları üzerinde) verilirse sadece True satırlar aranır.
+        """
+        allowed = np.arange(len(self.rows)) if mask is None else np.flatnonzero(np.asarray(mask)[self.rows])
+        k = min(k, len(allowed))
+        if k <= 0:
+            return []
+        distances = self.distances(counts, nurani_ebced, ebced_weight)
+        values = distances[allowed]
+        if k < len(values):
+            # k. en küçük uzaklığa eşit olanlar da aday kalır; sınırdaki eşitlikler tablo sırasıyla bozulur
+            threshold = np.partition(values, k - 1)[k - 1]
+            candidates = np.flatnonzero(values <= threshold)
+        else:
+            candidates = np.arange(len(values))
+        order = allowed[candidates[np.argsort(values[candidates], kind='stable')][:k]]
+        return list(zip(self.rows[order].tolist(), distances[order].tolist()))
+
+def esma_similarity_index(esmas: EsmaStore, profiles: EsmaProfileTable) -> ElementSimilarityIndex:
+    """Eksik alanı olmayan esmaların nurani profilleri"""
+    selected = [profiles.profile(record) for record in esmas.complete]
+    return ElementSimilarityIndex(
+        [[profile.element_counts[element] for element in ELEMENTS] for profile in selected],
+        [profile.nurani_ebced for profile in selected],
+        [profile.esma.row for profile in selected]
+    )
+
+def verse_similarity_index(profiles: VerseProfileTable) -> ElementSimilarityIndex:
+    """Ayetlerin nurani profilleri (satırlar ayet deposuyla aynı sırada)"""
+    return ElementSimilarityIndex(profiles.element_nurani, profiles.nurani_ebced)
@@ -0,0 +1,120 @@
+"""Esmaların nurani harf profilleri; veri seti yüklenirken bir kez hesaplanır
+
+Her esma için nurani harflerin element sayıları, baskın element(ler), eşitlik
+bozma verisi ve toplam nurani ebced değeri tutulur. Element sayıları ayrıca
+(esma sayısı x 4) boyutunda bir numpy dizisinde durur; elemente göre filtreler
+bu dizi üzerinde çalışır.
+"""
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from utils.arabic_converter import LETTER_PROPERTIES, LetterProperties
+from utils.store import EsmaRecord, EsmaStore, FrozenRecord
+
+_set = object.__setattr__
+
+ELEMENTS = ('ATEŞ', 'HAVA', 'TOPRAK', 'SU')
+ELEMENT_INDEX = {element: i for i, element in enumerate(ELEMENTS)}
+
+def _nurani_by_form() -> Dict[str, LetterProperties]:
+    """Harf biçimine göre ilk nurani harf (harf tablosunu sırayla tarayan eski döngünün karşılığı)"""
+    letters: Dict[str, LetterProperties] = {}
+    for props in LETTER_PROPERTIES.values():
+        if props.is_nurani:
+            letters.setdefault(props.arabic, props)
+    return letters
+
+def _nurani_by_key() -> Dict[str, LetterProperties]:
+    """Harf tablosu anahtarına göre nurani harfler (LETTER_PROPERTIES[char] karşılığı)
+
+    Not: ة normalize edildiğinde ه olduğu için LETTER_PROPERTIES['ه'] ة'nin
+    özelliklerini taşır; bu yüzden iki sayım ه harfinde farklılaşabilir.
+    """
+    return {char: props for char, props in LETTER_PROPERTIES.items() if props.is_nurani}
+
+NURANI_BY_FORM = _nurani_by_form()
+NURANI_BY_KEY = _nurani_by_key()
+
+def _count(arabic: str, letters: Dict[str, LetterProperties]) -> Tuple[Dict[str, int], Dict[str, Tuple[int, ...]]]:
+    counts = {element: 0 for element in ELEMENTS}
+    ebceds: Dict[str, List[int]] = {element: [] for element in ELEMENTS}
+    for char in arabic:
+        props = letters.get(char)
+        if props is not None:
+            counts[props.element] += 1
+            ebceds[props.element].append(props.ebced)
+    return counts, {element: tuple(values) for element, values in ebceds.items()}
+
+class EsmaProfile(FrozenRecord):
+    """Bir esmanın nurani harf profili (salt okunur; yanıtlara kopyası konur)"""
+    __slots__ = ('esma', 'element_counts', 'element_ebceds', 'nurani_count', 'nurani_ebced',
+                 'dominant_elements', 'dominant_element', 'key_element_counts')
+
+    def __init__(self, esma: EsmaRecord):
+        _set(self, 'esma', esma)
+        arabic = str(esma.arabic)
+        counts, ebceds = _count(arabic, NURANI_BY_FORM)
+        _set(self, 'element_counts', MappingProxyType(counts))
+        # Eşitlik bozma verisi: her elementin nurani harflerinin ebced değerleri
+        _set(self, 'element_ebceds', MappingProxyType(ebceds))
+        _set(self, 'nurani_count', sum(counts.values()))
+        _set(self, 'nurani_ebced', sum(sum(values) for values in ebceds.values()))
+        max_count = max(counts.values())
+        # En çok nurani harfe sahip elementler (element sırasıyla); hiç nurani harf yoksa boş
+        _set(self, 'dominant_elements', tuple(e for e in ELEMENTS if counts[e] == max_count) if max_count else ())
+        _set(self, 'dominant_element', self._break_tie(max_count))
+        # Harf tablosu anahtarıyla yapılan sayım (personal_disease bu sayımı kullanır)
+        _set(self, 'key_element_counts', MappingProxyType(_count(arabic, NURANI_BY_KEY)[0]))
+
+    def _break_tie(self, max_count: int) -> str:
+        """Eşitlikte harflerinin ebcedi sıfıra en yakın olan element; karar verilemezse ilk element"""
+        candidates = self.dominant_elements or ELEMENTS
+        if len(candidates) == 1:
+            return candidates[0]
+        best, best_distance = None, float('inf')
+        for element in candidates:
+            if self.element_ebceds[element]:
+                distance = min(abs(x) for x in self.element_ebceds[element])
+                if distance < best_distance:
+                    best, best_distance = element, distance
+        return best or candidates[0]
+
+    @property
+    def first_dominant(self) -> Optional[str]:
+        """Eşitlikte element sırasındaki ilk baskın element; nurani harf yoksa None"""
+        return self.dominant_elements[0] if self.dominant_elements else None
+
+    def is_dominated_by(self, element: str) -> bool:
+        """Element en çok nurani harfe sahip elementlerden biri mi"""
+        return element in self.dominant_elements
+
+class EsmaProfileTable:
+    """Esma deposundaki tüm esmaların profilleri; tablo sırasına göre indekslenir"""
+
+    def __init__(self, esmas: EsmaStore):
+        self.profiles: Tuple[EsmaProfile, ...] = tuple(EsmaProfile(esma) for esma in esmas.records)
+        # Satır sırasıyla (esma sayısı x 4) element sayıları
+        self.counts = np.array(
+            [[profile.element_counts[element] for element in ELEMENTS] for profile in self.profiles],
+            dtype=np.int32
+        ).reshape(len(self.profiles), len(ELEMENTS))
+        self.nurani_ebced = np.array([profile.nurani_ebced for profile in self.profiles], dtype=np.int64)
+        max_counts = self.counts.max(axis=1) if len(self.profiles) else np.zeros(0, dtype=np.int32)
+        self._dominated = (self.counts == max_counts[:, None]) & (self.counts > 0)
+        # Paylaşılan diziler salt okunur
+        for array in (self.counts, self.nurani_ebced, self._dominated):
+            array.flags.writeable = False
+
+    def profile(self, esma: EsmaRecord) -> EsmaProfile:
+        return self.profiles[esma.row]
+
+    def containing_mask(self, element: str) -> np.ndarray:
+        """Elementten en az bir nurani harf içeren esmalar (satır maskesi)"""
+        return self.counts[:, ELEMENT_INDEX[element]] > 0
+
+    def dominated_mask(self, element: str) -> np.ndarray:
+        """Elementin baskın (en çok nurani harfli) olduğu esmalar (satır maskesi)"""
+        return self._dominated[:, ELEMENT_INDEX[element]]
+
+    def __len__(self) -> int:
+        return len(self.profiles)
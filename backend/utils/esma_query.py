@@ -0,0 +1,56 @@
+"""Element ve ebced değerine göre birleşik esma sorguları
+
+Her element için iki sıralı ebced indeksi tutulur: elementin baskın olduğu
+esmalar ve elementten en az bir nurani harf içeren esmalar. Element verilmeyen
+sorgular tüm esmaları kapsayan indeksi kullanır. Sorgular bisect ile
+logaritmik zamanda çalışır; tolerans genişletip tekrar deneme gerekmez.
+"""
+from typing import Dict, List, Optional, Tuple
+from utils.esma_profiles import ELEMENTS, EsmaProfile, EsmaProfileTable
+from utils.store import EsmaIndex, EsmaStore
+
+MATCH_MODES = ('dominant', 'contains')
+
+class EsmaQueryEngine:
+    """Eksik alanı olmayan esmalar üzerinde element + ebced sorguları"""
+
+    def __init__(self, esmas: EsmaStore, profiles: EsmaProfileTable):
+        self.profiles = profiles
+        records = esmas.complete
+        self.all = esmas.complete_index
+        self._indexes: Dict[Tuple[str, str], EsmaIndex] = {}
+        for element in ELEMENTS:
+            dominated = profiles.dominated_mask(element)
+            containing = profiles.containing_mask(element)
+            self._indexes[element, 'dominant'] = EsmaIndex([r for r in records if dominated[r.row]])
+            self._indexes[element, 'contains'] = EsmaIndex([r for r in records if containing[r.row]])
+
+    def index(self, element: Optional[str] = None, match: str = 'dominant') -> EsmaIndex:
+        """Element ve eşleşme türüne göre indeks; element yoksa tüm esmalar"""
+        if element is None:
+            return self.all
+        if element not in ELEMENTS:
+            raise ValueError(f"Geçersiz element: {element} ({', '.join(ELEMENTS)})")
+        if match not in MATCH_MODES:
+            raise ValueError(f"Geçersiz eşleşme türü: {match} ({', '.join(MATCH_MODES)})")
+        return self._indexes[element, match]
+
+    def nearest(self, ebced: int, k: int, element: Optional[str] = None,
+                match: str = 'dominant') -> List[Tuple[EsmaProfile, float]]:
+        """Ebced değerine en yakın k esma ve farkları (eşit farkta tablo sırası)"""
+        records = self.index(element, match).k_nearest(ebced, k)
+        return [(self.profiles.profile(record), abs(record.ebced - ebced)) for record in records]
+
+    def between(self, low: int, high: int, element: Optional[str] = None,
+                match: str = 'dominant') -> List[EsmaProfile]:
+        """Ebced değeri [low, high] aralığındaki esmalar (ebced, sonra tablo sırasıyla)"""
+        records = self.index(element, match).between(low, high)
+        records.sort(key=lambda record: (record.ebced, record.row))
+        return [self.profiles.profile(record) for record in records]
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """Her element ve eşleşme türü için indeksteki esma sayısı"""
+        return {
+            element: {match: len(self._indexes[element, match]) for match in MATCH_MODES}
+            for element in ELEMENTS
+        }
@@ -0,0 +1,148 @@
+"""Kapsamlı analiz sonuçlarından PDF rapor oluşturma
+
+Router'a ve veri tablolarına bağımlı değildir; PDF oluşturma heavy iş havuzunun
+(utils.workers) process'lerinde çalışır, worker'lar sadece bu modülü yükler.
+"""
+from datetime import datetime
+from io import BytesIO
+import os
+
+def create_pdf_report(
+    mother_name: str,
+    child_name: str,
+    disease_name: str,
+    manager_esma_result: dict,
+    personal_manager_result: dict,
+    manager_verse_result: dict,
+    disease_query_result: dict,
+    magic_analysis_result: dict,
+    disease_prone_result: dict
+) -> BytesIO:
+    # reportlab sadece PDF oluşturulurken yüklenir (açılış süresini uzatmasın diye)
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    try:
+        buffer = BytesIO()
+        c = canvas.Canvas(buffer, pagesize=letter)
+        width, height = letter
+
+        # Varsayılan font kullan
+        default_font = "Helvetica"
+        default_font_bold = "Helvetica-Bold"
+        
+        try:
+            # Türkçe font desteği için
+            fonts_dir = os.path.join("static", "fonts")
+            os.makedirs(fonts_dir, exist_ok=True)
+            
+            dejavu_regular = os.path.join(fonts_dir, "DejaVuSans.ttf")
+            dejavu_bold = os.path.join(fonts_dir, "DejaVuSans-Bold.ttf")
+            
+            if os.path.exists(dejavu_regular) and os.path.exists(dejavu_bold):
+                pdfmetrics.registerFont(TTFont('DejaVuSans', dejavu_regular))
+                pdfmetrics.registerFont(TTFont('DejaVuSans-Bold', dejavu_bold))
+                default_font = "DejaVuSans"
+                default_font_bold = "DejaVuSans-Bold"
+        except Exception as e:
+            print(f"Font yükleme hatası, varsayılan font kullanılacak: {str(e)}")
+        
+        # PDF başlığı
+        c.setFont(default_font_bold, 24)
+        c.drawString(50, height - 50, "Kapsamlı Analiz Raporu")
+        c.setFont(default_font, 12)
+        c.drawString(50, height - 70, f"Oluşturulma Tarihi: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
+        
+        # Kişi bilgileri
+        y = height - 100
+        c.setFont(default_font_bold, 14)
+        c.drawString(50, y, "Kişi Bilgileri:")
+        c.setFont(default_font, 12)
+        y -= 20
+        c.drawString(50, y, f"Anne İsmi: {mother_name}")
+        y -= 20
+        c.drawString(50, y, f"Çocuk İsmi: {child_name}")
+        y -= 20
+        c.drawString(50, y, f"Hastalık: {disease_name}")
+
+        def format_result_section(title: str, result: dict, y: int) -> int:
+            y -= 40
+            if y < 50:
+                c.showPage()
+                c.setFont(default_font, 12)
+                y = height - 50
+
+            c.setFont(default_font_bold, 14)
+            c.drawString(50, y, title)
+            c.setFont(default_font, 12)
+            y -= 20
+
+            if isinstance(result, dict) and "error" in result:
+                if result["error"]:
+                    c.setFillColorRGB(0.8, 0, 0)  # Kırmızımsı renk
+                    c.drawString(50, y, f"Hata: {result['error']}")
+                    c.setFillColorRGB(0, 0, 0)  # Siyah renge geri dön
+                    y -= 20
+                return y
+
+            try:
+                if hasattr(result, '__dict__'):
+                    data = result.__dict__
+                elif isinstance(result, dict):
+                    data = result
+                else:
+                    data = {"değer": str(result)}
+
+                for key, value in data.items():
+                    if key.startswith('_') or value is None:
+                        continue
+
+                    # Özel alanları formatla
+                    if isinstance(value, (str, int, float)):
+                        if "arabic" in key.lower():
+                            # Arapça metinler için özel format
+                            c.drawString(50, y, f"{key}: {value}")
+                        elif "ebced" in key.lower():
+                            # Ebced değerleri için özel format
+                            c.drawString(50, y, f"{key}: {value}")
+                        elif "error" in key.lower():
+                            if value:  # Sadece hata varsa göster
+                                c.setFillColorRGB(0.8, 0, 0)
+                                c.drawString(50, y, f"Hata: {value}")
+                                c.setFillColorRGB(0, 0, 0)
+                        else:
+                            # Normal metin
+                            c.drawString(50, y, f"{key}: {value}")
+                        y -= 20
+
+            except Exception as e:
+                print(f"Bölüm formatlamada hata: {str(e)}")
+                c.setFillColorRGB(0.8, 0, 0)
+                c.drawString(50, y, f"Format hatası: {str(e)}")
+                c.setFillColorRGB(0, 0, 0)
+                y -= 20
+
+            return y
+
+        # Her bir analiz sonucunu ekle
+        sections = [
+            ("1. Yönetici Esma Analizi", manager_esma_result),
+            ("2. Kişisel Yönetici Esma Analizi", personal_manager_result),
+            ("3. Yönetici Ayet Analizi", manager_verse_result),
+            ("4. Hastalık Analizi", disease_query_result),
+            ("5. Büyü Analizi", magic_analysis_result),
+            ("6. Hastalığa Yatkınlık Analizi", disease_prone_result)
+        ]
+
+        for title, result in sections:
+            y = format_result_section(title, result, y)
+
+        c.save()
+        buffer.seek(0)
+        return buffer
+
+    except Exception as e:
+        print(f"PDF oluşturmada hata: {str(e)}")
+        raise
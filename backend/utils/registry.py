@@ -0,0 +1,386 @@
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple, Union
+import os
+import threading
+import time
+import pandas as pd
+from utils import dataset
+from utils.element_similarity import ElementSimilarityIndex, esma_similarity_index, verse_similarity_index
+from utils.esma_profiles import EsmaProfileTable
+from utils.esma_query import EsmaQueryEngine
+from utils.store import EsmaStore, NameStore, VerseStore
+from utils.value_index import ValueIndex
+from utils.verse_profiles import VerseProfileTable
+from utils.verse_ranges import VerseRangeIndex
+from utils.word_index import WordIndex
+from utils.verse_resolver import VerseResolver
+from utils.startup import profiler
+
+class Dataset:
+    """Referans tablolarının değişmez bir sürümü; tablolar ilk erişimde yüklenir"""
+
+    def __init__(self, version: int, source, fingerprint: tuple):
+        self.version = version
+        self.source = source
+        self.fingerprint = fingerprint
+        self.created_at = datetime.now().isoformat(timespec='seconds')
+        self._tables: Dict[str, pd.DataFrame] = {}
+        self._locks = {name: threading.Lock() for name in dataset.TABLE_NAMES}
+        self.loads: Dict[str, dict] = {}
+        # Tablolardan türetilen yapılar (istek sırasında kullanılan depolar, indeksler)
+        self._derived: Dict[str, object] = {}
+        self._builders: Dict[str, Callable] = {}
+        self._derived_lock = threading.RLock()
+
+    def is_loaded(self, table_name: str) -> bool:
+        return table_name in self._tables
+
+    def table(self, table_name: str, owner: str = None) -> pd.DataFrame:
+        """Tabloyu döndürür; ilk erişimde kilit altında bir kez yükler"""
+        table = self._tables.get(table_name)
+        if table is not None:
+            return table
+        # Aynı anda gelen istekler tabloyu tek bir kez yükler, diğerleri bekler
+        with self._locks[table_name]:
+            table = self._tables.get(table_name)
+            if table is None:
+                start = time.perf_counter()
+                with profiler.phase(f"data {table_name} (sürüm {self.version})"):
+                    table = self.source.load(table_name)
+                elapsed = (time.perf_counter() - start) * 1000
+                self.loads[table_name] = {
+                    'source': self.source.kind,
+                    'rows': len(table),
+                    'load_ms': round(elapsed, 2),
+                    'first_access_by': owner,
+                }
+                self._tables[table_name] = table
+                print(f"[veri] {table_name} tablosu yüklendi (sürüm {self.version}, {self.source.kind}, "
+                      f"{len(table)} satır, {elapsed:.1f} ms, ilk erişim: {owner})")
+        return table
+
+    def derived(self, key: str, builder: Callable):
+        """Bu sürümün tablolarından türetilen yapıyı döndürür; ilk erişimde bir kez oluşturur"""
+        value = self._derived.get(key)
+        if value is not None:
+            return value
+        # RLock: bir türetilmiş yapı başka birini kullanarak oluşturulabilir
+        with self._derived_lock:
+            value = self._derived.get(key)
+            if value is None:
+                with profiler.phase(f"derive {key} (sürüm {self.version})"):
+                    value = builder(self)
+                self._builders[key] = builder
+                self._derived[key] = value
+        return value
+
+    def derived_keys(self) -> list:
+        return list(self._builders.items())
+
+def _name_store(data: Dataset) -> NameStore:
+    return NameStore.from_frame(data.table('names', 'name_store'), data.version)
+
+def _esma_store(data: Dataset) -> EsmaStore:
+    return EsmaStore.from_frame(data.table('esma', 'esma_store'))
+
+def _esma_profiles(data: Dataset) -> EsmaProfileTable:
+    return EsmaProfileTable(data.derived('esma_store', _esma_store))
+
+def _esma_query(data: Dataset) -> EsmaQueryEngine:
+    return EsmaQueryEngine(data.derived('esma_store', _esma_store), data.derived('esma_profiles', _esma_profiles))
+
+def _verse_store(data: Dataset) -> VerseStore:
+    return VerseStore.from_frame(data.table('quran', 'verse_store'))
+
+def _verse_resolver(data: Dataset) -> VerseResolver:
+    return VerseResolver(data.derived('verse_store', _verse_store))
+
+def _verse_ranges(data: Dataset) -> VerseRangeIndex:
+    return VerseRangeIndex(data.derived('verse_store', _verse_store))
+
+def _word_index(data: Dataset) -> WordIndex:
+    return WordIndex(data.table('quran_words', 'word_index'), data.derived('verse_store', _verse_store))
+
+def _verse_profiles(data: Dataset) -> VerseProfileTable:
+    return VerseProfileTable(data.table('verse_profiles', 'verse_profiles'), data.derived('verse_store', _verse_store))
+
+def _esma_similarity(data: Dataset) -> ElementSimilarityIndex:
+    return esma_similarity_index(data.derived('esma_store', _esma_store), data.derived('esma_profiles', _esma_profiles))
+
+def _verse_similarity(data: Dataset) -> ElementSimilarityIndex:
+    return verse_similarity_index(data.derived('verse_profiles', _verse_profiles))
+
+def _value_index(data: Dataset) -> ValueIndex:
+    return ValueIndex(data.derived('name_store', _name_store), data.derived('esma_store', _esma_store),
+                      data.derived('verse_store', _verse_store))
+
+class TableSet:
+    """Bir router'ın bildirdiği tablolara erişim sağlar; tablolar ilk erişimde yüklenir
+
+    Router'lar DataFrame'lere değil, yükleme sırasında bir kez oluşturulan salt
+    okunur depolara (kayıtlar, indeksler, profiller) erişir.
+    """
+
+    def __init__(self, registry: 'DataRegistry', owner: str, tables: Tuple[str, ...]):
+        self._registry = registry
+        self.owner = owner
+        self.tables = tables
+
+    def derived(self, table_name: Union[str, Tuple[str, ...]], key: str, builder: Callable):
+        """Bildirilen tablo(lar)dan türetilen, veri seti sürümüne bağlı yapıyı döndürür"""
+        table_names = (table_name,) if isinstance(table_name, str) else table_name
+        for name in table_names:
+            if name not in self.tables:
+                raise RuntimeError(f"{self.owner} '{name}' tablosunu bildirmeden kullanamaz")
+        return self._registry.derived(table_names, key, builder, self.owner)
+
+    @property
+    def names(self) -> NameStore:
+        return self.derived('names', 'name_store', _name_store)
+
+    @property
+    def esmas(self) -> EsmaStore:
+        return self.derived('esma', 'esma_store', _esma_store)
+
+    @property
+    def esma_profiles(self) -> EsmaProfileTable:
+        return self.derived('esma', 'esma_profiles', _esma_profiles)
+
+    @property
+    def esma_query(self) -> EsmaQueryEngine:
+        return self.derived('esma', 'esma_query', _esma_query)
+
+    @property
+    def verses(self) -> VerseStore:
+        return self.derived('quran', 'verse_store', _verse_store)
+
+    @property
+    def verse_resolver(self) -> VerseResolver:
+        return self.derived('quran', 'verse_resolver', _verse_resolver)
+
+    @property
+    def verse_ranges(self) -> VerseRangeIndex:
+        return self.derived('quran', 'verse_ranges', _verse_ranges)
+
+    @property
+    def words(self) -> WordIndex:
+        return self.derived(('quran', 'quran_words'), 'word_index', _word_index)
+
+    @property
+    def verse_profiles(self) -> VerseProfileTable:
+        return self.derived(('quran', 'verse_profiles'), 'verse_profiles', _verse_profiles)
+
+    @property
+    def esma_similarity(self) -> ElementSimilarityIndex:
+        return self.derived('esma', 'esma_similarity', _esma_similarity)
+
+    @property
+    def verse_similarity(self) -> ElementSimilarityIndex:
+        return self.derived(('quran', 'verse_profiles'), 'verse_similarity', _verse_similarity)
+
+    @property
+    def value_index(self) -> ValueIndex:
+        return self.derived(('names', 'esma', 'quran'), 'value_index', _value_index)
+
+def source_fingerprint(paths: Tuple[str, ...]) -> tuple:
+    """Kaynak dosyaların boyut ve değişiklik zamanlarından oluşan parmak izi"""
+    fingerprint = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            fingerprint.append((path, stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            fingerprint.append((path, None, None))
+    return tuple(fingerprint)
+
+# İstek başında sabitlenen veri seti; istek boyunca tüm router'lar aynı sürümü görür
+_pinned: ContextVar[Optional[Dataset]] = ContextVar('pinned_dataset', default=None)
+
+class DataRegistry:
+    """Referans tablolarının güncel sürümünü tutan, yeniden yükleyen ve erişimleri raporlayan kayıt defteri"""
+
+    def __init__(self, open_source: Callable = dataset.open_source,
+                 watch_paths: Tuple[str, ...] = (dataset.DATA_XLSX_PATH, dataset.LETTER_JSON_PATH, dataset.SNAPSHOT_PATH)):
+        self._open_source = open_source
+        self._watch_paths = watch_paths
+        self._current: Optional[Dataset] = None
+        self._version = 0
+        self._init_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._version_lock = threading.Lock()
+        self._declared: Dict[str, Tuple[str, ...]] = {}
+        self._touched_by: Dict[str, set] = {name: set() for name in dataset.TABLE_NAMES}
+        self._reloads = []
+        self._watcher: Optional[threading.Thread] = None
+        self._started_at = time.perf_counter()
+
+    def bind(self, owner: str, *tables: str) -> TableSet:
+        """Router'ın ihtiyaç duyduğu tabloları kaydeder ve erişim nesnesini döndürür"""
+        unknown = [name for name in tables if name not in dataset.TABLE_NAMES]
+        if unknown:
+            raise ValueError(f"Bilinmeyen tablo: {', '.join(unknown)}")
+        self._declared[owner] = tables
+        return TableSet(self, owner, tables)
+
+    def _build(self) -> Dataset:
+        # Sürüm numarası kendi kilidiyle alınır; kaynak açılırken hiçbir kilit tutulmaz
+        with self._version_lock:
+            self._version += 1
+            version = self._version
+        with profiler.phase(f"data source open (sürüm {version})"):
+            source = self._open_source()
+        # Parmak izi kaynak açıldıktan sonra alınır; Excel'den okunurken yazılan
+        # snapshot yeni bir yeniden yükleme tetiklemez
+        return Dataset(version, source, source_fingerprint(self._watch_paths))
+
+    def current(self) -> Dataset:
+        """İsteğe sabitlenmiş veri setini, yoksa güncel veri setini döndürür"""
+        pinned = _pinned.get()
+        if pinned is not None:
+            return pinned
+        if self._current is None:
+            with self._init_lock:
+                if self._current is None:
+                    self._current = self._build()
+        return self._current
+
+    def table(self, table_name: str, owner: str = None) -> pd.DataFrame:
+        if owner is not None:
+            self._touched_by[table_name].add(owner)
+        return self.current().table(table_name, owner)
+
+    def derived(self, table_name: Union[str, Tuple[str, ...]], key: str, builder: Callable, owner: str = None):
+        if owner is not None:
+            for name in ((table_name,) if isinstance(table_name, str) else table_name):
+                self._touched_by[name].add(owner)
+        return self.current().derived(key, builder)
+
+    def preload(self):
+        """Tüm tabloları önceden yükler (uzun süre çalışan sunucular için)"""
+        for table_name in dataset.TABLE_NAMES:
+            self.table(table_name, 'preload')
+
+    def reload(self, reason: str = 'manual') -> Optional[Dataset]:
+        """Yeni veri setini oluşturup güncel sürümle atomik olarak değiştirir
+
+        Eski sürümde yüklü olan tablolar değişimden önce yeni sürümde de yüklenir,
+        böylece değişimden sonra gelen istekler yükleme beklemez. Devam eden
+        istekler sabitledikleri eski sürümle tamamlanır. Başka bir yeniden yükleme
+        sürüyorsa None döner.
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            return None
+        try:
+            start = time.perf_counter()
+            old = self._current
+            # Yeni sürüm kilit dışında oluşturulur; yavaş bir Excel okuması sürerken ilk
+            # erişimler (_init_lock) beklemez
+            new = self._build()
+            for table_name in dataset.TABLE_NAMES:
+                if old is not None and old.is_loaded(table_name):
+                    new.table(table_name, 'reload')
+            if old is not None:
+                for key, builder in old.derived_keys():
+                    new.derived(key, builder)
+            # Tek bir atama ile değişim: yeni istekler bundan sonra yeni sürümü görür
+            with self._init_lock:
+                self._current = new
+            elapsed = (time.perf_counter() - start) * 1000
+            self._reloads.append({
+                'version': new.version,
+                'reason': reason,
+                'source': new.source.kind,
+                'at': new.created_at,
+                'build_ms': round(elapsed, 2),
+            })
+            del self._reloads[:-20]
+            print(f"[veri] Veri seti yeniden yüklendi: sürüm {new.version} ({reason}, {elapsed:.1f} ms)")
+            return new
+        except Exception as e:
+            # Yeni sürüm oluşturulamazsa eski sürüm kullanılmaya devam eder
+            print(f"[veri] Yeniden yükleme başarısız, sürüm {self._current.version if self._current else '-'} "
+                  f"kullanılmaya devam ediliyor: {str(e)}")
+            raise
+        finally:
+            self._reload_lock.release()
+
+    def reload_in_background(self, reason: str = 'manual') -> bool:
+        """Yeniden yüklemeyi arka plan thread'inde başlatır; zaten sürüyorsa False döner"""
+        if self._reload_lock.locked():
+            return False
+
+        def run():
+            try:
+                self.reload(reason)
+            except Exception:
+                pass
+
+        threading.Thread(target=run, name='dataset-reload', daemon=True).start()
+        return True
+
+    def is_stale(self) -> bool:
+        """İzlenen dosyalar güncel sürüm oluşturulduktan sonra değiştiyse True"""
+        current = self._current
+        return current is not None and source_fingerprint(self._watch_paths) != current.fingerprint
+
+    def start_watcher(self, interval: float):
+        """Veri dosyalarını belirtilen aralıkla kontrol edip değiştiyse yeniden yükler"""
+        if self._watcher is not None:
+            return
+
+        def watch():
+            while True:
+                time.sleep(interval)
+                try:
+                    if self.is_stale():
+                        self.reload('file-change')
+                except Exception:
+                    pass
+
+        self._watcher = threading.Thread(target=watch, name='dataset-watcher', daemon=True)
+        self._watcher.start()
+        print(f"[veri] Veri dosyaları {interval:g} saniyede bir izleniyor.")
+
+    def report(self) -> dict:
+        """Bu süreçte hangi tabloların yüklendiğini ve kimlerin eriştiğini döndürür"""
+        current = self._current
+        loads = current.loads if current is not None else {}
+        return {
+            'version': current.version if current is not None else None,
+            'source': current.source.kind if current is not None else None,
+            'created_at': current.created_at if current is not None else None,
+            'reloading': self._reload_lock.locked(),
+            'uptime_seconds': round(time.perf_counter() - self._started_at, 3),
+            'tables': {
+                name: {
+                    'loaded': current is not None and current.is_loaded(name),
+                    **loads.get(name, {}),
+                    'touched_by': sorted(self._touched_by[name]),
+                }
+                for name in dataset.TABLE_NAMES
+            },
+            'derived': sorted(current._derived) if current is not None else [],
+            'declared': {owner: list(tables) for owner, tables in self._declared.items()},
+            'reloads': list(self._reloads),
+        }
+
+registry = DataRegistry()
+
+class DatasetPinMiddleware:
+    """Her HTTP isteğini başladığı andaki veri seti sürümüne sabitler"""
+
+    def __init__(self, app, registry: DataRegistry = registry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        # Veri seti henüz oluşturulmadıysa sabitleme yapılmaz; ilk erişim oluşturur
+        token = _pinned.set(self.registry._current)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _pinned.reset(token)
@@ -0,0 +1,223 @@
+"""Çok worker'lı dağıtımlar için snapshot'ın bellek eşlemeli (mmap) okunması
+
+DATASET_MODE=mmap ile etkinleşir. Snapshot'ı tek bir süreç oluşturur (dosya kilidi
+ile), tüm worker'lar aynı dosyayı salt okunur eşler. Kuran tablosunun metin
+kolonları kopyalanmadan, eşlenen sayfalardan satır satır çözülür; işletim sistemi
+bu sayfaları worker'lar arasında paylaştığı için metinler bellekte tek kez bulunur.
+"""
+from contextlib import contextmanager
+from typing import Optional
+import hashlib
+import mmap
+import numbers
+import os
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import ExtensionArray, ExtensionDtype
+from pandas.api.indexers import check_array_indexer
+from utils import dataset
+
+try:
+    import fcntl
+except ImportError:  # Windows: kilit olmadan devam edilir
+    fcntl = None
+
+# Metin kolonları eşlenen tablolar; isim ve esma tabloları küçük olduğu ve
+# router'larda .str işlemleriyle kullanıldığı için normal şekilde çözülür
+MAPPED_STRING_TABLES = ('quran',)
+
+
+class MappedStringDtype(ExtensionDtype):
+    """Bellek eşlemeli metin kolonu tipi; eksik değerler NaN olarak döner"""
+    name = 'mapped_string'
+    type = str
+    kind = 'O'
+    na_value = np.nan
+
+    @classmethod
+    def construct_array_type(cls):
+        return MappedStringArray
+
+
+class MappedStringArray(ExtensionArray):
+    """NUL ile sonlandırılmış UTF-8 bloğu üzerinde kopyasız metin dizisi
+
+    Blok ve ofsetler snapshot dosyasına eşlenmiş tamponlardır; filtreleme ve
+    seçim işlemleri sadece satır indekslerini kopyalar, metinler erişildiği anda
+    çözülür. -1 indeksi eksik değeri temsil eder.
+    """
+
+    def __init__(self, data, offsets: np.ndarray, valid: Optional[np.ndarray], rows: np.ndarray):
+        self._data = data
+        self._offsets = offsets
+        self._valid = valid
+        self._rows = rows
+
+    @classmethod
+    def from_buffers(cls, data, offsets: np.ndarray, valid: Optional[np.ndarray] = None) -> 'MappedStringArray':
+        return cls(data, offsets, valid, np.arange(len(offsets) - 1, dtype=np.int64))
+
+    @classmethod
+    def _from_sequence(cls, scalars, dtype=None, copy=False) -> 'MappedStringArray':
+        # Eşlenmemiş değerlerden (birleştirme, factorize vb.) bellekte blok oluşturulur
+        encoded = []
+        valid = np.ones(len(scalars), dtype=np.uint8)
+        for i, value in enumerate(scalars):
+            if isinstance(value, str):
+                encoded.append(value.encode('utf-8'))
+            else:
+                encoded.append(b'')
+                valid[i] = 0
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) + 1 for b in encoded], out=offsets[1:])
+        data = b''.join(b + b'\0' for b in encoded)
+        return cls.from_buffers(data, offsets, valid)
+
+    @classmethod
+    def _from_factorized(cls, values, original) -> 'MappedStringArray':
+        return cls._from_sequence(values)
+
+    @property
+    def dtype(self) -> MappedStringDtype:
+        return MappedStringDtype()
+
+    @property
+    def nbytes(self) -> int:
+        # Eşlenen blok paylaşıldığı için sadece bu sürece ait satır indeksleri sayılır
+        return self._rows.nbytes
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _value(self, row: int):
+        if row < 0 or (self._valid is not None and not self._valid[row]):
+            return np.nan
+        start = self._offsets[row]
+        end = self._offsets[row + 1] - 1
+        return bytes(self._data[start:end]).decode('utf-8')
+
+    def __getitem__(self, item):
+        if isinstance(item, numbers.Integral):
+            return self._value(self._rows[item])
+        item = check_array_indexer(self, item)
+        return type(self)(self._data, self._offsets, self._valid, self._rows[item])
+
+    def __array__(self, dtype=None):
+        return np.array([self._value(row) for row in self._rows], dtype=object)
+
+    def __eq__(self, other):
+        return np.asarray(self) == other
+
+    def isna(self) -> np.ndarray:
+        if self._valid is None:
+            return self._rows < 0
+        return (self._rows < 0) | (self._valid[self._rows.clip(min=0)] == 0)
+
+    def take(self, indices, allow_fill=False, fill_value=None) -> 'MappedStringArray':
+        indices = np.asarray(indices, dtype=np.int64)
+        if allow_fill:
+            if fill_value is not None and not pd.isna(fill_value):
+                return self._from_sequence(
+                    pd.api.extensions.take(np.asarray(self), indices, allow_fill=True, fill_value=fill_value)
+                )
+            rows = np.where(indices == -1, -1, self._rows[indices.clip(min=0)])
+        else:
+            rows = self._rows[indices]
+        return type(self)(self._data, self._offsets, self._valid, rows)
+
+    def copy(self) -> 'MappedStringArray':
+        # Tamponlar salt okunur olduğundan paylaşılabilir
+        return type(self)(self._data, self._offsets, self._valid, self._rows.copy())
+
+    def _values_for_factorize(self):
+        return np.asarray(self), np.nan
+
+    @classmethod
+    def _concat_same_type(cls, to_concat) -> 'MappedStringArray':
+        first = to_concat[0]
+        if all(array._data is first._data for array in to_concat):
+            rows = np.concatenate([array._rows for array in to_concat])
+            return cls(first._data, first._offsets, first._valid, rows)
+        return cls._from_sequence(np.concatenate([np.asarray(array) for array in to_concat]))
+
+
+def _mapped_column(payload, column: dict, rows: int):
+    """Metin kolonlarını eşlenen tampon üzerinde, sayısal kolonları mümkünse kopyasız döndürür"""
+    buffers = column['buffers']
+    if column['kind'] != 'str':
+        return dataset._decode_column(payload, column, rows)
+    offset, size = buffers['data']
+    valid = dataset._buffer(payload, buffers['valid'], np.uint8) if 'valid' in buffers else None
+    return MappedStringArray.from_buffers(
+        payload[offset:offset + size],
+        dataset._buffer(payload, buffers['offsets'], np.int64),
+        valid,
+    )
+
+
+@contextmanager
+def build_lock(path: str):
+    """Snapshot'ı aynı anda yalnızca bir sürecin oluşturmasını sağlar"""
+    if fcntl is None:
+        yield
+        return
+    with open(path + '.lock', 'a+') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def ensure_snapshot(xlsx_path: str = dataset.DATA_XLSX_PATH, snapshot_path: str = dataset.SNAPSHOT_PATH):
+    """Snapshot yoksa veya bayatsa kilit altında bir kez oluşturur"""
+    with build_lock(snapshot_path):
+        if os.path.exists(snapshot_path):
+            try:
+                header, _ = dataset.read_snapshot_header(snapshot_path)
+                if not dataset.is_snapshot_stale(header, dataset.source_paths(xlsx_path)):
+                    return
+            except (dataset.SnapshotError, ValueError, KeyError):
+                pass
+        print(f"Paylaşımlı snapshot oluşturuluyor (pid {os.getpid()})...")
+        tables = dataset.load_tables_from_excel(xlsx_path)
+        dataset.write_snapshot(tables, snapshot_path, dataset.source_paths(xlsx_path))
+
+
+class MappedSnapshotSource:
+    """Snapshot dosyasını salt okunur eşler ve tabloları eşlenen tamponlardan oluşturur"""
+    kind = 'mmap'
+
+    def __init__(self, path: str = dataset.SNAPSHOT_PATH, verify: bool = True):
+        self.path = path
+        self.header, payload_offset = dataset.read_snapshot_header(path)
+        with open(path, 'rb') as f:
+            # Dosya kapatılsa da eşleme açık kalır; snapshot os.replace ile
+            # değiştirildiğinde eski eşleme eski dosyayı göstermeye devam eder
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.payload = memoryview(self._mmap)[payload_offset:]
+        if len(self.payload) != self.header['payload_size']:
+            raise dataset.SnapshotError("Snapshot payload boyutu uyumsuz")
+        if verify and hashlib.sha256(self.payload).hexdigest() != self.header['payload_sha256']:
+            raise dataset.SnapshotError("Snapshot checksum doğrulaması başarısız")
+
+    def load(self, table_name: str) -> pd.DataFrame:
+        if table_name not in MAPPED_STRING_TABLES:
+            return dataset.tables_from_payload(self.header, self.payload, [table_name])[table_name]
+        table = self.header['tables'][table_name]
+        rows = table['rows']
+        index = dataset._buffer(self.payload, table['index'], np.int64)
+        index = pd.RangeIndex(rows) if np.array_equal(index, np.arange(rows)) else pd.Index(index.copy())
+        return pd.DataFrame(
+            {column['name']: _mapped_column(self.payload, column, rows) for column in table['columns']},
+            index=index,
+        )
+
+
+def open_mapped_source(xlsx_path: str = dataset.DATA_XLSX_PATH,
+                       snapshot_path: str = dataset.SNAPSHOT_PATH) -> MappedSnapshotSource:
+    """Gerekirse snapshot'ı oluşturur ve bellek eşlemeli kaynak olarak açar"""
+    ensure_snapshot(xlsx_path, snapshot_path)
+    source = MappedSnapshotSource(snapshot_path)
+    print(f"Snapshot bellek eşlemeli açıldı ({source.header['created_at']}, pid {os.getpid()})")
+    return source
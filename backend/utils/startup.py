@@ -0,0 +1,154 @@
+"""Açılış (import) aşamalarının süre, CPU ve bellek ölçümü
+
+main.py her aşamayı profiler.phase() ile sarar; router modüllerinin importları
+track_imports() ile ayrı ayrı ölçülür. Sonuç /debug/startup endpoint'inden ve
+`python main.py --startup-report` komutundan görülebilir.
+"""
+from contextlib import contextmanager
+from importlib.abc import MetaPathFinder
+from typing import List, Optional
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+def current_rss_kb() -> Optional[int]:
+    """Sürecin anlık RSS değerini KB cinsinden döndürür"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is not None:
+        # /proc olmayan sistemlerde en yüksek RSS değeri kullanılır (macOS'ta bayt)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == 'darwin' else peak
+    return None
+
+class StartupProfiler:
+    """Açılış aşamalarını sırasıyla kaydeder"""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        # Bu modül import edilene kadar harcanan CPU (yorumlayıcı açılışı vb.)
+        self.cpu_before_start_ms = round(time.process_time() * 1000, 2)
+        self.rss_at_start_kb = current_rss_kb()
+        self.phases: List[dict] = []
+        self.finished_at: Optional[float] = None
+        self._depth = 0
+
+    @contextmanager
+    def phase(self, name: str):
+        """Bloğun duvar saati süresini, CPU süresini ve RSS değişimini kaydeder"""
+        entry = {
+            'name': name,
+            'depth': self._depth,
+            'after_startup': self.finished_at is not None,
+            'offset_ms': round((time.perf_counter() - self.started_at) * 1000, 2),
+        }
+        # Aşamalar tamamlanma sırasına göre değil başlama sırasına göre listelenir
+        self.phases.append(entry)
+        rss_before = current_rss_kb()
+        cpu_before = time.process_time()
+        wall_before = time.perf_counter()
+        self._depth += 1
+        try:
+            yield entry
+        finally:
+            self._depth -= 1
+            entry['wall_ms'] = round((time.perf_counter() - wall_before) * 1000, 2)
+            entry['cpu_ms'] = round((time.process_time() - cpu_before) * 1000, 2)
+            rss_after = current_rss_kb()
+            entry['rss_delta_kb'] = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+
+    def finish(self):
+        """Açılışın bittiğini işaretler; sonraki aşamalar (tembel yüklemeler) ayrıca gösterilir"""
+        if self.finished_at is None:
+            self.finished_at = time.perf_counter()
+
+    def report(self) -> dict:
+        total = (self.finished_at or time.perf_counter()) - self.started_at
+        rss = current_rss_kb()
+        return {
+            'finished': self.finished_at is not None,
+            'total_ms': round(total * 1000, 2),
+            'cpu_before_start_ms': self.cpu_before_start_ms,
+            'rss_at_start_kb': self.rss_at_start_kb,
+            'rss_now_kb': rss,
+            'phases': [dict(phase) for phase in self.phases],
+        }
+
+    def format_table(self) -> str:
+        report = self.report()
+        lines = [
+            f"{'Aşama':<48} {'Başlangıç':>10} {'Süre ms':>10} {'CPU ms':>10} {'RSS Δ KB':>10}",
+            '-' * 92,
+        ]
+        startup_done = False
+        for phase in report['phases']:
+            if phase['after_startup'] and not startup_done:
+                lines.append('-- açılış sonrası --')
+                startup_done = True
+            name = '  ' * phase['depth'] + phase['name']
+            rss = phase.get('rss_delta_kb')
+            lines.append(
+                f"{name:<48} {phase['offset_ms']:>10.1f} {phase.get('wall_ms', 0):>10.1f} "
+                f"{phase.get('cpu_ms', 0):>10.1f} {rss if rss is not None else '-':>10}"
+            )
+        lines.append('-' * 92)
+        lines.append(f"Toplam açılış: {report['total_ms']:.1f} ms "
+                     f"(profiler öncesi CPU: {report['cpu_before_start_ms']:.1f} ms, "
+                     f"RSS: {report['rss_at_start_kb']} -> {report['rss_now_kb']} KB)")
+        return '\n'.join(lines)
+
+profiler = StartupProfiler()
+
+class _TimedLoader:
+    """Modül yükleyicisini sarar ve modülün çalıştırılmasını bir aşama olarak kaydeder"""
+
+    def __init__(self, loader, name: str):
+        self._loader = loader
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        with profiler.phase(f"import {self._name}"):
+            self._loader.exec_module(module)
+
+class _ImportTracker(MetaPathFinder):
+    """Belirtilen paketlerin modül importlarını ölçer"""
+
+    def __init__(self, prefixes):
+        self.prefixes = tuple(prefixes)
+
+    def find_spec(self, fullname, path, target=None):
+        if not fullname.startswith(self.prefixes):
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = _TimedLoader(spec.loader, fullname)
+                return spec
+        return None
+
+@contextmanager
+def track_imports(*prefixes: str):
+    """Blok içinde import edilen, verilen önekle başlayan modülleri ayrı aşamalar olarak ölçer"""
+    tracker = _ImportTracker(prefixes)
+    sys.meta_path.insert(0, tracker)
+    try:
+        yield
+    finally:
+        sys.meta_path.remove(tracker)
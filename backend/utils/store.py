@@ -0,0 +1,366 @@
+"""İstek sırasında kullanılan pandas'sız referans veri deposu
+
+Tablolar her veri seti sürümü için bir kez düz Python kayıtlarına (__slots__)
+dönüştürülür; isim, esma ve ayet aramaları sözlükler ve listeler üzerinden
+yapılır. pandas sadece tabloların okunması ve dönüştürülmesi sırasında gerekir.
+"""
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Sequence, Tuple
+import math
+
+def is_missing(value) -> bool:
+    """Değer boş mu (None veya NaN)"""
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+def turkish_casefold(text: str) -> str:
+    """Türkçe kurallarıyla küçük harfe çevirir (I -> ı, İ -> i)"""
+    return text.replace('I', 'ı').replace('İ', 'i').lower()
+
+def _column(df, name: str) -> list:
+    # tolist() numpy skalerlerini Python int/float/str değerlerine çevirir
+    return df[name].tolist()
+
+def _text_column(df, name: str):
+    """Metin kolonu; bellek eşlemeli kolonlar kopyalanmadan olduğu gibi kullanılır"""
+    array = df[name].array
+    if getattr(array.dtype, 'name', None) == 'mapped_string':
+        return array
+    return df[name].tolist()
+
+def _ebced_value(value):
+    """Tam sayı ebced değerlerini int'e çevirir (Excel'den float gelir); eksik değerler olduğu gibi kalır"""
+    if isinstance(value, float) and not math.isnan(value) and value.is_integer():
+        return int(value)
+    return value
+
+class FrozenRecord:
+    """Oluşturulduktan sonra değiştirilemeyen kayıt
+
+    Kayıtlar tüm isteklerin ve worker thread'lerinin paylaştığı tablolardır; bir
+    handler'ın yanlışlıkla yazması diğer istekleri etkilememesi için engellenir.
+    """
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} salt okunurdur ('{name}' değiştirilemez)")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} salt okunurdur ('{name}' silinemez)")
+
+_set = object.__setattr__
+
+class NameRecord(FrozenRecord):
+    __slots__ = ('name', 'arabic', 'ebced', 'gender')
+
+    def __init__(self, name, arabic, ebced, gender):
+        _set(self, 'name', name)
+        _set(self, 'arabic', arabic)
+        _set(self, 'ebced', ebced)
+        _set(self, 'gender', gender)
+
+class EsmaRecord(FrozenRecord):
+    __slots__ = ('no', 'ebced', 'esma', 'arabic', 'meaning', 'row')
+
+    def __init__(self, no, ebced, esma, arabic, meaning, row: int = 0):
+        _set(self, 'no', no)
+        _set(self, 'ebced', ebced)
+        _set(self, 'esma', esma)
+        _set(self, 'arabic', arabic)
+        _set(self, 'meaning', meaning)
+        # Tablodaki sırası; eşit ebcedli esmalarda tablo sırası korunur
+        _set(self, 'row', row)
+
+    @property
+    def is_complete(self) -> bool:
+        """Ebced, isim, Arapça yazılış ve anlamın hepsi dolu mu"""
+        return not any(is_missing(value) for value in (self.ebced, self.esma, self.arabic, self.meaning))
+
+class VerseTexts(FrozenRecord):
+    """Ayet metin kolonları; bellek eşlemeli modda metinler erişildikçe çözülür"""
+    __slots__ = ('surah_name', 'arabic_text', 'turkish_meaning')
+
+    def __init__(self, surah_name, arabic_text, turkish_meaning):
+        # Liste kolonlar demete çevrilir; eşlenen kolonlar zaten salt okunurdur
+        _set(self, 'surah_name', tuple(surah_name) if isinstance(surah_name, list) else surah_name)
+        _set(self, 'arabic_text', tuple(arabic_text) if isinstance(arabic_text, list) else arabic_text)
+        _set(self, 'turkish_meaning', tuple(turkish_meaning) if isinstance(turkish_meaning, list) else turkish_meaning)
+
+class VerseRecord(FrozenRecord):
+    __slots__ = ('surah_number', 'verse_number', 'verse_ebced', 'row', '_texts')
+
+    def __init__(self, surah_number, verse_number, verse_ebced, row: int, texts: VerseTexts):
+        _set(self, 'surah_number', surah_number)
+        _set(self, 'verse_number', verse_number)
+        _set(self, 'verse_ebced', verse_ebced)
+        _set(self, 'row', row)
+        _set(self, '_texts', texts)
+
+    @property
+    def surah_name(self):
+        return self._texts.surah_name[self.row]
+
+    @property
+    def arabic_text(self):
+        return self._texts.arabic_text[self.row]
+
+    @property
+    def turkish_meaning(self):
+        return self._texts.turkish_meaning[self.row]
+
+class NameStore:
+    """İsim indeksi: isim -> (Arapça, ebced, cinsiyet) kaydı, O(1) arama
+
+    Her isim iki anahtarla indekslenir: eski davranışı koruyan str.lower() anahtarı
+    ve Türkçe büyük/küçük harf kurallarına uyan anahtar (I -> ı, İ -> i).
+    """
+
+    def __init__(self, records: List[NameRecord], version: Optional[int] = None):
+        self.records = tuple(records)
+        # Kaydın geldiği veri seti sürümü (önbellek anahtarlarında kullanılır)
+        self.version = version
+        self._by_lower: Dict[str, NameRecord] = {}
+        self._by_fold: Dict[str, NameRecord] = {}
+        for record in self.records:
+            if isinstance(record.name, str):
+                # Aynı isim birden fazla kez varsa tablodaki ilk kayıt kullanılır
+                self._by_lower.setdefault(record.name.lower(), record)
+                self._by_fold.setdefault(turkish_casefold(record.name), record)
+
+    @classmethod
+    def from_frame(cls, df, version: Optional[int] = None) -> 'NameStore':
+        return cls([
+            NameRecord(*values)
+            for values in zip(_column(df, 'name'), _column(df, 'arabic'), _column(df, 'ebced'), _column(df, 'gender'))
+        ], version)
+
+    def find(self, name: str) -> Optional[NameRecord]:
+        """İsmin kaydını döndürür; önce str.lower(), sonra Türkçe küçük harf anahtarıyla arar"""
+        name = name.strip()
+        record = self._by_lower.get(name.lower())
+        if record is None:
+            record = self._by_fold.get(turkish_casefold(name))
+        return record
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+class EsmaIndex:
+    """Esmaların ebced değerine göre sıralı indeksi; aramalar bisect ile O(log n)
+
+    Aynı ebced değerine sahip esmalar tek grupta, tablo sırasıyla tutulur.
+    """
+
+    def __init__(self, records: Sequence[EsmaRecord]):
+        self.records = tuple(records)
+        # Sıralama kararlı olduğu için eşit değerler tablo sırasında kalır
+        self.values = []
+        groups: List[List[EsmaRecord]] = []
+        for record in sorted(self.records, key=lambda record: record.ebced):
+            if self.values and self.values[-1] == record.ebced:
+                groups[-1].append(record)
+            else:
+                self.values.append(record.ebced)
+                groups.append([record])
+        self.values: Tuple[float, ...] = tuple(self.values)
+        self.groups: Tuple[Tuple[EsmaRecord, ...], ...] = tuple(tuple(group) for group in groups)
+
+    def exact(self, ebced) -> Tuple[EsmaRecord, ...]:
+        """Ebced değeri tam eşleşen esmalar"""
+        i = bisect_left(self.values, ebced)
+        if i < len(self.values) and self.values[i] == ebced:
+            return self.groups[i]
+        return ()
+
+    def lower(self, ebced) -> Tuple[EsmaRecord, ...]:
+        """Ebced değerinden küçük en büyük değere sahip esmalar"""
+        i = bisect_left(self.values, ebced)
+        return self.groups[i - 1] if i > 0 else ()
+
+    def upper(self, ebced) -> Tuple[EsmaRecord, ...]:
+        """Ebced değerinden büyük en küçük değere sahip esmalar"""
+        i = bisect_right(self.values, ebced)
+        return self.groups[i] if i < len(self.values) else ()
+
+    def nearest(self, ebced) -> List[EsmaRecord]:
+        """Ebced farkı en küçük olan tüm esmalar (iki yönde eşit farkta ikisi de, tablo sırasıyla)"""
+        exact = self.exact(ebced)
+        if exact:
+            return list(exact)
+        lower, upper = self.lower(ebced), self.upper(ebced)
+        if not lower or not upper:
+            return list(lower or upper)
+        lower_difference = ebced - lower[0].ebced
+        upper_difference = upper[0].ebced - ebced
+        if lower_difference < upper_difference:
+            return list(lower)
+        if upper_difference < lower_difference:
+            return list(upper)
+        return sorted(lower + upper, key=lambda record: record.row)
+
+    def k_nearest(self, ebced, k: int) -> List[EsmaRecord]:
+        """Ebced farkına göre en yakın k esma (eşit farkta tablo sırası)"""
+        result: List[EsmaRecord] = []
+        left = bisect_left(self.values, ebced) - 1
+        right = left + 1
+        while len(result) < k and (left >= 0 or right < len(self.values)):
+            left_difference = ebced - self.values[left] if left >= 0 else None
+            right_difference = self.values[right] - ebced if right < len(self.values) else None
+            if right_difference is None or (left_difference is not None and left_difference < right_difference):
+                result.extend(self.groups[left])
+                left -= 1
+            elif left_difference is None or right_difference < left_difference:
+                result.extend(self.groups[right])
+                right += 1
+            else:
+                result.extend(sorted(self.groups[left] + self.groups[right], key=lambda record: record.row))
+                left -= 1
+                right += 1
+        return result[:k]
+
+    def between(self, low, high) -> List[EsmaRecord]:
+        """Ebced değeri [low, high] aralığındaki esmalar (tablo sırasıyla)"""
+        start = bisect_left(self.values, low)
+        end = bisect_right(self.values, high)
+        records = [record for group in self.groups[start:end] for record in group]
+        return sorted(records, key=lambda record: record.row)
+
+    def within(self, ebced, tolerance) -> List[EsmaRecord]:
+        """Ebced farkı tolerans içinde kalan esmalar (tablo sırasıyla)"""
+        return self.between(ebced - tolerance, ebced + tolerance)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+class EsmaStore:
+    """Esmaları tablo sırasıyla ve ebced indeksleriyle tutar"""
+
+    def __init__(self, records: List[EsmaRecord]):
+        self.records = tuple(records)
+        # Ebced değeri olan esmalar (to_numeric + dropna(subset=['ebced']) karşılığı)
+        self.with_ebced = tuple(record for record in self.records if not is_missing(record.ebced))
+        # Tüm alanları dolu esmalar (dropna(subset=['ebced', 'esma', 'arabic', 'meaning']) karşılığı)
+        self.complete = tuple(record for record in self.records if record.is_complete)
+        self.index = EsmaIndex(self.with_ebced)
+        self.complete_index = EsmaIndex(self.complete)
+
+    @classmethod
+    def from_frame(cls, df) -> 'EsmaStore':
+        no = _column(df, 'no') if 'no' in df.columns else [None] * len(df)
+        return cls([
+            EsmaRecord(no, _ebced_value(ebced), esma, arabic, meaning, row=row)
+            for row, (no, ebced, esma, arabic, meaning) in enumerate(zip(
+                no, _column(df, 'ebced'), _column(df, 'esma'), _column(df, 'arabic'), _column(df, 'meaning')
+            ))
+        ])
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+class VerseStore:
+    """Ayetleri (sure, ayet) anahtarıyla ve sure bazında tutar
+
+    Tablo sure/ayet sırasındaysa ve her sure 1. ayetten boşluksuz devam ediyorsa
+    (Kuran tablosu böyledir) aramalar yoğun sure tablolarıyla yapılır:
+    kayıt = records[surah_offsets[sure] + ayet - 1]. Bu düzene uymayan tablolarda
+    sözlük indeksine düşülür; sonuçlar iki durumda da aynıdır.
+    """
+
+    def __init__(self, records: List[VerseRecord]):
+        self.records = tuple(records)
+        self.dense = self._is_dense(self.records)
+        if self.dense:
+            surah_count = self.records[-1].surah_number if self.records else 0
+            # Sure numarasıyla indekslenen tablolar (0. eleman kullanılmaz)
+            offsets = [0] * (surah_count + 2)
+            for row, record in enumerate(self.records):
+                if record.verse_number == 1:
+                    offsets[record.surah_number] = row
+            offsets[surah_count + 1] = len(self.records)
+            self.surah_offsets: Tuple[int, ...] = tuple(offsets)
+            self.surah_counts: Tuple[int, ...] = (0,) + tuple(
+                offsets[s + 1] - offsets[s] for s in range(1, surah_count + 1)
+            )
+            self.surah_names: Tuple = (None,) + tuple(
+                self.records[offsets[s]].surah_name for s in range(1, surah_count + 1)
+            )
+            self._surahs = ((),) + tuple(
+                self.records[offsets[s]:offsets[s + 1]] for s in range(1, surah_count + 1)
+            )
+        else:
+            by_key: Dict[Tuple[int, int], List[VerseRecord]] = {}
+            by_surah: Dict[int, List[VerseRecord]] = {}
+            for record in self.records:
+                by_key.setdefault((record.surah_number, record.verse_number), []).append(record)
+                by_surah.setdefault(record.surah_number, []).append(record)
+            # Sonuç listeleri demet olarak saklanır; çağıranlar paylaşılan listeyi değiştiremez
+            self._by_key = {key: tuple(records) for key, records in by_key.items()}
+            self._by_surah = {key: tuple(records) for key, records in by_surah.items()}
+
+    @staticmethod
+    def _is_dense(records: Tuple[VerseRecord, ...]) -> bool:
+        """Sureler 1'den, ayetler her surede 1'den boşluksuz ve sıralı mı"""
+        surah, verse = 0, 0
+        for record in records:
+            if record.surah_number == surah and record.verse_number == verse + 1:
+                verse += 1
+            elif record.surah_number == surah + 1 and record.verse_number == 1:
+                surah, verse = surah + 1, 1
+            else:
+                return False
+        return True
+
+    @classmethod
+    def from_frame(cls, df) -> 'VerseStore':
+        texts = VerseTexts(
+            _text_column(df, 'surah_name'), _text_column(df, 'arabic_text'), _text_column(df, 'turkish_meaning')
+        )
+        return cls([
+            VerseRecord(surah_number, verse_number, verse_ebced, row, texts)
+            for row, (surah_number, verse_number, verse_ebced) in enumerate(zip(
+                _column(df, 'surah_number'), _column(df, 'verse_number'), _column(df, 'verse_ebced')
+            ))
+        ])
+
+    def verse_count(self, surah_number: int) -> int:
+        """Surenin ayet sayısı; sure yoksa 0"""
+        if self.dense:
+            return self.surah_counts[surah_number] if 0 < surah_number < len(self.surah_counts) else 0
+        return len(self._by_surah.get(surah_number, ()))
+
+    def find(self, surah_number: int, verse_number: int) -> Tuple[VerseRecord, ...]:
+        """Sure ve ayet numarası eşleşen tüm kayıtlar (tablo sırasıyla)"""
+        if self.dense:
+            record = self.get(surah_number, verse_number)
+            return () if record is None else (record,)
+        return self._by_key.get((surah_number, verse_number), ())
+
+    def get(self, surah_number: int, verse_number: int) -> Optional[VerseRecord]:
+        """Sure ve ayet numarası eşleşen ilk kayıt"""
+        if self.dense:
+            if 0 < surah_number < len(self.surah_counts) and 0 < verse_number <= self.surah_counts[surah_number]:
+                return self.records[self.surah_offsets[surah_number] + verse_number - 1]
+            return None
+        records = self._by_key.get((surah_number, verse_number))
+        return records[0] if records else None
+
+    def nearest(self, surah_number: int, verse_number: int) -> Optional[VerseRecord]:
+        """Suredeki ayet numarası en yakın kayıt (eşit uzaklıkta tablodaki ilk); sure yoksa None"""
+        if self.dense:
+            count = self.verse_count(surah_number)
+            if not count:
+                return None
+            return self.get(surah_number, min(max(verse_number, 1), count))
+        verses = self._by_surah.get(surah_number)
+        return min(verses, key=lambda v: abs(v.verse_number - verse_number)) if verses else None
+
+    def surah(self, surah_number: int) -> Tuple[VerseRecord, ...]:
+        """Surenin ayetleri (tablo sırasıyla)"""
+        if self.dense:
+            return self._surahs[surah_number] if 0 < surah_number < len(self._surahs) else ()
+        return self._by_surah.get(surah_number, ())
+
+    def has_surah(self, surah_number: int) -> bool:
+        return self.verse_count(surah_number) > 0
+
+    def __len__(self) -> int:
+        return len(self.records)
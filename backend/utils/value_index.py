@@ -0,0 +1,138 @@
+"""Ebced değerinden o değeri taşıyan tüm kayıtlara ters indeks
+
+İsimler, esmalar, sureler (ayet ebcedlerinin toplamı) ve ayetler tek bir sıralı
+dizide (değer, tür sırası, tablo sırası) tutulur. Tam değer ve aralık sorguları
+bisect ile O(log n), sayfalama dilimle yapılır. Tür filtresinin her
+kombinasyonu için ayrı sıralı dizi veri seti yüklenirken bir kez hazırlanır.
+"""
+from bisect import bisect_left, bisect_right
+from itertools import combinations
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+import numpy as np
+from utils.store import EsmaStore, FrozenRecord, NameStore, VerseStore, is_missing
+
+_set = object.__setattr__
+
+KINDS = ('name', 'esma', 'surah', 'verse')
+_ALL_KINDS = frozenset(KINDS)
+
+class SurahRecord(FrozenRecord):
+    """Sure özeti; ebced değeri surenin ayet ebcedlerinin toplamıdır"""
+    __slots__ = ('surah_number', 'surah_name', 'verse_count', 'ebced')
+
+    def __init__(self, surah_number, surah_name, verse_count: int, ebced: int):
+        _set(self, 'surah_number', surah_number)
+        _set(self, 'surah_name', surah_name)
+        _set(self, 'verse_count', verse_count)
+        _set(self, 'ebced', ebced)
+
+def _integral(value) -> Optional[int]:
+    """Tam sayı ebced değeri; eksik veya kesirli değerler indekslenmez"""
+    if is_missing(value) or isinstance(value, bool):
+        return None
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else None
+    return value if isinstance(value, int) else None
+
+def surah_records(verses: VerseStore) -> Tuple[SurahRecord, ...]:
+    surah_numbers = sorted({record.surah_number for record in verses.records})
+    surahs = []
+    for surah_number in surah_numbers:
+        records = verses.surah(surah_number)
+        values = [_integral(record.verse_ebced) for record in records]
+        surahs.append(SurahRecord(surah_number, records[0].surah_name, len(records),
+                                  sum(value for value in values if value is not None)))
+    return tuple(surahs)
+
+class ValuePage:
+    """Bir sorgunun sonuç sayfası"""
+    __slots__ = ('total', 'counts', 'offset', 'items')
+
+    def __init__(self, total: int, counts: Dict[str, int], offset: int, items: List[Tuple[str, int, object]]):
+        self.total = total
+        self.counts = counts
+        self.offset = offset
+        # (tür, ebced, kayıt)
+        self.items = items
+
+class ValueIndex:
+    """Ebced değeri -> isim, esma, sure ve ayet kayıtları"""
+
+    def __init__(self, names: NameStore, esmas: EsmaStore, verses: VerseStore):
+        self.surahs = surah_records(verses)
+        sources = {
+            'name': (names.records, lambda record: record.ebced),
+            'esma': (esmas.records, lambda record: record.ebced),
+            'surah': (self.surahs, lambda record: record.ebced),
+            'verse': (verses.records, lambda record: record.verse_ebced),
+        }
+        self._records: Dict[str, tuple] = {}
+        values, kinds, positions = [], [], []
+        for code, kind in enumerate(KINDS):
+            records, ebced = sources[kind]
+            indexed = []
+            for record in records:
+                value = _integral(ebced(record))
+                if value is not None:
+                    values.append(value)
+                    kinds.append(code)
+                    positions.append(len(indexed))
+                    indexed.append(record)
+            self._records[kind] = tuple(indexed)
+
+        # Kararlı sıralama: eşit değerlerde tür sırası, sonra tablo sırası korunur
+        values = np.array(values, dtype=np.int64)
+        kinds = np.array(kinds, dtype=np.int8)
+        positions = np.array(positions, dtype=np.int64)
+        order = np.argsort(values, kind='stable')
+        values, kinds, positions = values[order], kinds[order], positions[order]
+
+        # Tekil sorgularda numpy skaler maliyeti olmaması için demetler (değerler, türler, konumlar)
+        self._views: Dict[FrozenSet[str], Tuple[tuple, tuple, tuple]] = {}
+        for size in range(1, len(KINDS) + 1):
+            for subset in combinations(range(len(KINDS)), size):
+                mask = np.isin(kinds, subset)
+                self._views[frozenset(KINDS[code] for code in subset)] = (
+                    tuple(values[mask].tolist()), tuple(kinds[mask].tolist()), tuple(positions[mask].tolist())
+                )
+        # Tür bazında sayımlar için sadece değerler
+        self._kind_values = {kind: self._views[frozenset((kind,))][0] for kind in KINDS}
+
+    def _view(self, kinds: Optional[Iterable[str]]):
+        selected = _ALL_KINDS if not kinds else frozenset(kinds)
+        unknown = selected - _ALL_KINDS
+        if unknown:
+            raise ValueError(f"Geçersiz kayıt türü: {', '.join(sorted(unknown))} ({', '.join(KINDS)})")
+        return selected, self._views[selected]
+
+    def count(self, low: int, high: int, kinds: Optional[Iterable[str]] = None) -> int:
+        """Değeri [low, high] aralığındaki kayıt sayısı"""
+        values = self._view(kinds)[1][0]
+        return max(bisect_right(values, high) - bisect_left(values, low), 0)
+
+    def between(self, low: int, high: int, kinds: Optional[Iterable[str]] = None,
+                offset: int = 0, limit: int = 50) -> ValuePage:
+        """Değeri [low, high] aralığındaki kayıtlar; (değer, tür, tablo sırası) ile sıralı sayfa"""
+        selected, (values, kind_codes, positions) = self._view(kinds)
+        start = bisect_left(values, low)
+        end = bisect_right(values, high)
+        total = max(end - start, 0)
+        page = slice(min(start + offset, end), min(start + offset + limit, end))
+        items = [
+            (KINDS[code], value, self._records[KINDS[code]][position])
+            for value, code, position in zip(values[page], kind_codes[page], positions[page])
+        ]
+        counts = {}
+        for kind in KINDS:
+            if kind in selected:
+                kind_values = self._kind_values[kind]
+                counts[kind] = max(bisect_right(kind_values, high) - bisect_left(kind_values, low), 0)
+        return ValuePage(total, counts, offset, items)
+
+    def lookup(self, value: int, kinds: Optional[Iterable[str]] = None,
+               offset: int = 0, limit: int = 50) -> ValuePage:
+        """Ebced değeri tam olarak eşleşen kayıtlar"""
+        return self.between(value, value, kinds, offset, limit)
+
+    def __len__(self) -> int:
+        return len(self._views[_ALL_KINDS][0])
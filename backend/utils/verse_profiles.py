@@ -0,0 +1,132 @@
+"""Ayetlerin harf profilleri
+
+Profil tablosu (verse_profiles) veri seti oluşturulurken Kuran tablosundan bir
+kez hesaplanır: her ayet için nurani/zulmani ve eril/dişil harf sayıları,
+element bazında harf sayısı, ebced ve nurani harf sayısı. Burada kolonlar
+sabit genişlikli numpy dizilerine alınır; "baskın nurani elementi SU olan ve
+ebcedi X'e yakın ayetler" gibi sorgular metin taramadan, dizi maskeleriyle
+cevaplanır.
+"""
+from types import MappingProxyType
+from typing import List, Optional, Tuple
+import numpy as np
+from utils.corpus import ELEMENT_KEYS
+from utils.store import FrozenRecord, VerseRecord, VerseStore
+
+_set = object.__setattr__
+
+ELEMENTS = tuple(element for element, _ in ELEMENT_KEYS)
+ELEMENT_INDEX = {element: i for i, element in enumerate(ELEMENTS)}
+MATCHES = ('dominant', 'contains')
+
+class VerseProfile(FrozenRecord):
+    """Tek bir ayetin harf profili"""
+    __slots__ = ('verse', 'ebced', 'letter_count', 'nurani_count', 'zulmani_count', 'nurani_ebced',
+                 'zulmani_ebced', 'eril_count', 'disil_count', 'element_counts', 'element_ebced',
+                 'element_nurani', 'dominant_elements')
+
+    def __init__(self, verse: VerseRecord, ebced: int, letter_count: int, nurani_count: int,
+                 zulmani_count: int, nurani_ebced: int, zulmani_ebced: int, eril_count: int, disil_count: int,
+                 element_counts, element_ebced, element_nurani, dominant_elements: Tuple[str, ...]):
+        _set(self, 'verse', verse)
+        _set(self, 'ebced', ebced)
+        _set(self, 'letter_count', letter_count)
+        _set(self, 'nurani_count', nurani_count)
+        _set(self, 'zulmani_count', zulmani_count)
+        _set(self, 'nurani_ebced', nurani_ebced)
+        _set(self, 'zulmani_ebced', zulmani_ebced)
+        _set(self, 'eril_count', eril_count)
+        _set(self, 'disil_count', disil_count)
+        _set(self, 'element_counts', element_counts)
+        _set(self, 'element_ebced', element_ebced)
+        _set(self, 'element_nurani', element_nurani)
+        # En çok nurani harfe sahip element(ler)
+        _set(self, 'dominant_elements', dominant_elements)
+
+class VerseProfileTable:
+    """Ayet profilleri; satırlar ayet deposuyla aynı sırada"""
+
+    def __init__(self, profiles_df, verses: VerseStore):
+        self.verses = verses
+        self.ebced = profiles_df['ebced'].to_numpy(dtype=np.int64)
+        self.letter_count = profiles_df['letter_count'].to_numpy(dtype=np.int32)
+        self.nurani_count = profiles_df['nurani_count'].to_numpy(dtype=np.int32)
+        self.zulmani_count = profiles_df['zulmani_count'].to_numpy(dtype=np.int32)
+        self.nurani_ebced = profiles_df['nurani_ebced'].to_numpy(dtype=np.int64)
+        self.zulmani_ebced = profiles_df['zulmani_ebced'].to_numpy(dtype=np.int64)
+        self.eril_count = profiles_df['eril_count'].to_numpy(dtype=np.int32)
+        self.disil_count = profiles_df['disil_count'].to_numpy(dtype=np.int32)
+        # (ayet sayısı x 4) diziler, ELEMENTS sırasıyla
+        self.element_counts = self._stack(profiles_df, 'count', np.int32)
+        self.element_ebced = self._stack(profiles_df, 'ebced', np.int64)
+        self.element_nurani = self._stack(profiles_df, 'nurani', np.int32)
+        max_nurani = self.element_nurani.max(axis=1) if len(profiles_df) else np.zeros(0, dtype=np.int32)
+        self._dominated = (self.element_nurani == max_nurani[:, None]) & (self.element_nurani > 0)
+        # Paylaşılan diziler salt okunur
+        for array in (self.ebced, self.letter_count, self.nurani_count, self.zulmani_count, self.nurani_ebced,
+                      self.zulmani_ebced, self.eril_count, self.disil_count, self.element_counts,
+                      self.element_ebced, self.element_nurani, self._dominated):
+            array.flags.writeable = False
+
+    @staticmethod
+    def _stack(profiles_df, suffix: str, dtype) -> np.ndarray:
+        return np.column_stack(
+            [profiles_df[f'{key}_{suffix}'].to_numpy(dtype=dtype) for _, key in ELEMENT_KEYS]
+        ).reshape(len(profiles_df), len(ELEMENT_KEYS))
+
+    def __len__(self) -> int:
+        return len(self.ebced)
+
+    def containing_mask(self, element: str) -> np.ndarray:
+        """Elementten en az bir nurani harf içeren ayetler (satır maskesi)"""
+        return self.element_nurani[:, ELEMENT_INDEX[element]] > 0
+
+    def dominated_mask(self, element: str) -> np.ndarray:
+        """Elementin baskın nurani element olduğu ayetler (satır maskesi)"""
+        return self._dominated[:, ELEMENT_INDEX[element]]
+
+    def profiles(self, rows) -> List[VerseProfile]:
+        """Satırlardaki ayet profilleri; kolonlar sayfa başına bir kez toplanır"""
+        rows = np.asarray(rows, dtype=np.int64)
+        columns = [rows.tolist()] + [array[rows].tolist() for array in (
+            self.ebced, self.letter_count, self.nurani_count, self.zulmani_count, self.nurani_ebced,
+            self.zulmani_ebced, self.eril_count, self.disil_count)]
+        matrices = [array[rows].tolist() for array in (
+            self.element_counts, self.element_ebced, self.element_nurani, self._dominated)]
+        records = self.verses.records
+        return [
+            VerseProfile(records[row], ebced, letters, nurani, zulmani, nurani_ebced, zulmani_ebced, eril, disil,
+                         MappingProxyType(dict(zip(ELEMENTS, counts))),
+                         MappingProxyType(dict(zip(ELEMENTS, element_ebced))),
+                         MappingProxyType(dict(zip(ELEMENTS, element_nurani))),
+                         tuple(element for element, flag in zip(ELEMENTS, dominated) if flag))
+            for (row, ebced, letters, nurani, zulmani, nurani_ebced, zulmani_ebced, eril, disil,
+                 counts, element_ebced, element_nurani, dominated) in zip(*columns, *matrices)
+        ]
+
+    def profile(self, row: int) -> VerseProfile:
+        return self.profiles([row])[0]
+
+    def search(self, element: Optional[str] = None, match: str = 'dominant', near_ebced: Optional[int] = None,
+               min_ebced: Optional[int] = None, max_ebced: Optional[int] = None,
+               offset: int = 0, limit: int = 50) -> Tuple[int, List[VerseProfile]]:
+        """Filtrelere uyan ayet sayısı ve istenen sayfa
+
+        near_ebced verilirse sonuçlar ebced farkına göre, eşitlikte tablo
+        sırasıyla; verilmezse tablo (sure, ayet) sırasıyla döner.
+        """
+        if element is not None and element not in ELEMENT_INDEX:
+            raise ValueError(f"Geçersiz element: {element} ({', '.join(ELEMENTS)})")
+        if match not in MATCHES:
+            raise ValueError(f"Geçersiz eşleşme türü: {match} ({', '.join(MATCHES)})")
+        mask = np.ones(len(self), dtype=bool)
+        if element is not None:
+            mask &= self.dominated_mask(element) if match == 'dominant' else self.containing_mask(element)
+        if min_ebced is not None:
+            mask &= self.ebced >= min_ebced
+        if max_ebced is not None:
+            mask &= self.ebced <= max_ebced
+        rows = np.flatnonzero(mask)
+        if near_ebced is not None and len(rows):
+            rows = rows[np.argsort(np.abs(self.ebced[rows] - near_ebced), kind='stable')]
+        return len(rows), self.profiles(rows[offset:offset + limit])
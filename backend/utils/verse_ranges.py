@@ -0,0 +1,103 @@
+"""Ardışık ayet aralıklarının ebced toplamları (önek toplamları)
+
+Ayetler sure ve ayet sırasıyla tek bir diziye dizilir; prefix[i] ilk i ayetin
+ebced toplamıdır. Bir aralığın toplamı iki önek toplamının farkıdır (O(1)).
+Toplamı hedef değere eşit olan aralıklar, her başlangıç için
+prefix[başlangıç] + hedef değerinin önek toplamları arasında aranmasıyla
+bulunur: ayet ebcedleri pozitif olduğunda önek toplamları kesin artandır ve
+arama numpy ile toplu yapılır; değilse önek toplamı -> konumlar sözlüğü
+kullanılır. Eksik ebced değerleri 0 sayılır.
+"""
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from utils.store import VerseRecord, VerseStore, is_missing
+
+class VerseRangeIndex:
+    """Mushaf boyunca ve sure içinde ayet aralığı toplamları"""
+
+    def __init__(self, verses: VerseStore):
+        surah_numbers = sorted({record.surah_number for record in verses.records})
+        self.verses: Tuple[VerseRecord, ...] = tuple(
+            record for surah_number in surah_numbers for record in verses.surah(surah_number)
+        )
+        ebceds = np.array([0 if is_missing(record.verse_ebced) else int(record.verse_ebced)
+                           for record in self.verses], dtype=np.int64)
+        self.prefix = np.zeros(len(self.verses) + 1, dtype=np.int64)
+        np.cumsum(ebceds, out=self.prefix[1:])
+        self.surah_of = np.array([record.surah_number for record in self.verses], dtype=np.int64)
+        # Sure -> mushaf dizisindeki [başlangıç, bitiş) konumları
+        self.surah_bounds: Dict[int, Tuple[int, int]] = {}
+        start = 0
+        for surah_number in surah_numbers:
+            end = start + len(verses.surah(surah_number))
+            self.surah_bounds[surah_number] = (start, end)
+            start = end
+        # (sure, ayet) -> konum; tekrarlanan anahtarlarda ilk kayıt
+        self._positions: Dict[Tuple[int, int], int] = {}
+        for position, record in enumerate(self.verses):
+            self._positions.setdefault((record.surah_number, record.verse_number), position)
+        self.increasing = bool((ebceds > 0).all())
+        self._prefix_list = self.prefix.tolist()
+        self._by_prefix: Optional[Dict[int, List[int]]] = None
+        if not self.increasing:
+            self._by_prefix = {}
+            for position, value in enumerate(self._prefix_list):
+                self._by_prefix.setdefault(value, []).append(position)
+        for array in (self.prefix, self.surah_of):
+            array.flags.writeable = False
+
+    def __len__(self) -> int:
+        return len(self.verses)
+
+    def position(self, surah_number: int, verse_number: int) -> Optional[int]:
+        """Ayetin mushaf dizisindeki konumu; yoksa None"""
+        return self._positions.get((surah_number, verse_number))
+
+    def surah_prefix(self, surah_number: int) -> np.ndarray:
+        """Surenin kendi önek toplamları (0 ile başlar)"""
+        start, end = self.surah_bounds.get(surah_number, (0, 0))
+        return self.prefix[start:end + 1] - self.prefix[start]
+
+    def span_total(self, start: int, end: int) -> int:
+        """[start, end) konumlarındaki ayetlerin ebced toplamı"""
+        return self._prefix_list[end] - self._prefix_list[start]
+
+    def total(self, surah_number: int, start_verse: int, end_verse: int,
+              end_surah: Optional[int] = None) -> Optional[int]:
+        """Başlangıç ve bitiş ayeti dahil aralığın ebced toplamı; ayet yoksa veya sıra tersse None"""
+        start = self.position(surah_number, start_verse)
+        end = self.position(surah_number if end_surah is None else end_surah, end_verse)
+        if start is None or end is None or end < start:
+            return None
+        return self.span_total(start, end + 1)
+
+    def find(self, target: int, cross_surah: bool = False, limit: Optional[int] = None) -> List[Tuple[int, int]]:
+        """Ebced toplamı hedefe eşit ardışık aralıklar; [başlangıç, bitiş) konumları, başlangıç sırasıyla
+
+        cross_surah False ise sadece tek bir sure içinde kalan aralıklar döner.
+        """
+        if self.increasing:
+            if target <= 0:
+                return []
+            wanted = self.prefix[:-1] + target
+            ends = np.searchsorted(self.prefix, wanted)
+            found = ends < len(self.prefix)
+            found[found] = self.prefix[ends[found]] == wanted[found]
+            starts = np.flatnonzero(found)
+            ends = ends[starts]
+        else:
+            pairs = [
+                (start, end)
+                for end, value in enumerate(self._prefix_list)
+                for start in self._by_prefix.get(value - target, ())
+                if start < end
+            ]
+            pairs.sort()
+            starts = np.array([start for start, _ in pairs], dtype=np.int64)
+            ends = np.array([end for _, end in pairs], dtype=np.int64)
+        if not cross_surah and len(starts):
+            same = self.surah_of[starts] == self.surah_of[ends - 1]
+            starts, ends = starts[same], ends[same]
+        if limit is not None:
+            starts, ends = starts[:limit], ends[:limit]
+        return list(zip(starts.tolist(), ends.tolist()))
@@ -0,0 +1,170 @@
+"""Sayıları Kuran koordinatlarına (sure, ayet) indirgeyen ortak çözücü
+
+Router'ların kullandığı sadeleştirme kuralları burada toplanır:
+    'once'   : sayı sınırı aşıyorsa basamakları bir kez toplanır
+    'repeat' : sayı sınırın altına inene kadar basamakları toplanır
+    'root'   : sayı sınırı aşıyorsa tek haneye inene kadar basamakları toplanır
+    None     : sayı olduğu gibi kullanılır
+Sınırlar ayet deposundan gelir: sure sayısı (114) ve en uzun surenin ayet
+sayısı (286). Basamak toplamı ve indirgeme sonuçları 0..size aralığındaki her
+sayı için bir kez hesaplanır; bu aralığın dışındaki sayılar aynı kurallarla
+doğrudan hesaplanır.
+"""
+from typing import Dict, Optional, Sequence, Tuple
+import numpy as np
+from utils.store import VerseRecord, VerseStore, is_missing
+
+RULES = ('once', 'repeat', 'root')
+
+# Tablo boyutu: isim toplamlarının ve Kuran'daki en büyük ayet ebcedinin üzerinde.
+# 10'un kuvveti olduğundan büyük sayıların basamak toplamı tablo parçalarıyla bulunur.
+DEFAULT_TABLE_SIZE = 10 ** 5
+
+def digit_sum(number: int) -> int:
+    """Basamakların toplamı (tek adım)"""
+    return sum(int(digit) for digit in str(number))
+
+def reduce_number(number: int, limit: int, rule: Optional[str]) -> int:
+    """Kuralın tablosuz karşılığı (tablo dışındaki sayılar ve doğrulama için)"""
+    if rule is None or number <= limit:
+        return number
+    if rule == 'once':
+        return digit_sum(number)
+    if rule == 'repeat':
+        while number > limit:
+            number = digit_sum(number)
+        return number
+    if rule == 'root':
+        while number > 9:
+            number = digit_sum(number)
+        return number
+    raise ValueError(f"Geçersiz sadeleştirme kuralı: {rule} ({', '.join(RULES)})")
+
+def _digit_sums_of(numbers: np.ndarray) -> np.ndarray:
+    """Negatif olmayan sayıların basamak toplamları"""
+    numbers = numbers.copy()
+    sums = np.zeros_like(numbers)
+    while numbers.any():
+        sums += numbers % 10
+        numbers //= 10
+    return sums
+
+def _reduce_table(digit_sums: np.ndarray, limit: int) -> np.ndarray:
+    """Sınırın altına inene kadar basamak toplamı; basamak toplamı sayıdan küçük olduğu için birkaç turda biter"""
+    table = np.arange(len(digit_sums), dtype=np.int64)
+    pending = table > limit
+    while pending.any():
+        table[pending] = digit_sums[table[pending]]
+        pending = table > limit
+    return table
+
+class VerseResolver:
+    """Sure/ayet sadeleştirme kuralları ve sure ayet sayıları; sorgular sabit zamanlı
+
+    Sınırı aşan bir sayının sonucu yalnızca basamak toplamına bağlıdır (bir kez
+    toplama, tekrar toplama ve tek haneye indirme için). Basamak toplamı tablo
+    aralığında kaldığından tablo dışındaki sayılar tek bir toplama ve tablo
+    okumasıyla çözülür.
+    """
+
+    def __init__(self, verses: VerseStore, size: int = DEFAULT_TABLE_SIZE):
+        if size < 10 or 10 ** (len(str(size)) - 1) != size:
+            raise ValueError(f"Tablo boyutu 10'un kuvveti olmalıdır: {size}")
+        self.verses = verses
+        self.surah_limit = max((record.surah_number for record in verses.records), default=0)
+        self.verse_limit = max((verses.verse_count(s) for s in range(1, self.surah_limit + 1)), default=0)
+        largest = max((int(record.verse_ebced) for record in verses.records if not is_missing(record.verse_ebced)),
+                      default=0)
+        self.size = size
+        while self.size <= largest:
+            self.size *= 10
+        numbers = np.arange(self.size, dtype=np.int64)
+        sums = _digit_sums_of(numbers)
+        self.digit_sums = sums
+        # Sınırı aşan sayılar için: basamak toplamı -> sonuç
+        self._after_sum: Dict[Tuple[str, int], np.ndarray] = {}
+        # (kural, sınır) -> indirgenmiş değerler; sınırın altındaki sayılar değişmez
+        self._arrays: Dict[Tuple[str, int], np.ndarray] = {}
+        roots = _reduce_table(sums, 9)
+        for limit in {self.surah_limit, self.verse_limit}:
+            self._after_sum['once', limit] = numbers
+            self._after_sum['repeat', limit] = _reduce_table(sums, limit)
+            self._after_sum['root', limit] = roots
+            above = numbers > limit
+            for rule in RULES:
+                self._arrays[rule, limit] = np.where(above, self._after_sum[rule, limit][sums], numbers)
+        for array in (self.digit_sums, *self._after_sum.values(), *self._arrays.values()):
+            array.flags.writeable = False
+        # Tekil sorgular için Python listeleri (numpy skaler dönüşümü olmadan int döner)
+        self._digit_sum_list = sums.tolist()
+        self._lists = {key: array.tolist() for key, array in self._arrays.items()}
+        self._after_sum_lists = {key: array.tolist() for key, array in self._after_sum.items()}
+
+    def digit_sum(self, number: int) -> int:
+        if 0 <= number < self.size:
+            return self._digit_sum_list[number]
+        if number < 0:
+            return digit_sum(number)
+        total = 0
+        while number:
+            number, rest = divmod(number, self.size)
+            total += self._digit_sum_list[rest]
+        return total
+
+    def reduce(self, number: int, limit: int, rule: Optional[str]) -> int:
+        """Sayıyı kurala göre sınırın altına indirger"""
+        if rule is None:
+            return number
+        table = self._lists.get((rule, limit))
+        if table is None:
+            return reduce_number(number, limit, rule)
+        if 0 <= number < self.size:
+            return table[number]
+        if number <= limit:
+            return number
+        return self._after_sum_lists[rule, limit][self.digit_sum(number)]
+
+    def reduce_surah(self, number: int, rule: Optional[str]) -> int:
+        return self.reduce(number, self.surah_limit, rule)
+
+    def reduce_verse(self, number: int, rule: Optional[str]) -> int:
+        return self.reduce(number, self.verse_limit, rule)
+
+    def resolve(self, surah_number: int, verse_number: int,
+                surah_rule: Optional[str] = None, verse_rule: Optional[str] = None) -> Tuple[int, int]:
+        """Sure ve ayet numaralarını kurallara göre sadeleştirir"""
+        return self.reduce_surah(surah_number, surah_rule), self.reduce_verse(verse_number, verse_rule)
+
+    def locate(self, surah_number: int, verse_number: int,
+               surah_rule: Optional[str] = None, verse_rule: Optional[str] = None) -> Optional[VerseRecord]:
+        """Sadeleştirilmiş koordinattaki ayet; yoksa None"""
+        return self.verses.get(*self.resolve(surah_number, verse_number, surah_rule, verse_rule))
+
+    def reduce_many(self, numbers: Sequence[int], limit: int, rule: Optional[str]) -> np.ndarray:
+        """reduce() karşılığı, sayı dizisi için"""
+        numbers = np.asarray(numbers, dtype=np.int64)
+        if rule is None:
+            return numbers.copy()
+        if rule not in RULES:
+            raise ValueError(f"Geçersiz sadeleştirme kuralı: {rule} ({', '.join(RULES)})")
+        if (rule, limit) not in self._arrays:
+            return np.array([reduce_number(int(n), limit, rule) for n in numbers], dtype=np.int64)
+        result = numbers.copy()
+        inside = (numbers >= 0) & (numbers < self.size)
+        result[inside] = self._arrays[rule, limit][numbers[inside]]
+        outside = numbers >= self.size
+        if outside.any():
+            result[outside] = self._after_sum[rule, limit][_digit_sums_of(numbers[outside])]
+        return result
+
+    def resolve_many(self, surah_numbers: Sequence[int], verse_numbers: Sequence[int],
+                     surah_rule: Optional[str] = None, verse_rule: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """resolve() karşılığı, koordinat dizileri için"""
+        return (self.reduce_many(surah_numbers, self.surah_limit, surah_rule),
+                self.reduce_many(verse_numbers, self.verse_limit, verse_rule))
+
+    def locate_many(self, surah_numbers: Sequence[int], verse_numbers: Sequence[int],
+                    surah_rule: Optional[str] = None, verse_rule: Optional[str] = None) -> list:
+        """locate() karşılığı, koordinat dizileri için"""
+        surahs, verses = self.resolve_many(surah_numbers, verse_numbers, surah_rule, verse_rule)
+        return [self.verses.get(s, v) for s, v in zip(surahs.tolist(), verses.tolist())]
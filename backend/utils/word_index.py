@@ -0,0 +1,95 @@
+"""Kuran kelimelerinin ebced indeksi
+
+Kelime tablosu (quran_words) veri seti oluşturulurken hesaplanır; burada kolonlar
+sabit genişlikli numpy dizilerine alınır ve kelimeler ebced değerine göre
+sıralanır. Bir değere eşit kelimeler iki bisect ile bulunur. Kelime metni
+saklanmaz, istendiğinde ayet metninden kesilir.
+"""
+from bisect import bisect_left, bisect_right
+from types import MappingProxyType
+from typing import List, Tuple
+import numpy as np
+from utils.corpus import ELEMENT_KEYS
+from utils.store import FrozenRecord, VerseStore
+
+_set = object.__setattr__
+
+ELEMENT_NAMES = tuple(element for element, _ in ELEMENT_KEYS)
+
+class QuranWord(FrozenRecord):
+    """Tek bir kelime ve harf profili"""
+    __slots__ = ('surah_number', 'verse_number', 'word_position', 'text', 'ebced',
+                 'letter_count', 'nurani_count', 'nurani_ebced', 'element_counts')
+
+    def __init__(self, surah_number: int, verse_number: int, word_position: int, text: str, ebced: int,
+                 letter_count: int, nurani_count: int, nurani_ebced: int, element_counts):
+        _set(self, 'surah_number', surah_number)
+        _set(self, 'verse_number', verse_number)
+        _set(self, 'word_position', word_position)
+        _set(self, 'text', text)
+        _set(self, 'ebced', ebced)
+        _set(self, 'letter_count', letter_count)
+        _set(self, 'nurani_count', nurani_count)
+        _set(self, 'nurani_ebced', nurani_ebced)
+        _set(self, 'element_counts', element_counts)
+
+class WordIndex:
+    """Kelimeler tablo sırasıyla (sure, ayet, kelime sırası) ve ebced değerine göre sıralı"""
+
+    def __init__(self, words_df, verses: VerseStore):
+        self.verses = verses
+        self.verse_row = words_df['verse_row'].to_numpy(dtype=np.int32)
+        self.surah_number = words_df['surah_number'].to_numpy(dtype=np.int16)
+        self.verse_number = words_df['verse_number'].to_numpy(dtype=np.int16)
+        self.word_position = words_df['word_position'].to_numpy(dtype=np.int16)
+        self.char_start = words_df['char_start'].to_numpy(dtype=np.int32)
+        self.char_end = words_df['char_end'].to_numpy(dtype=np.int32)
+        self.ebced = words_df['ebced'].to_numpy(dtype=np.int32)
+        self.letter_count = words_df['letter_count'].to_numpy(dtype=np.int16)
+        self.nurani_count = words_df['nurani_count'].to_numpy(dtype=np.int16)
+        self.nurani_ebced = words_df['nurani_ebced'].to_numpy(dtype=np.int32)
+        # (kelime sayısı x 4) element sayıları, ELEMENT_KEYS sırasıyla
+        self.element_counts = np.column_stack(
+            [words_df[f'{key}_count'].to_numpy(dtype=np.int16) for _, key in ELEMENT_KEYS]
+        ).reshape(len(words_df), len(ELEMENT_KEYS))
+        # Eşit ebcedli kelimeler tablo sırasını korur
+        order = np.argsort(self.ebced, kind='stable')
+        self._order = tuple(order.tolist())
+        self._sorted_values = tuple(self.ebced[order].tolist())
+        for array in (self.verse_row, self.surah_number, self.verse_number, self.word_position, self.char_start,
+                      self.char_end, self.ebced, self.letter_count, self.nurani_count, self.nurani_ebced,
+                      self.element_counts):
+            array.flags.writeable = False
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def words(self, indices) -> List[QuranWord]:
+        """Tablo konumlarındaki kelimeler; kolonlar sayfa başına bir kez toplanır"""
+        indices = np.asarray(indices, dtype=np.int64)
+        columns = [array[indices].tolist() for array in (
+            self.verse_row, self.surah_number, self.verse_number, self.word_position, self.char_start,
+            self.char_end, self.ebced, self.letter_count, self.nurani_count, self.nurani_ebced)]
+        element_counts = self.element_counts[indices].tolist()
+        records = self.verses.records
+        return [
+            QuranWord(surah, verse, position, str(records[row].arabic_text)[start:end], ebced, letters,
+                      nurani, nurani_ebced, MappingProxyType(dict(zip(ELEMENT_NAMES, counts))))
+            for row, surah, verse, position, start, end, ebced, letters, nurani, nurani_ebced, counts
+            in zip(*columns, element_counts)
+        ]
+
+    def word(self, i: int) -> QuranWord:
+        return self.words([i])[0]
+
+    def between(self, low: int, high: int, offset: int = 0, limit: int = 50) -> Tuple[int, List[QuranWord]]:
+        """Ebced değeri [low, high] aralığındaki kelime sayısı ve istenen sayfa (ebced, sonra tablo sırasıyla)"""
+        start = bisect_left(self._sorted_values, low)
+        end = bisect_right(self._sorted_values, high)
+        total = max(end - start, 0)
+        page = self._order[min(start + offset, end):min(start + offset + limit, end)]
+        return total, self.words(page)
+
+    def lookup(self, value: int, offset: int = 0, limit: int = 50) -> Tuple[int, List[QuranWord]]:
+        """Ebced değeri tam olarak eşleşen kelimeler"""
+        return self.between(value, value, offset, limit)
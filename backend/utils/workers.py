@@ -0,0 +1,220 @@
+"""Router handler'larının CPU işini event loop dışında çalıştıran sınırlı iş havuzları
+
+Analiz handler'ları senkron CPU işi yapar; event loop'ta çalışırlarsa yavaş bir
+istek diğer tüm istekleri bekletir. İşler iki havuza gönderilir:
+
+    light: thread havuzu (varsayılan 1 thread, 256 bekleyen iş); isim analizleri, sorgular
+           (ANALYSIS_WORKERS, ANALYSIS_QUEUE)
+    heavy: process havuzu; PDF oluşturma gibi uzun işler (HEAVY_WORKERS, HEAVY_QUEUE)
+
+Her havuzun bekleyen iş sınırı vardır: sınır doluysa istek kuyruğa alınmaz,
+hemen 503 döner (kuyrukta biriken istekler zaten zaman aşımına uğrar). İşçi
+sayısı açıkça 0 verilirse işler eskisi gibi event loop'ta çalışır (ör. ölçüm için);
+bu modda yavaş bir istek event loop'u bloke eder. Kuyruk derinliği,
+bekleme ve çalışma süreleri stats() ile okunur (/debug/workers).
+
+Thread havuzundaki işler isteğin context'iyle (veri seti sürümü, paylaşılan
+çeviriler) çalışır; process havuzuna context taşınmaz, işler sadece
+argümanlarıyla çalışmalıdır (argümanlar ve sonuç pickle edilebilir olmalı).
+"""
+from collections import deque
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Iterator
+import asyncio
+import contextvars
+import functools
+import multiprocessing
+import os
+import threading
+import time
+from fastapi import HTTPException
+
+# Süre yüzdelikleri son bu kadar işten hesaplanır
+SAMPLE_SIZE = 2048
+
+class PoolBusy(Exception):
+    """Havuzun bekleyen iş sınırı dolu"""
+
+    def __init__(self, name: str, limit: int):
+        super().__init__(f"Sunucu meşgul ({name} havuzunda {limit} bekleyen iş), lütfen tekrar deneyin")
+        self.name = name
+        self.limit = limit
+
+def _timed(function: Callable, args: tuple) -> tuple:
+    """İşi çalıştırır; başlangıç ve bitiş anlarını da döndürür (process'ler arasında da geçerli saat)"""
+    started = time.monotonic()
+    result = function(*args)
+    return started, result, time.monotonic()
+
+def _percentile(samples: list, q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return round(ordered[min(int(len(ordered) * q), len(ordered) - 1)] * 1000, 2)
+
+class WorkerPool:
+    """Bekleyen iş sayısı sınırlı thread veya process havuzu; executor ilk işte oluşturulur"""
+
+    def __init__(self, name: str, workers: int, max_pending: int, processes: bool = False):
+        self.name = name
+        self.workers = workers
+        self.max_pending = max_pending
+        self.processes = processes
+        self._executor = None
+        self._lock = threading.Lock()
+        # Kabul edilmiş istekler (kuyrukta veya çalışıyor) ve havuza gönderilmiş işler
+        self.pending = 0
+        self.active = 0
+        self.peak_pending = 0
+        self.submitted = 0
+        self.completed = 0
+        # Handler'ın kendi HTTP hataları (400/404/500 yanıtları) havuz hatası sayılmaz
+        self.http_errors = 0
+        # İstemci bağlantıyı kapattığı için beklemesi iptal edilen işler
+        self.cancelled = 0
+        # Worker'da veya executor'da oluşan gerçek hatalar (ör. ölen process, pickle hatası)
+        self.failed = 0
+        self.rejected = 0
+        self._waits: deque = deque(maxlen=SAMPLE_SIZE)
+        self._runs: deque = deque(maxlen=SAMPLE_SIZE)
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                if self.processes:
+                    # fork, thread'leri olan bir süreçte kilit durumlarını kopyalayabilir
+                    self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+                else:
+                    self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix=f"{self.name}-worker")
+            return self._executor
+
+    @contextmanager
+    def admit(self) -> Iterator[None]:
+        """İsteği havuza kabul eder; bekleyen iş sınırı doluysa PoolBusy"""
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise PoolBusy(self.name, self.max_pending)
+            self.pending += 1
+            self.peak_pending = max(self.peak_pending, self.pending)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+    async def call(self, function: Callable, *args):
+        """Kabul edilmiş bir isteğin işini havuzda çalıştırıp sonucunu bekler"""
+        with self._lock:
+            self.submitted += 1
+            self.active += 1
+        submitted = time.monotonic()
+        try:
+            if self.workers <= 0:
+                started, result, finished = _timed(function, args)
+            elif self.processes:
+                started, result, finished = await asyncio.get_running_loop().run_in_executor(
+                    self._get_executor(), _timed, function, args)
+            else:
+                context = contextvars.copy_context()
+                started, result, finished = await asyncio.get_running_loop().run_in_executor(
+                    self._get_executor(), context.run, _timed, function, args)
+        except HTTPException:
+            with self._lock:
+                self.active -= 1
+                self.http_errors += 1
+            raise
+        except asyncio.CancelledError:
+            with self._lock:
+                self.active -= 1
+                self.cancelled += 1
+            raise
+        except BaseException as e:
+            with self._lock:
+                self.active -= 1
+                self.failed += 1
+                # Ölen bir worker process'i (ör. bellek yetersizliği) executor'ı kullanılamaz bırakır;
+                # sonraki iş yeni bir executor ile çalışır
+                if isinstance(e, BrokenExecutor) and self._executor is not None:
+                    self._executor.shutdown(wait=False, cancel_futures=True)
+                    self._executor = None
+            raise
+        with self._lock:
+            self.active -= 1
+            self.completed += 1
+            self._waits.append(max(started - submitted, 0.0))
+            self._runs.append(finished - started)
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            waits, runs = list(self._waits), list(self._runs)
+            running = min(self.active, self.workers) if self.workers > 0 else self.active
+            return {
+                'name': self.name,
+                'kind': 'process' if self.processes else 'thread',
+                'workers': self.workers,
+                'max_pending': self.max_pending,
+                'pending': self.pending,
+                'running': running,
+                'queued': self.active - running,
+                'peak_pending': self.peak_pending,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'http_errors': self.http_errors,
+                'cancelled': self.cancelled,
+                'failed': self.failed,
+                'rejected': self.rejected,
+                'wait_ms': {'p50': _percentile(waits, 0.5), 'p99': _percentile(waits, 0.99)},
+                'run_ms': {'p50': _percentile(runs, 0.5), 'p99': _percentile(runs, 0.99)},
+            }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+# Light işler saf Python CPU işidir ve GIL'i bırakmaz; çok sayıda thread sadece event loop ile GIL
+# çekişmesini artırır. Varsayılan tek thread ve derin kuyruktur: 2 thread / 32 kuyrukta doyma
+# altında 503 ve aşırı yükte başarılı istek çöküşü ölçüldü, 1 thread / 256 kuyrukta doymaya kadar
+# 503 yoktur. Kuyruk tek thread'in birkaç yüz ms'lik işi kadardır. ANALYSIS_WORKERS=0 işleri
+# event loop'ta çalıştırır (sadece açıkça istenirse; yavaş bir istek yine tüm istekleri bekletir).
+# Heavy işler ayrı process'lerde gerçekten paralel çalışır, event loop'a çekirdek bırakılır.
+light_pool = WorkerPool('light', int(os.getenv('ANALYSIS_WORKERS', '1')), int(os.getenv('ANALYSIS_QUEUE', '256')))
+heavy_pool = WorkerPool('heavy', int(os.getenv('HEAVY_WORKERS', str(max((os.cpu_count() or 1) // 2, 1)))),
+                        int(os.getenv('HEAVY_QUEUE', '8')), processes=True)
+POOLS = (light_pool, heavy_pool)
+
+@contextmanager
+def admitted(pool: WorkerPool) -> Iterator[None]:
+    """admit(); havuz doluysa 503 (Retry-After ile)"""
+    try:
+        with pool.admit():
+            yield
+    except PoolBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
+async def run_blocking(function: Callable, *args):
+    """Ağ isteği gibi bekleyerek bloke eden işi isteğin context'iyle event loop'un varsayılan
+    executor'ında çalıştırır; CPU havuzlarının worker'larını meşgul etmez"""
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(None, context.run, function, *args)
+
+async def dispatch(pool: WorkerPool, function: Callable, *args):
+    """İşi havuzda çalıştırır; havuz doluysa 503"""
+    with admitted(pool):
+        return await pool.call(function, *args)
+
+def offload(pool: WorkerPool):
+    """Senkron router handler'ını, işini havuzda çalıştıran async handler'a çevirir
+
+    FastAPI imzayı (istek modeli, dönüş tipi) sarmalanan fonksiyondan okur.
+    """
+    def decorate(handler: Callable) -> Callable:
+        @functools.wraps(handler)
+        async def endpoint(*args, **kwargs):
+            return await dispatch(pool, functools.partial(handler, *args, **kwargs))
+        return endpoint
+    return decorate